@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+import argparse
+import codecs
+import json
+import os
+import random
+import sys
+import time
+
+# === CCRI Cipher Kernel Benchmark ===
+# Times the bulk cipher kernels in flag_generators/ciphers.py (Vigenère and
+# ROT13) against the original per-character / per-line code on multi-MB
+# inputs, and checks that every kernel produces identical output (and round-trips).
+
+def find_project_root():
+    """Walk up from this script until .ccri_ctf_root is found."""
+    dir_path = os.path.abspath(os.path.dirname(__file__))
+    while dir_path != "/":
+        if os.path.exists(os.path.join(dir_path, ".ccri_ctf_root")):
+            return dir_path
+        dir_path = os.path.dirname(dir_path)
+    print("❌ ERROR: Could not find .ccri_ctf_root marker. Are you inside the CTF folder?", file=sys.stderr)
+    sys.exit(1)
+
+sys.path.insert(0, find_project_root())
+from flag_generators import ciphers  # noqa: E402
+from flag_generators.ciphers import ShiftCipher, VigenereCipher  # noqa: E402
+
+WORDS = (
+    "transmission status report flag candidates identified during operation data "
+    "has been encoded for secure transit verify the true flag before submission "
+    "LIBER8 Command Node Field Unit CCRI"
+).split()
+
+def make_text(size, rng):
+    """Build roughly size bytes of English-like text with punctuation, digits and flags."""
+    parts = []
+    total = 0
+    while total < size:
+        if rng.random() < 0.01:
+            word = f"CCRI-{rng.randint(1000, 9999)}-{rng.choice(WORDS).upper()[:4]}"
+        else:
+            word = rng.choice(WORDS)
+        sep = rng.choice((" ", " ", " ", ", ", ".\n", "\n- "))
+        parts.append(word + sep)
+        total += len(word) + len(sep)
+    return "".join(parts)[:size]
+
+def time_call(func, repeat):
+    """Best wall time of repeat calls, plus the last result."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def vigenere_kernels():
+    """Kernels to compare: name -> function(text, key, decrypt)."""
+    def run_translate(text, key, decrypt):
+        saved, ciphers.np = ciphers.np, None
+        try:
+            return VigenereCipher.transform(text, key, decrypt)
+        finally:
+            ciphers.np = saved
+
+    kernels = {
+        "reference": VigenereCipher.reference_transform,
+        "translate": run_translate,
+    }
+    if ciphers.np is not None:
+        kernels["numpy"] = VigenereCipher.transform
+    return kernels
+
+def bench_vigenere(sizes, key, repeat, rng):
+    rows = []
+    kernels = vigenere_kernels()
+    for size in sizes:
+        text = make_text(size, rng)
+        expected = VigenereCipher.reference_transform(text, key)
+        for name, kernel in kernels.items():
+            enc_time, encrypted = time_call(lambda: kernel(text, key, False), repeat)
+            dec_time, decrypted = time_call(lambda: kernel(encrypted, key, True), repeat)
+            rows.append({
+                "cipher": "vigenere",
+                "kernel": name,
+                "size_bytes": size,
+                "encrypt_s": enc_time,
+                "decrypt_s": dec_time,
+                "encrypt_mb_s": size / enc_time / 1e6 if enc_time else 0.0,
+                "ok": encrypted == expected and decrypted == text,
+            })
+    return rows
+
+def bench_rot13(sizes, repeat, rng):
+    """Old per-line codecs ROT13 (decode_rot13.py) vs one ShiftCipher translate pass."""
+    rows = []
+    kernels = {
+        "reference": lambda text: "".join(codecs.encode(line, "rot_13") for line in text.splitlines(True)),
+        "translate": lambda text: ShiftCipher.rot(text, 13),
+    }
+    for size in sizes:
+        text = make_text(size, rng)
+        expected = codecs.encode(text, "rot_13")
+        for name, kernel in kernels.items():
+            enc_time, encoded = time_call(lambda: kernel(text), repeat)
+            dec_time, decoded = time_call(lambda: kernel(encoded), repeat)
+            rows.append({
+                "cipher": "rot13",
+                "kernel": name,
+                "size_bytes": size,
+                "encrypt_s": enc_time,
+                "decrypt_s": dec_time,
+                "encrypt_mb_s": size / enc_time / 1e6 if enc_time else 0.0,
+                "ok": encoded == expected and decoded == text,
+            })
+    return rows
+
+def print_report(rows):
+    print(f"\n{'cipher':<10}{'kernel':<11}{'size':>10}{'encrypt s':>12}{'decrypt s':>12}{'MB/s':>10}{'speedup':>9}  ok")
+    print("-" * 80)
+    baseline = {}
+    for row in rows:
+        if row["kernel"] == "reference":
+            baseline[(row["cipher"], row["size_bytes"])] = row["encrypt_s"]
+        base = baseline.get((row["cipher"], row["size_bytes"]))
+        speedup = f"{base / row['encrypt_s']:.1f}x" if base and row["encrypt_s"] else "-"
+        print(f"{row['cipher']:<10}{row['kernel']:<11}{row['size_bytes'] / 1e6:>9.1f}M"
+              f"{row['encrypt_s']:>12.4f}{row['decrypt_s']:>12.4f}{row['encrypt_mb_s']:>10.1f}"
+              f"{speedup:>9}  {'✅' if row['ok'] else '❌'}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the shared cipher kernels on large inputs.")
+    parser.add_argument("--sizes", default="1,4,16",
+                        help="Comma-separated input sizes in MB (default: 1,4,16)")
+    parser.add_argument("--key", default="login", help="Vigenère key (default: login)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per kernel, best time kept (default: 3)")
+    parser.add_argument("--seed", type=int, default=1337, help="Random seed for the generated text")
+    parser.add_argument("--json", metavar="FILE", help="Also write the results as JSON to FILE")
+    args = parser.parse_args()
+
+    sizes = [int(float(s) * 1_000_000) for s in args.sizes.split(",") if s.strip()]
+    rng = random.Random(args.seed)
+
+    print("\n🔐 CCRI Cipher Kernel Benchmark\n" + "=" * 40)
+    print(f"NumPy: {'available' if ciphers.np is not None else 'not installed (translate kernel only)'}")
+    rows = bench_vigenere(sizes, args.key, args.repeat, rng)
+    rows += bench_rot13(sizes, args.repeat, rng)
+    print_report(rows)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+        print(f"💾 JSON report saved to: {args.json}")
+
+    if not all(row["ok"] for row in rows):
+        print("🚨 A kernel produced output that differs from the reference implementation.")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
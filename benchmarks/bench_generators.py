@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+import argparse
+import builtins
+import contextlib
+import functools
+import importlib
+import io
+import json
+import os
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+# === CCRI Flag Generator Benchmark ===
+# Runs each flag_generators/gen_*.py generate_flag() into a throwaway project
+# sandbox several times and splits wall time into stages:
+#   flag     -> FlagUtils real/fake flag creation
+#   io       -> file reads/writes, copies and deletes
+#   external -> subprocess calls (steghide, zip, gcc, exiftool, ...)
+#   python   -> everything else (ciphers, templating, packet crafting, ...)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+# Generators are imported lazily so one missing optional dependency
+# (e.g. scapy for 18_Pcap_Search) does not take down the whole suite.
+GENERATOR_MODULES = {
+    "01_Stego": ("flag_generators.gen_01_stego", "StegoFlagGenerator"),
+    "02_Base64": ("flag_generators.gen_02_base64", "Base64FlagGenerator"),
+    "03_ROT13": ("flag_generators.gen_03_rot13", "ROT13FlagGenerator"),
+    "04_Vigenere": ("flag_generators.gen_04_vigenere", "VigenereFlagGenerator"),
+    "05_ArchivePassword": ("flag_generators.gen_05_archive_password", "ArchivePasswordFlagGenerator"),
+    "06_Hashcat": ("flag_generators.gen_06_hashcat", "HashcatFlagGenerator"),
+    "07_ExtractBinary": ("flag_generators.gen_07_extract_binary", "ExtractBinaryFlagGenerator"),
+    "08_FakeAuthLog": ("flag_generators.gen_08_fake_auth_log", "FakeAuthLogFlagGenerator"),
+    "09_FixScript": ("flag_generators.gen_09_fix_script", "FixScriptFlagGenerator"),
+    "10_Metadata": ("flag_generators.gen_10_metadata", "MetadataFlagGenerator"),
+    "11_HiddenFlag": ("flag_generators.gen_11_hidden_flag", "HiddenFlagGenerator"),
+    "12_QRCodes": ("flag_generators.gen_12_qr_codes", "QRCodeFlagGenerator"),
+    "13_HTTPHeaders": ("flag_generators.gen_13_http_headers", "HTTPHeaderFlagGenerator"),
+    "14_SubdomainSweep": ("flag_generators.gen_14_subdomain_sweep", "SubdomainSweepFlagGenerator"),
+    "15_ProcessInspection": ("flag_generators.gen_15_process_inspection", "ProcessInspectionFlagGenerator"),
+    "16_Hex_Hunting": ("flag_generators.gen_16_hex_hunting", "HexHuntingFlagGenerator"),
+    "17_Nmap_Scanning": ("flag_generators.gen_17_nmap_scanning", "NmapScanFlagGenerator"),
+    "18_Pcap_Search": ("flag_generators.gen_18_pcap_search", "PcapSearchFlagGenerator"),
+}
+
+STAGES = ("flag", "io", "external", "python")
+
+class StageTimer:
+    """
+    Attribute wall time to stages by temporarily wrapping the functions the
+    generators use for flag creation, file I/O and external tools.
+    Only the outermost wrapped call is timed, so Path.write_text -> open
+    is not double counted.
+    """
+
+    def __init__(self):
+        self.totals = dict.fromkeys(STAGES[:-1], 0.0)
+        self.depth = 0
+        self.patches = []
+
+    def wrap(self, stage, func):
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            if self.depth:
+                return func(*args, **kwargs)
+            self.depth += 1
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.totals[stage] += time.perf_counter() - start
+                self.depth -= 1
+        return timed
+
+    def patch(self, owner, name, stage, descriptor=None):
+        original = owner.__dict__[name] if descriptor else getattr(owner, name)
+        func = original.__func__ if descriptor else original
+        wrapped = self.wrap(stage, func)
+        setattr(owner, name, descriptor(wrapped) if descriptor else wrapped)
+        self.patches.append((owner, name, original))
+
+    def __enter__(self):
+        from flag_generators.flag_helpers import FlagUtils
+        self.patch(FlagUtils, "generate_real_flag", "flag", classmethod)
+        self.patch(FlagUtils, "generate_fake_flag", "flag", classmethod)
+
+        for name in ("read_text", "read_bytes", "write_text", "write_bytes",
+                     "unlink", "mkdir", "touch", "replace", "rename"):
+            self.patch(Path, name, "io")
+        self.patch(builtins, "open", "io")
+        for name in ("copy", "copy2", "copyfile", "copytree", "rmtree", "move"):
+            self.patch(shutil, name, "io")
+
+        for name in ("run", "call", "check_call", "check_output"):
+            self.patch(subprocess, name, "external")
+        return self
+
+    def __exit__(self, *exc):
+        for owner, name, original in reversed(self.patches):
+            setattr(owner, name, original)
+        self.patches.clear()
+        return False
+
+def prepare_sandbox(sandbox):
+    """
+    Build a throwaway project root so generators that touch shared files
+    (validation_unlocks.json, server.py) never modify the real tree.
+    """
+    (sandbox / ".ccri_ctf_root").touch()
+    shutil.copytree(PROJECT_ROOT / "flag_generators", sandbox / "flag_generators",
+                    ignore=shutil.ignore_patterns("__pycache__"))
+    admin_dir = sandbox / "web_version_admin"
+    admin_dir.mkdir()
+    for name in ("server.py", "validation_unlocks.json", "challenges.json"):
+        source = PROJECT_ROOT / "web_version_admin" / name
+        if source.exists():
+            shutil.copy2(source, admin_dir / name)
+    (sandbox / "challenges").mkdir()
+
+def load_generator(challenge_id):
+    """Import a generator class, returning (class, error message)."""
+    module_name, class_name = GENERATOR_MODULES[challenge_id]
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            module = importlib.import_module(module_name)
+        return getattr(module, class_name), None
+    except ImportError as e:
+        return None, f"import failed: {e}"
+    except SystemExit:
+        return None, "import failed: missing optional dependency"
+
+def run_once(generator_cls, sandbox, folder_name, measure_memory, verbose):
+    """Run generate_flag once into a fresh folder and return its measurements."""
+    target = sandbox / "challenges" / folder_name
+    if target.exists():
+        shutil.rmtree(target)
+    target.mkdir(parents=True)
+
+    output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    children_before = resource.getrusage(resource.RUSAGE_CHILDREN)
+    if measure_memory:
+        tracemalloc.start()
+
+    with output, StageTimer() as timer:
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        generator = generator_cls(project_root=sandbox)
+        generator.generate_flag(target)
+        cpu = time.process_time() - cpu_start
+        wall = time.perf_counter() - wall_start
+
+    peak = None
+    if measure_memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    children_after = resource.getrusage(resource.RUSAGE_CHILDREN)
+    child_cpu = (children_after.ru_utime - children_before.ru_utime
+                 + children_after.ru_stime - children_before.ru_stime)
+
+    stages = dict(timer.totals)
+    stages["python"] = max(0.0, wall - sum(stages.values()))
+    return {"wall": wall, "cpu": cpu, "child_cpu": child_cpu, "stages": stages, "peak_bytes": peak}
+
+def benchmark_generator(challenge_id, folder_name, sandbox, runs, warmup, measure_memory, verbose):
+    """Benchmark one generator; memory is measured in a separate run so tracing doesn't skew timings."""
+    generator_cls, error = load_generator(challenge_id)
+    if error:
+        return {"status": "skipped", "error": error}
+
+    samples = []
+    try:
+        cwd = os.getcwd()
+        os.chdir(sandbox)
+        try:
+            for _ in range(warmup):
+                run_once(generator_cls, sandbox, folder_name, False, verbose)
+            for _ in range(runs):
+                samples.append(run_once(generator_cls, sandbox, folder_name, False, verbose))
+            peak = run_once(generator_cls, sandbox, folder_name, True, verbose)["peak_bytes"] if measure_memory else None
+        finally:
+            os.chdir(cwd)
+    except SystemExit as e:
+        return {"status": "failed", "error": f"generator exited with code {e.code}"}
+    except Exception as e:
+        return {"status": "failed", "error": str(e)}
+
+    walls = [s["wall"] for s in samples]
+    return {
+        "status": "ok",
+        "runs": runs,
+        "wall_median_s": statistics.median(walls),
+        "wall_mean_s": statistics.mean(walls),
+        "wall_min_s": min(walls),
+        "wall_stdev_s": statistics.stdev(walls) if len(walls) > 1 else 0.0,
+        "cpu_median_s": statistics.median(s["cpu"] for s in samples),
+        "child_cpu_median_s": statistics.median(s["child_cpu"] for s in samples),
+        "stages_median_s": {
+            stage: statistics.median(s["stages"][stage] for s in samples) for stage in STAGES
+        },
+        "peak_alloc_bytes": peak,
+    }
+
+def print_table(results):
+    print(f"\n{'challenge':<22}{'wall ms':>10}{'±':>8}{'cpu ms':>9}{'child ms':>10}"
+          f"{'flag':>8}{'io':>8}{'extern':>9}{'python':>9}{'peak KiB':>10}")
+    print("-" * 103)
+    ranked = sorted(results.items(), key=lambda kv: -kv[1].get("wall_median_s", -1))
+    for challenge_id, r in ranked:
+        if r["status"] != "ok":
+            print(f"{challenge_id:<22}  ⚠️ {r['status']}: {r['error']}")
+            continue
+        st = r["stages_median_s"]
+        peak = f"{r['peak_alloc_bytes'] / 1024:.0f}" if r["peak_alloc_bytes"] is not None else "-"
+        print(f"{challenge_id:<22}{r['wall_median_s'] * 1000:>10.2f}{r['wall_stdev_s'] * 1000:>8.2f}"
+              f"{r['cpu_median_s'] * 1000:>9.2f}{r['child_cpu_median_s'] * 1000:>10.2f}"
+              f"{st['flag'] * 1000:>8.2f}{st['io'] * 1000:>8.2f}{st['external'] * 1000:>9.2f}"
+              f"{st['python'] * 1000:>9.2f}{peak:>10}")
+    print("\n(medians; stage columns are wall ms; child = CPU used by external tools)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the flag generators with per-stage timing.")
+    parser.add_argument("challenges", nargs="*", help="Challenge IDs to benchmark (default: all)")
+    parser.add_argument("--runs", type=int, default=5, help="Timed runs per generator (default: 5)")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed warm-up runs (default: 1)")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc peak-memory run")
+    parser.add_argument("--json", metavar="FILE", help="Write results as JSON to FILE")
+    parser.add_argument("--verbose", action="store_true", help="Show generator output")
+    args = parser.parse_args()
+
+    with open(PROJECT_ROOT / "web_version_admin" / "challenges.json", "r", encoding="utf-8") as f:
+        folders = {cid: entry["folder"] for cid, entry in json.load(f).items()}
+
+    selected = args.challenges or list(GENERATOR_MODULES)
+    unknown = [cid for cid in selected if cid not in GENERATOR_MODULES]
+    if unknown:
+        print(f"❌ ERROR: Unknown challenge ID(s): {', '.join(unknown)}", file=sys.stderr)
+        sys.exit(1)
+
+    print("\n⏱️  CCRI Flag Generator Benchmark\n" + "=" * 40)
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="ccri_bench_") as tmp:
+        sandbox = Path(tmp).resolve()
+        prepare_sandbox(sandbox)
+        for challenge_id in selected:
+            print(f"🚀 Benchmarking {challenge_id} ({args.runs} runs)...")
+            results[challenge_id] = benchmark_generator(
+                challenge_id, folders.get(challenge_id, challenge_id), sandbox,
+                args.runs, args.warmup, not args.no_memory, args.verbose
+            )
+
+    print_table(results)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"python": sys.version.split()[0], "results": results}, f, indent=2)
+        print(f"💾 JSON results saved to: {args.json}")
+
+if __name__ == "__main__":
+    main()
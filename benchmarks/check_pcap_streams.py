@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+import argparse
+import importlib.util
+import os
+import struct
+import sys
+import tempfile
+
+# === CCRI PCAP Stream Tracking Check ===
+# Crafts small captures with full TCP handshakes and teardowns (traffic.pcap
+# has neither) and checks that the native reader in 18_Pcap_Search assigns
+# stream IDs the way tshark's tcp.stream does: the closing ACK stays in its
+# stream, and only a new SYN on the same 4-tuple (or a packet after the
+# closed-flow timeout) opens a new one. The stream index and its cache file
+# are checked against the same expectations.
+
+def find_project_root():
+    """Walk up from this script until .ccri_ctf_root is found."""
+    dir_path = os.path.abspath(os.path.dirname(__file__))
+    while dir_path != "/":
+        if os.path.exists(os.path.join(dir_path, ".ccri_ctf_root")):
+            return dir_path
+        dir_path = os.path.dirname(dir_path)
+    print("❌ ERROR: Could not find .ccri_ctf_root marker. Are you inside the CTF folder?", file=sys.stderr)
+    sys.exit(1)
+
+def load_analyzer(project_root):
+    """Import analyze_pcap.py as a module (it is a script, not a package)."""
+    path = os.path.join(project_root, "challenges", "18_Pcap_Search", "analyze_pcap.py")
+    spec = importlib.util.spec_from_file_location("analyze_pcap", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    module.validation_mode = True  # Quiet: no indexing progress output
+    return module
+
+FIN, SYN, RST, PSH, ACK = 0x01, 0x02, 0x04, 0x08, 0x10
+CLIENT = (bytes([10, 0, 0, 5]), 50123)
+SERVER = (bytes([10, 0, 0, 80]), 80)
+
+def frame(src, dst, seq, ack, flags, payload=b""):
+    """Ethernet + IPv4 + TCP frame (checksums left at zero; the reader ignores them)."""
+    tcp = struct.pack("!HHIIBBHHH", src[1], dst[1], seq, ack, 5 << 4, flags, 65535, 0, 0) + payload
+    ip = struct.pack("!BBHHHBBH4s4s", 0x45, 0, 20 + len(tcp), 0, 0x4000, 64, 6, 0, src[0], dst[0]) + tcp
+    return b"\x00" * 12 + b"\x08\x00" + ip
+
+def connection(start, client_isn=1000, server_isn=5000, flag="CCRI-TEST-0001"):
+    """(timestamp, frame) for SYN, SYN/ACK, ACK, GET, response, FIN, FIN, ACK."""
+    request = b"GET /status HTTP/1.1\r\nHost: liber8.local\r\n\r\n"
+    response = (f"HTTP/1.1 200 OK\r\nServer: nginx\r\nX-Flag: {flag}\r\n"
+                "Content-Length: 2\r\n\r\nok").encode("ascii")
+    c, s = client_isn, server_isn
+    packets = [
+        frame(CLIENT, SERVER, c, 0, SYN),
+        frame(SERVER, CLIENT, s, c + 1, SYN | ACK),
+        frame(CLIENT, SERVER, c + 1, s + 1, ACK),
+        frame(CLIENT, SERVER, c + 1, s + 1, PSH | ACK, request),
+        frame(SERVER, CLIENT, s + 1, c + 1 + len(request), PSH | ACK, response),
+        frame(CLIENT, SERVER, c + 1 + len(request), s + 1 + len(response), FIN | ACK),
+        frame(SERVER, CLIENT, s + 1 + len(response), c + 2 + len(request), FIN | ACK),
+        frame(CLIENT, SERVER, c + 2 + len(request), s + 2 + len(response), ACK),
+    ]
+    return [(start + i * 0.01, packet) for i, packet in enumerate(packets)]
+
+def write_pcap(path, packets):
+    with open(path, "wb") as f:
+        f.write(struct.pack("<IHHiIII", 0xA1B2C3D4, 2, 4, 0, 0, 65535, 1))
+        for timestamp, packet in packets:
+            sec = int(timestamp)
+            usec = int(round((timestamp - sec) * 1e6))
+            f.write(struct.pack("<IIII", sec, usec, len(packet), len(packet)) + packet)
+
+def stream_packets(analyzer, pcap_file):
+    """
+    {stream id: packet count} and the X-Flag stream IDs, from the one-pass
+    index. The index goes through its on-disk cache (written, then read back)
+    so the cached stream IDs are checked too.
+    """
+    analyzer._stream_index_memo.clear()
+    index_file = analyzer.stream_index_path(pcap_file)
+    if os.path.exists(index_file):
+        os.remove(index_file)
+    analyzer.load_stream_index(pcap_file)
+    analyzer._stream_index_memo.clear()
+    streams = analyzer.load_stream_index(pcap_file)["streams"]  # From the cache file
+    if analyzer.extract_tcp_streams(pcap_file) != sorted(streams, key=int):
+        raise AssertionError("extract_tcp_streams disagrees with the index")
+    counts = {int(sid): entry["packets"] for sid, entry in streams.items()}
+    flags = {
+        message["stream"]
+        for message in analyzer.search_pcap(pcap_file, "http.header contains X-Flag")
+    }
+    if {int(sid) for sid, entry in streams.items() if entry["matches"]} != flags:
+        raise AssertionError("index flag matches disagree with the X-Flag stream IDs")
+    return counts, flags
+
+def main():
+    parser = argparse.ArgumentParser(description="Check TCP stream tracking in the native pcap reader.")
+    parser.parse_args()
+    analyzer = load_analyzer(find_project_root())
+    timeout = analyzer.CLOSED_FLOW_TIMEOUT
+
+    cases = [
+        # name, packets, expected {stream: packets}, expected X-Flag streams
+        ("handshake + teardown", connection(100.0), {0: 8}, {0}),
+        ("4-tuple reused after close",
+         connection(100.0) + connection(101.0, 9000, 13000, "CCRI-TEST-0002"),
+         {0: 8, 1: 8}, {0, 1}),
+        ("late retransmitted ACK within timeout",
+         connection(100.0) + [(100.0 + timeout / 2, connection(100.0)[-1][1])],
+         {0: 9}, {0}),
+        ("packet after closed-flow timeout",
+         connection(100.0) + [(100.0 + timeout * 2, connection(100.0)[-1][1])],
+         {0: 8, 1: 1}, {0}),
+    ]
+
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, packets, want_counts, want_flags in cases:
+            pcap_file = os.path.join(tmp, "case.pcap")
+            write_pcap(pcap_file, packets)
+            counts, flags = stream_packets(analyzer, pcap_file)
+            if counts == want_counts and flags == want_flags:
+                print(f"✅ {name}: streams {counts}")
+            else:
+                failures += 1
+                print(f"❌ {name}: got streams {counts} / X-Flag in {sorted(flags)}, "
+                      f"expected {want_counts} / {sorted(want_flags)}", file=sys.stderr)
+
+    if failures:
+        print(f"\n🚨 {failures} of {len(cases)} stream tracking checks failed.", file=sys.stderr)
+        sys.exit(1)
+    print(f"\n✅ All {len(cases)} stream tracking checks passed.")
+
+if __name__ == "__main__":
+    main()
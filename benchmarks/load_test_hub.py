@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+import argparse
+import base64
+import json
+import os
+import random
+import signal
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+# === CCRI CTF Hub Load Tester ===
+# Simulates a classroom of students hitting the Flask hub:
+#   browse /  ->  open /challenge/<id>  ->  download a file  ->  submit flags
+# and reports throughput, latency percentiles and error rates.
+
+DEFAULT_URL = "http://127.0.0.1:5000"
+ENCODE_KEY = "CTF4EVER"
+STARTUP_TIMEOUT = 20
+
+def find_project_root():
+    """Walk up from this script until .ccri_ctf_root is found."""
+    dir_path = os.path.abspath(os.path.dirname(__file__))
+    while dir_path != "/":
+        if os.path.exists(os.path.join(dir_path, ".ccri_ctf_root")):
+            return dir_path
+        dir_path = os.path.dirname(dir_path)
+    print("❌ ERROR: Could not find .ccri_ctf_root marker. Are you inside the CTF folder?", file=sys.stderr)
+    sys.exit(1)
+
+def xor_decode(encoded_base64, key):
+    """Mirror of server.xor_decode for student-mode flags."""
+    decoded_bytes = base64.b64decode(encoded_base64)
+    return ''.join(
+        chr(b ^ ord(key[i % len(key)])) for i, b in enumerate(decoded_bytes)
+    )
+
+def load_targets(server_dir, project_root):
+    """
+    Build the list of challenges to hit: ID, correct flag and the files the
+    hub would list on the challenge page.
+    """
+    with open(os.path.join(server_dir, "challenges.json"), "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    targets = []
+    for challenge_id, entry in data.items():
+        flag = entry["flag"].strip()
+        if not flag.startswith("CCRI-"):
+            flag = xor_decode(flag, ENCODE_KEY).strip()
+
+        folder = os.path.join(project_root, "challenges", entry["folder"])
+        files = []
+        if os.path.isdir(folder):
+            files = [
+                f for f in os.listdir(folder)
+                if os.path.isfile(os.path.join(folder, f))
+                and f != "README.txt"
+                and not f.startswith(".")
+            ]
+        targets.append({"id": challenge_id, "flag": flag, "files": files})
+    return targets
+
+# === Hub process management ===
+def wait_for_hub(base_url, timeout=STARTUP_TIMEOUT):
+    """Poll the index page until the hub answers or the timeout expires."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(base_url + "/", timeout=2) as resp:
+                if resp.status == 200:
+                    return True
+        except (urllib.error.URLError, OSError):
+            time.sleep(0.25)
+    return False
+
+def start_hub(server_path, log_file):
+    """Launch server.py in its own process group, logging to log_file."""
+    print(f"🌐 Launching hub from: {server_path}")
+    log = open(log_file, "w")
+    process = subprocess.Popen(
+        [sys.executable, server_path],
+        cwd=os.path.dirname(server_path),
+        stdout=log,
+        stderr=subprocess.STDOUT,
+        preexec_fn=os.setpgrp
+    )
+    return process, log
+
+def stop_hub(process, log):
+    """Terminate the hub (and its fake-service threads) we started."""
+    try:
+        os.killpg(process.pid, signal.SIGTERM)
+        process.wait(timeout=5)
+    except (ProcessLookupError, subprocess.TimeoutExpired):
+        os.killpg(process.pid, signal.SIGKILL)
+    log.close()
+    print("🛑 Hub stopped.")
+
+# === Simulated students ===
+class Stats:
+    """Thread-safe collector of per-action latencies and failures."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = {}
+        self.errors = {}
+
+    def record(self, action, seconds, ok):
+        with self.lock:
+            self.latencies.setdefault(action, []).append(seconds)
+            if not ok:
+                self.errors[action] = self.errors.get(action, 0) + 1
+
+def timed_request(stats, action, url, expected_status, data=None):
+    """Issue one request and record its latency and whether it matched expectations."""
+    headers = {"Content-Type": "application/json"} if data is not None else {}
+    req = urllib.request.Request(url, data=data, headers=headers)
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=30) as resp:
+            resp.read()
+            status = resp.status
+    except urllib.error.HTTPError as e:
+        e.read()
+        status = e.code
+    except (urllib.error.URLError, OSError):
+        status = None
+    stats.record(action, time.perf_counter() - start, status == expected_status)
+
+def student_session(base_url, targets, stats, stop_event, think_time, rng):
+    """One student looping through a realistic browse/download/submit cycle."""
+    while not stop_event.is_set():
+        target = rng.choice(targets)
+        challenge_url = f"{base_url}/challenge/{target['id']}"
+
+        timed_request(stats, "index", base_url + "/", 200)
+        timed_request(stats, "challenge_view", challenge_url, 200)
+        if target["files"]:
+            filename = rng.choice(target["files"])
+            timed_request(stats, "get_challenge_file",
+                          f"{challenge_url}/file/{urllib.request.quote(filename)}", 200)
+
+        submit_url = f"{base_url}/submit_flag/{target['id']}"
+        wrong = json.dumps({"flag": "CCRI-AAAA-0000"}).encode("utf-8")
+        right = json.dumps({"flag": target["flag"]}).encode("utf-8")
+        timed_request(stats, "submit_flag_wrong", submit_url, 400, data=wrong)
+        timed_request(stats, "submit_flag_right", submit_url, 200, data=right)
+
+        if think_time:
+            stop_event.wait(rng.uniform(0, think_time))
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+def summarize(stats, elapsed):
+    """Turn raw samples into a per-action report plus an overall row."""
+    report = {"elapsed_s": round(elapsed, 3), "actions": {}}
+    all_latencies = []
+    total_errors = 0
+    for action, values in sorted(stats.latencies.items()):
+        values.sort()
+        all_latencies.extend(values)
+        errors = stats.errors.get(action, 0)
+        total_errors += errors
+        report["actions"][action] = {
+            "requests": len(values),
+            "errors": errors,
+            "error_rate": errors / len(values),
+            "p50_ms": percentile(values, 50) * 1000,
+            "p95_ms": percentile(values, 95) * 1000,
+            "p99_ms": percentile(values, 99) * 1000,
+            "max_ms": values[-1] * 1000,
+        }
+    all_latencies.sort()
+    total = len(all_latencies)
+    report["total"] = {
+        "requests": total,
+        "errors": total_errors,
+        "error_rate": total_errors / total if total else 0.0,
+        "throughput_rps": total / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(all_latencies, 50) * 1000,
+        "p95_ms": percentile(all_latencies, 95) * 1000,
+        "p99_ms": percentile(all_latencies, 99) * 1000,
+    }
+    return report
+
+def print_report(report, users):
+    print(f"\n📊 Load Test Results ({users} simulated students, {report['elapsed_s']:.1f}s)")
+    print(f"{'action':<22}{'reqs':>8}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    print("-" * 78)
+    for action, row in report["actions"].items():
+        print(f"{action:<22}{row['requests']:>8}{row['errors']:>8}"
+              f"{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}{row['p99_ms']:>10.1f}{row['max_ms']:>10.1f}")
+    total = report["total"]
+    print("-" * 78)
+    print(f"🚀 Throughput: {total['throughput_rps']:.1f} req/s")
+    print(f"⏱️  Latency: p50={total['p50_ms']:.1f}ms p95={total['p95_ms']:.1f}ms p99={total['p99_ms']:.1f}ms")
+    print(f"❌ Errors: {total['errors']} / {total['requests']} ({total['error_rate']:.2%})")
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate a classroom of students against the CTF hub.")
+    parser.add_argument("--users", type=int, default=30, help="Number of simulated students (default: 30)")
+    parser.add_argument("--duration", type=float, default=30, help="Test length in seconds (default: 30)")
+    parser.add_argument("--ramp-up", type=float, default=5, help="Seconds over which students join (default: 5)")
+    parser.add_argument("--think-time", type=float, default=1.0,
+                        help="Max random pause between a student's cycles in seconds (default: 1.0)")
+    parser.add_argument("--mode", choices=["admin", "student"], default="admin",
+                        help="Which hub to launch (default: admin)")
+    parser.add_argument("--url", help="Test an already running hub at this URL instead of launching one")
+    parser.add_argument("--seed", type=int, help="Random seed for reproducible runs")
+    parser.add_argument("--json", metavar="FILE", help="Also write the report as JSON to FILE")
+    parser.add_argument("--max-error-rate", type=float,
+                        help="Exit non-zero if the overall error rate exceeds this fraction (e.g. 0.01)")
+    parser.add_argument("--max-p95-ms", type=float,
+                        help="Exit non-zero if the overall p95 latency exceeds this many ms")
+    args = parser.parse_args()
+
+    print("\n🏫 CCRI CTF Hub Load Tester\n" + "=" * 40)
+    project_root = find_project_root()
+    server_dir = os.path.join(project_root, "web_version_admin" if args.mode == "admin" else "web_version")
+    server_file = "server.py" if args.mode == "admin" else "server.pyc"
+    server_path = os.path.join(server_dir, server_file)
+
+    targets = load_targets(server_dir, project_root)
+    if not targets:
+        print(f"❌ ERROR: No challenges found in {server_dir}/challenges.json", file=sys.stderr)
+        sys.exit(1)
+
+    base_url = (args.url or DEFAULT_URL).rstrip("/")
+    hub = None
+    if args.url is None:
+        if wait_for_hub(base_url, timeout=1):
+            print(f"❌ ERROR: Something is already listening on {base_url}. "
+                  "Stop it or pass --url to test it directly.", file=sys.stderr)
+            sys.exit(1)
+        if not os.path.isfile(server_path):
+            print(f"❌ ERROR: Cannot find {server_path}", file=sys.stderr)
+            sys.exit(1)
+        hub = start_hub(server_path, os.path.join(project_root, "load_test_server.log"))
+
+    try:
+        if not wait_for_hub(base_url):
+            print(f"❌ ERROR: Hub did not answer at {base_url} within {STARTUP_TIMEOUT}s.", file=sys.stderr)
+            sys.exit(1)
+        print(f"✅ Hub is up at {base_url}. Sending {args.users} students for {args.duration:.0f}s...")
+
+        stats = Stats()
+        stop_event = threading.Event()
+        seed_rng = random.Random(args.seed)
+        threads = []
+        start = time.perf_counter()
+        for i in range(args.users):
+            rng = random.Random(seed_rng.random())
+            t = threading.Thread(
+                target=student_session,
+                args=(base_url, targets, stats, stop_event, args.think_time, rng),
+                daemon=True
+            )
+            t.start()
+            threads.append(t)
+            if args.ramp_up and args.users > 1:
+                time.sleep(args.ramp_up / args.users)
+
+        remaining = args.duration - (time.perf_counter() - start)
+        if remaining > 0:
+            time.sleep(remaining)
+        stop_event.set()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - start
+    finally:
+        if hub:
+            stop_hub(*hub)
+
+    report = summarize(stats, elapsed)
+    report["users"] = args.users
+    print_report(report, args.users)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 JSON report saved to: {args.json}")
+
+    failed = False
+    if args.max_error_rate is not None and report["total"]["error_rate"] > args.max_error_rate:
+        print(f"🚨 Error rate {report['total']['error_rate']:.2%} exceeds limit {args.max_error_rate:.2%}")
+        failed = True
+    if args.max_p95_ms is not None and report["total"]["p95_ms"] > args.max_p95_ms:
+        print(f"🚨 p95 latency {report['total']['p95_ms']:.1f}ms exceeds limit {args.max_p95_ms:.1f}ms")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,21 @@
 #!/usr/bin/env python3
 import os
+import shutil
 import subprocess
 import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
 # === Stego Decode Helper ===
 
+# steghide is a separate process per attempt, so threads are enough to keep
+# every core busy; more workers than cores just adds contention.
+DEFAULT_WORKERS = min(8, os.cpu_count() or 1)
+QUEUE_DEPTH = 4          # attempts queued per worker (bounds memory on huge wordlists)
+PROGRESS_INTERVAL = 0.5  # seconds between tries/sec updates
+
 def find_project_root():
     dir_path = os.path.abspath(os.path.dirname(__file__))
     while dir_path != "/":
@@ -36,6 +47,119 @@ def run_steghide(password, target_image, decoded_file):
         print("❌ ERROR: steghide is not installed or not in PATH.", file=sys.stderr)
         sys.exit(1)
 
+def iter_wordlist(wordlist_file):
+    """Yield candidate passphrases one per line, streaming (wordlists can be huge)."""
+    with open(wordlist_file, "r", encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            password = line.rstrip("\r\n")
+            if password:
+                yield password
+
+def search_passphrases(target_image, wordlist_file, decoded_file, workers=DEFAULT_WORKERS, progress=None):
+    """
+    Try every passphrase in wordlist_file on a bounded pool of workers.
+    Each worker extracts into its own temp file, so attempts never clobber
+    each other; the first success cancels all queued attempts and its output
+    is copied to decoded_file.
+    Returns (password or None, attempts made, elapsed seconds).
+    """
+    if shutil.which("steghide") is None:
+        print("❌ ERROR: steghide is not installed or not in PATH.", file=sys.stderr)
+        sys.exit(1)
+
+    found = threading.Event()
+    local = threading.local()
+    work_dir = tempfile.mkdtemp(prefix="stego_search_")
+
+    def attempt(password):
+        if found.is_set():
+            return None  # Cancelled: someone already found it
+        out_file = getattr(local, "out_file", None)
+        if out_file is None:
+            out_file = local.out_file = os.path.join(work_dir, f"worker_{threading.get_ident()}.txt")
+        if run_steghide(password, target_image, out_file):
+            found.set()
+            return password, out_file
+        return password, None
+
+    winner = None
+    tried = 0
+    start = last_report = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            pending = set()
+
+            def collect(done):
+                nonlocal winner, tried
+                for future in done:
+                    result = future.result()
+                    if result is None:
+                        continue
+                    tried += 1
+                    if result[1] and winner is None:
+                        winner = result
+
+            for password in iter_wordlist(wordlist_file):
+                pending.add(pool.submit(attempt, password))
+                if len(pending) >= workers * QUEUE_DEPTH:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+                if progress and time.perf_counter() - last_report >= PROGRESS_INTERVAL:
+                    last_report = time.perf_counter()
+                    progress(tried, last_report - start)
+                if winner:
+                    break
+
+            if winner:
+                for future in pending:
+                    future.cancel()
+            done, _ = wait(pending)
+            collect(f for f in done if not f.cancelled())
+
+        if winner:
+            shutil.copyfile(winner[1], decoded_file)
+        return (winner[0] if winner else None), tried, time.perf_counter() - start
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+def print_search_progress(tried, elapsed):
+    rate = tried / elapsed if elapsed else 0.0
+    print(f"\r   🔑 {tried} passwords tried ({rate:.0f}/s)", end="", flush=True)
+
+def wordlist_search(project_root, script_dir, target_image, decoded_file):
+    """Student mode: run the parallel wordlist search and show the result."""
+    candidates = [
+        os.path.join(script_dir, "wordlist.txt"),
+        os.path.join(project_root, "challenges", "05_Archive_Password", "wordlist.txt"),
+    ]
+    default = next((path for path in candidates if os.path.isfile(path)), "")
+    prompt = f"📄 Wordlist file [{os.path.relpath(default, script_dir)}]: " if default else "📄 Wordlist file: "
+    wordlist_file = input(prompt).strip() or default
+    if not wordlist_file or not os.path.isfile(wordlist_file):
+        print("❌ Wordlist not found.\n")
+        return False
+
+    workers = DEFAULT_WORKERS
+    print(f"\n🚀 Trying every password in {os.path.basename(wordlist_file)} with {workers} steghide workers in parallel...")
+    password, tried, elapsed = search_passphrases(
+        target_image, wordlist_file, decoded_file, workers=workers, progress=print_search_progress
+    )
+    rate = tried / elapsed if elapsed else 0.0
+    print(f"\r   🔑 {tried} passwords tried in {elapsed:.1f}s ({rate:.0f}/s)          \n")
+
+    if not password:
+        print("❌ No password in that wordlist unlocked the image.\n")
+        return False
+
+    print(f"🎉 ✅ SUCCESS! The password was: {password}")
+    print("----------------------------")
+    with open(decoded_file, "r") as f:
+        print(f.read())
+    print("----------------------------")
+    print("📁 Saved as decoded_message.txt in this folder")
+    print("💡 Look for a string like CCRI-ABCD-1234 to use as your flag.\n")
+    return True
+
 def main():
     project_root = find_project_root()
     script_dir = os.path.abspath(os.path.dirname(__file__))
@@ -81,10 +205,12 @@ def main():
     print("   -sf squirrel.jpg          → Stego file (the image to scan)")
     print("   -xf decoded_message.txt   → Extract to this file")
     print("   -p [password]             → Try this password for extraction\n")
+    print("📚 Got a list of likely passwords? Type 'wordlist' to try them all at once,")
+    print("   several steghide attempts in parallel, stopping as soon as one works.\n")
     pause()
 
     while True:
-        pw = input("🔑 Enter a password to try (or type 'exit' to quit): ").strip()
+        pw = input("🔑 Enter a password to try ('wordlist' to search a list, 'exit' to quit): ").strip()
 
         if not pw:
             print("⚠️ You must enter something. Try again.\n")
@@ -95,6 +221,12 @@ def main():
             pause("Press ENTER to close this window...")
             sys.exit(0)
 
+        if pw.lower() == "wordlist":
+            if wordlist_search(project_root, script_dir, target_image, decoded_file):
+                pause("Press ENTER to close this terminal...")
+                sys.exit(0)
+            continue
+
         print(f"\n🔓 Trying password: {pw}")
         print("📦 Scanning squirrel.jpg for hidden data...\n")
         print(f"💻 Running: steghide extract -sf \"{target_image}\" -xf \"{decoded_file}\" -p \"{pw}\"\n")
@@ -3,6 +3,7 @@ import os
 import sys
 import time
 import json
+import re
 
 # === Fix: Locate project root and add to sys.path ===
 from pathlib import Path
@@ -17,6 +18,7 @@ else:
     sys.exit(1)
 
 from flag_generators.gen_03_rot13 import ROT13FlagGenerator  # ✅ Animation function
+from flag_generators.ciphers import ShiftCipher
 
 # === ROT13 Decoder Helper ===
 
@@ -37,6 +39,37 @@ def pause(prompt="Press ENTER to continue..."):
     if not validation_mode:
         input(prompt)
 
+def find_ccri_flags(text):
+    return re.findall(r"CCRI-[A-Z]{4}-\d{4}", text)
+
+def brute_force_shifts(cipher_file, output_file):
+    """Try all 25 ROT shifts, rank them by English letter frequency and save the best."""
+    with open(cipher_file, "r", encoding="utf-8", errors="replace") as f:
+        ciphertext = f.read()
+
+    ranked = ShiftCipher.brute_force(ciphertext)
+    first_line = next((line for line in ciphertext.splitlines() if line.strip()), "")
+
+    print("🔎 Trying all 25 shifts and scoring each one against English letter frequencies...\n")
+    print(f"{'rank':>4}  {'shift':>5}  {'score':>9}  preview")
+    print("-" * 60)
+    for rank, (shift, score) in enumerate(ranked, 1):
+        preview = ShiftCipher.rot(first_line, shift)[:38]
+        marker = "  ⬅️ most English-like" if rank == 1 else ""
+        print(f"{rank:>4}  {shift:>5}  {score:>9.1f}  {preview}{marker}")
+
+    best_shift = ranked[0][0]
+    ShiftCipher.transform_file(cipher_file, output_file, best_shift)
+    with open(output_file, "r", encoding="utf-8", errors="replace") as f:
+        decoded_message = f.read()
+
+    print(f"\n🏆 Best shift: ROT{best_shift}" + (" (that's ROT13!)" if best_shift == 13 else ""))
+    flags = find_ccri_flags(decoded_message)
+    if flags:
+        print("🚩 Flag-shaped strings in the decoded text:")
+        for flag in flags:
+            print(f"   ➡️ {flag}")
+
 def main():
     project_root = find_project_root()
     script_dir = os.path.abspath(os.path.dirname(__file__))
@@ -54,19 +87,15 @@ def main():
             print(f"❌ ERROR: Could not load validation unlocks: {e}", file=sys.stderr)
             sys.exit(1)
 
-        # Decode the entire file
+        # Decode the entire file (streamed straight into the output file)
         try:
-            with open(cipher_file, "r") as f:
-                encoded_lines = f.readlines()
-            decoded_message = "".join([ROT13FlagGenerator.rot13(line) for line in encoded_lines])
+            ShiftCipher.transform_file(cipher_file, output_file, 13)
+            with open(output_file, "r", encoding="utf-8", errors="replace") as f:
+                decoded_message = f.read()
         except Exception as e:
             print(f"❌ ERROR reading or decoding cipher.txt: {e}", file=sys.stderr)
             sys.exit(1)
 
-        # Save decoded message
-        with open(output_file, "w") as f_out:
-            f_out.write(decoded_message + "\n")
-
         # Check for flag
         if expected_flag in decoded_message:
             print(f"✅ Validation success: found flag {expected_flag}")
@@ -101,22 +130,26 @@ def main():
         pause("Press ENTER to close this terminal...")
         sys.exit(1)
 
-    # Read encoded message
-    with open(cipher_file, "r") as f:
-        encoded_lines = f.readlines()
+    print("\n⚡ Two ways to decode it:")
+    print("   1) Animated decoder → watch each line rotate 13 places (classic)")
+    print("   2) Brute force      → try all 25 shifts and let Python pick the most English-looking one\n")
+    choice = input("Choose [1/2] (default 1): ").strip()
 
     clear_screen()
     print("🔓 Decoding intercepted message...\n")
 
-    # Animate line-by-line ROT13 transformation
-    ROT13FlagGenerator.animate_rot13_line_by_line(encoded_lines, delay=0.05)
+    if choice == "2":
+        brute_force_shifts(cipher_file, output_file)
+    else:
+        # Read encoded message
+        with open(cipher_file, "r") as f:
+            encoded_lines = f.readlines()
 
-    # Fully decode for output file
-    decoded_message = "".join([ROT13FlagGenerator.rot13(line) for line in encoded_lines])
+        # Animate line-by-line ROT13 transformation
+        ROT13FlagGenerator.animate_rot13_line_by_line(encoded_lines, delay=0.05)
 
-    # Save decoded output
-    with open(output_file, "w") as f_out:
-        f_out.write(decoded_message + "\n")
+        # Fully decode for output file (one translate pass over the whole file)
+        ShiftCipher.transform_file(cipher_file, output_file, 13)
 
     print("\n✅ Final Decoded Message saved to:")
     print(f"   📁 {output_file}\n")
@@ -3,6 +3,28 @@ import os
 import sys
 import json
 import re
+import time
+from collections import Counter
+from math import gcd
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # Auto-crack falls back to pure Python
+
+# === Locate project root and add to sys.path (shared cipher kernels) ===
+from pathlib import Path
+
+dir_path = Path(__file__).resolve().parent
+for parent in [dir_path] + list(dir_path.parents):
+    if (parent / ".ccri_ctf_root").exists():
+        sys.path.insert(0, str(parent))
+        break
+else:
+    print("❌ ERROR: Could not find project root (.ccri_ctf_root)", file=sys.stderr)
+    sys.exit(1)
+
+from flag_generators.ciphers import ENGLISH_FREQ, VigenereCipher
 
 # === Vigenère Cipher Breaker ===
 
@@ -24,24 +46,141 @@ def pause(prompt="Press ENTER to continue..."):
         input(prompt)
 
 def vigenere_decrypt(ciphertext, key):
-    """Standard Vigenère decryption."""
-    result = []
-    key = key.lower()
-    key_len = len(key)
-    key_indices = [ord(k) - ord('a') for k in key]
-    key_pos = 0
-
-    for char in ciphertext:
-        if char.isalpha():
-            offset = ord('A') if char.isupper() else ord('a')
-            pi = ord(char) - offset
-            ki = key_indices[key_pos % key_len]
-            decrypted = chr((pi - ki) % 26 + offset)
-            result.append(decrypted)
-            key_pos += 1
-        else:
-            result.append(char)
-    return ''.join(result)
+    """Standard Vigenère decryption (bulk kernel shared with the generator)."""
+    return VigenereCipher.decrypt(ciphertext, key)
+
+# === Automatic key recovery ===
+# 1) Estimate the key length: the index of coincidence (IoC) of every L-th
+#    letter is close to English (~0.066) only when L is a multiple of the real
+#    key length (Friedman test); repeated trigram distances back this up (Kasiski).
+# 2) For each candidate length, solve each column as a Caesar shift by picking
+#    the shift whose letter counts best match English (chi-squared).
+# 3) Decrypt with each ranked key and look for a CCRI flag.
+
+ENGLISH_IOC = 0.0667
+MAX_KEY_LENGTH = 20
+KASISKI_SAMPLE = 20000  # letters scanned for repeated trigrams
+
+_LETTERS = bytes(range(ord("A"), ord("Z") + 1))
+_DROP_NON_LETTERS = bytes(b for b in range(256) if b not in _LETTERS)
+
+def letters_only(ciphertext):
+    """Return the ASCII letters of ciphertext as uppercase bytes."""
+    return ciphertext.upper().encode("ascii", "ignore").translate(None, _DROP_NON_LETTERS)
+
+def column_counts(letters, key_length):
+    """Letter counts for each of key_length columns, as a key_length x 26 table."""
+    if np is not None:
+        values = np.frombuffer(letters, dtype=np.uint8).astype(np.int64) - ord("A")
+        columns = np.arange(values.size) % key_length
+        return np.bincount(columns * 26 + values, minlength=key_length * 26).reshape(key_length, 26)
+    return [[letters[i::key_length].count(c) for c in _LETTERS] for i in range(key_length)]
+
+def average_ioc(counts):
+    """Mean index of coincidence over the columns of a count table."""
+    if np is not None:
+        totals = counts.sum(axis=1)
+        valid = totals > 1
+        if not valid.any():
+            return 0.0
+        iocs = (counts * (counts - 1)).sum(axis=1)[valid] / (totals[valid] * (totals[valid] - 1))
+        return float(iocs.mean())
+    iocs = []
+    for row in counts:
+        total = sum(row)
+        if total > 1:
+            iocs.append(sum(n * (n - 1) for n in row) / (total * (total - 1)))
+    return sum(iocs) / len(iocs) if iocs else 0.0
+
+def kasiski_lengths(letters, max_length=MAX_KEY_LENGTH):
+    """Count how often each key length divides the distance between repeated trigrams."""
+    sample = letters[:KASISKI_SAMPLE]
+    last_seen = {}
+    votes = Counter()
+    for i in range(len(sample) - 2):
+        trigram = sample[i:i + 3]
+        if trigram in last_seen:
+            distance = i - last_seen[trigram]
+            for length in range(2, max_length + 1):
+                if distance % length == 0:
+                    votes[length] += 1
+        last_seen[trigram] = i
+    return votes
+
+def estimate_key_lengths(letters, max_length=MAX_KEY_LENGTH, top=5):
+    """
+    Rank likely key lengths. Multiples of the true length score just as well
+    on IoC, so among lengths whose IoC is near the best we prefer the shortest.
+    """
+    max_length = max(1, min(max_length, len(letters) // 2))
+    iocs = {length: average_ioc(column_counts(letters, length)) for length in range(1, max_length + 1)}
+    kasiski = kasiski_lengths(letters, max_length)
+    best_ioc = max(iocs.values())
+
+    def rank(length):
+        near_best = iocs[length] >= 0.9 * best_ioc
+        return (not near_best, abs(iocs[length] - ENGLISH_IOC) if not near_best else length, -kasiski[length])
+
+    ranked = sorted(iocs, key=rank)
+    return [(length, iocs[length], kasiski[length]) for length in ranked[:top]]
+
+def solve_columns(letters, key_length):
+    """Find the most English-like Caesar shift per column; returns (key, total chi-squared)."""
+    counts = column_counts(letters, key_length)
+    if np is not None:
+        freq = np.array(ENGLISH_FREQ)
+        shifts = (np.arange(26)[:, None] + np.arange(26)[None, :]) % 26  # [shift, plain letter]
+        rotated = counts[:, shifts]  # [column, shift, plain letter] counts
+        expected = counts.sum(axis=1)[:, None, None] * freq[None, None, :]
+        chi = ((rotated - expected) ** 2 / np.maximum(expected, 1e-9)).sum(axis=2)
+        best = chi.argmin(axis=1)
+        key = "".join(chr(ord("a") + int(k)) for k in best)
+        return key, float(chi[np.arange(key_length), best].sum())
+
+    key, total_chi = [], 0.0
+    for row in counts:
+        n = sum(row)
+        scores = []
+        for shift in range(26):
+            chi = 0.0
+            for plain in range(26):
+                expected = max(n * ENGLISH_FREQ[plain], 1e-9)
+                chi += (row[(plain + shift) % 26] - expected) ** 2 / expected
+            scores.append((chi, shift))
+        chi, shift = min(scores)
+        key.append(chr(ord("a") + shift))
+        total_chi += chi
+    return "".join(key), total_chi
+
+def crack_vigenere(ciphertext, max_length=MAX_KEY_LENGTH):
+    """
+    Recover likely keys for ciphertext. Returns a list of candidate dicts
+    (key, key_length, ioc, kasiski, chi2, flag), best first; the first
+    candidate whose decryption contains a CCRI flag is moved to the front.
+    """
+    letters = letters_only(ciphertext)
+    if len(letters) < 2:
+        return []
+
+    candidates = []
+    for length, ioc, votes in estimate_key_lengths(letters, max_length):
+        key, chi2 = solve_columns(letters, length)
+        candidates.append({"key": key, "key_length": length, "ioc": ioc, "kasiski": votes, "chi2": chi2, "flag": None})
+
+    for candidate in candidates:
+        candidate["flag"] = find_ccri_flag(vigenere_decrypt(ciphertext, candidate["key"]))
+        if candidate["flag"]:
+            candidates.remove(candidate)
+            candidates.insert(0, candidate)
+            break
+    return candidates
+
+def print_crack_report(candidates, elapsed):
+    engine = "NumPy" if np is not None else "pure Python"
+    print(f"\n🧮 Key analysis ({engine}, {elapsed:.3f}s):")
+    print(f"   {'rank':<6}{'length':<8}{'IoC':<9}{'Kasiski':<9}{'key':<22}flag")
+    for rank, c in enumerate(candidates, start=1):
+        print(f"   {rank:<6}{c['key_length']:<8}{c['ioc']:<9.4f}{c['kasiski']:<9}{c['key']:<22}{c['flag'] or '-'}")
 
 def find_ccri_flag(text):
     """Find a CCRI flag in the given text."""
@@ -82,6 +221,14 @@ def main():
             ciphertext = f.read()
         plaintext = vigenere_decrypt(ciphertext, keyword)
 
+        # Exercise the automatic cracker too (informational; short texts can fool it)
+        start = time.perf_counter()
+        candidates = crack_vigenere(ciphertext)
+        if candidates and candidates[0]["flag"]:
+            print(f"🧮 Auto-crack recovered key '{candidates[0]['key']}' in {time.perf_counter() - start:.3f}s")
+        else:
+            print("⚠️ Auto-crack did not recover the key from this ciphertext.")
+
         # Save the plaintext in the sandbox folder
         with open(output_file, "w", encoding="utf-8") as f_out:
             f_out.write(plaintext + "\n")
@@ -117,8 +264,11 @@ def main():
     with open(cipher_file, "r", encoding="utf-8") as f:
         ciphertext = f.read()
 
+    print("💡 Don't know the key? Type 'auto' and the breaker will estimate the key length")
+    print("   (index of coincidence + Kasiski) and solve each letter with frequency analysis.\n")
+
     while True:
-        key = input("🔑 Enter a keyword to try (or type 'exit' to quit): ").strip()
+        key = input("🔑 Enter a keyword to try ('auto' to crack it, 'exit' to quit): ").strip()
 
         if key.lower() == "exit":
             print("\n👋 Exiting. Stay sharp, Agent!")
@@ -128,6 +278,16 @@ def main():
             print("⚠️ Please enter a keyword or type 'exit'.\n")
             continue
 
+        if key.lower() == "auto":
+            start = time.perf_counter()
+            candidates = crack_vigenere(ciphertext)
+            print_crack_report(candidates, time.perf_counter() - start)
+            if not candidates:
+                print("❌ Not enough letters to analyze.\n")
+                continue
+            key = candidates[0]["key"]
+            print(f"\n🔑 Best guess: '{key}'")
+
         plaintext = vigenere_decrypt(ciphertext, key)
         print("\n📄 Decoded Output:")
         print("-----------------------------")
@@ -4,6 +4,11 @@ import sys
 import subprocess
 import time
 import json
+import mmap
+import struct
+import zlib
+import zipfile
+import multiprocessing
 
 # === ZIP Password Cracking Challenge ===
 
@@ -34,6 +39,167 @@ def progress_bar(length=30, delay=0.03):
         time.sleep(delay)
     print()
 
+# === In-process ZipCrypto cracking engine ===
+# Instead of spawning `unzip -P pw -t` per guess, parse the ZIP once and test
+# passwords in Python. ZipCrypto prefixes the data with a 12-byte encrypted
+# header whose last byte must equal a known "check byte", so ~255 of every 256
+# wrong passwords are rejected after decrypting just 12 bytes. Survivors get a
+# full decrypt + CRC-32 check. The wordlist is memory-mapped and split into
+# newline-aligned chunks that are searched on all CPU cores.
+
+WORDLIST_CHUNK_SIZE = 4 * 1024 * 1024  # bytes of wordlist per work unit
+
+def make_crc_table():
+    """Standard CRC-32 lookup table used by the ZipCrypto key schedule."""
+    table = []
+    for n in range(256):
+        c = n
+        for _ in range(8):
+            c = (c >> 1) ^ 0xEDB88320 if c & 1 else c >> 1
+        table.append(c)
+    return table
+
+CRC_TABLE = make_crc_table()
+
+def load_zip_target(zip_path):
+    """
+    Read the first encrypted entry of zip_path once and return everything
+    needed to test passwords against it.
+    """
+    with zipfile.ZipFile(zip_path) as zf:
+        info = next((i for i in zf.infolist() if i.flag_bits & 0x1), None)
+    if info is None:
+        raise ValueError(f"{os.path.basename(zip_path)} has no password-protected entries")
+
+    with open(zip_path, "rb") as f:
+        f.seek(info.header_offset)
+        fields = struct.unpack("<IHHHHHIIIHH", f.read(30))
+        if fields[0] != 0x04034B50:
+            raise ValueError("Corrupt ZIP: bad local file header signature")
+        mod_time, name_len, extra_len = fields[4], fields[9], fields[10]
+        f.seek(name_len + extra_len, os.SEEK_CUR)
+        payload = f.read(info.compress_size)
+
+    # With a data descriptor (bit 3) the check byte comes from the mod time
+    if info.flag_bits & 0x8:
+        check_byte = (mod_time >> 8) & 0xFF
+    else:
+        check_byte = (info.CRC >> 24) & 0xFF
+
+    return {
+        "name": info.filename,
+        "header": payload[:12],
+        "data": payload[12:],
+        "check_byte": check_byte,
+        "crc": info.CRC,
+        "method": info.compress_type,
+    }
+
+def zipcrypto_decrypt(password, data, crc_table=CRC_TABLE):
+    """Decrypt data (12-byte header included) with the ZipCrypto stream cipher."""
+    k0, k1, k2 = 0x12345678, 0x23456789, 0x34567890
+    for c in password:
+        k0 = crc_table[(k0 ^ c) & 0xFF] ^ (k0 >> 8)
+        k1 = ((k1 + (k0 & 0xFF)) * 134775813 + 1) & 0xFFFFFFFF
+        k2 = crc_table[(k2 ^ (k1 >> 24)) & 0xFF] ^ (k2 >> 8)
+    out = bytearray(len(data))
+    for i, c in enumerate(data):
+        t = (k2 | 2) & 0xFFFF
+        p = c ^ (((t * (t ^ 1)) >> 8) & 0xFF)
+        out[i] = p
+        k0 = crc_table[(k0 ^ p) & 0xFF] ^ (k0 >> 8)
+        k1 = ((k1 + (k0 & 0xFF)) * 134775813 + 1) & 0xFFFFFFFF
+        k2 = crc_table[(k2 ^ (k1 >> 24)) & 0xFF] ^ (k2 >> 8)
+    return bytes(out)
+
+def header_check_passes(password, header, check_byte, crc_table=CRC_TABLE):
+    """Fast filter: decrypt only the 12-byte header and compare its last byte."""
+    k0, k1, k2 = 0x12345678, 0x23456789, 0x34567890
+    for c in password:
+        k0 = crc_table[(k0 ^ c) & 0xFF] ^ (k0 >> 8)
+        k1 = ((k1 + (k0 & 0xFF)) * 134775813 + 1) & 0xFFFFFFFF
+        k2 = crc_table[(k2 ^ (k1 >> 24)) & 0xFF] ^ (k2 >> 8)
+    for c in header:
+        t = (k2 | 2) & 0xFFFF
+        p = c ^ (((t * (t ^ 1)) >> 8) & 0xFF)
+        k0 = crc_table[(k0 ^ p) & 0xFF] ^ (k0 >> 8)
+        k1 = ((k1 + (k0 & 0xFF)) * 134775813 + 1) & 0xFFFFFFFF
+        k2 = crc_table[(k2 ^ (k1 >> 24)) & 0xFF] ^ (k2 >> 8)
+    return p == check_byte
+
+def verify_password(password, target):
+    """Full check: decrypt, decompress and compare the CRC-32."""
+    plain = zipcrypto_decrypt(password, target["header"] + target["data"])[12:]
+    try:
+        if target["method"] == zipfile.ZIP_DEFLATED:
+            plain = zlib.decompressobj(-15).decompress(plain)
+        elif target["method"] != zipfile.ZIP_STORED:
+            return False
+    except zlib.error:
+        return False
+    return zlib.crc32(plain) & 0xFFFFFFFF == target["crc"]
+
+def wordlist_chunks(wordlist_path, chunk_size=WORDLIST_CHUNK_SIZE):
+    """Yield (start, end) byte ranges of the wordlist, aligned to line breaks."""
+    size = os.path.getsize(wordlist_path)
+    if size == 0:
+        return
+    with open(wordlist_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        start = 0
+        while start < size:
+            end = min(size, start + chunk_size)
+            if end < size:
+                newline = mm.find(b"\n", end)
+                end = size if newline == -1 else newline + 1
+            yield start, end
+            start = end
+
+def crack_wordlist_range(task):
+    """Worker: test every password in one byte range of the wordlist."""
+    wordlist_path, start, end, target = task
+    header, check_byte = target["header"], target["check_byte"]
+    tried = 0
+    with open(wordlist_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for line in mm[start:end].split(b"\n"):
+            password = line.strip()
+            if not password:
+                continue
+            tried += 1
+            if header_check_passes(password, header, check_byte) and verify_password(password, target):
+                return password, tried
+    return None, tried
+
+def crack_zip_password(zip_path, wordlist_path, workers=None):
+    """
+    Search wordlist_path for the password of zip_path.
+    Returns (password or None, passwords tried, seconds elapsed).
+    """
+    target = load_zip_target(zip_path)
+    tasks = [(wordlist_path, start, end, target) for start, end in wordlist_chunks(wordlist_path)]
+    workers = workers or os.cpu_count() or 1
+    found, tried = None, 0
+    start_time = time.perf_counter()
+
+    if workers == 1 or len(tasks) <= 1:
+        for task in tasks:
+            found, count = crack_wordlist_range(task)
+            tried += count
+            if found:
+                break
+    else:
+        with multiprocessing.Pool(min(workers, len(tasks))) as pool:
+            for password, count in pool.imap_unordered(crack_wordlist_range, tasks):
+                tried += count
+                if password:
+                    found = password
+                    pool.terminate()  # Early exit: stop the other workers
+                    break
+
+    elapsed = time.perf_counter() - start_time
+    if found is not None:
+        found = found.decode("utf-8", errors="replace")
+    return found, tried, elapsed
+
 def find_file(filename, root):
     """Search for a file in root and all subdirectories."""
     for dirpath, _, files in os.walk(root):
@@ -62,6 +228,18 @@ def validate_challenge(script_dir, project_root):
         print(f"❌ ERROR: secret.zip not found at {cipher_zip}", file=sys.stderr)
         sys.exit(1)
 
+    # Crack the password the same way students do (in-process engine)
+    wordlist_file = os.path.join(script_dir, "wordlist.txt")
+    try:
+        cracked, tried, elapsed = crack_zip_password(cipher_zip, wordlist_file)
+    except (OSError, ValueError, zipfile.BadZipFile) as e:
+        print(f"❌ ERROR: Cracking engine failed: {e}", file=sys.stderr)
+        sys.exit(1)
+    if cracked != zip_password:
+        print(f"❌ ERROR: Cracking engine found {cracked!r}, expected {zip_password!r}.", file=sys.stderr)
+        sys.exit(1)
+    print(f"🔐 Cracked password after {tried} tries in {elapsed:.3f}s")
+
     # Extract ZIP with known password
     try:
         subprocess.run(
@@ -142,30 +320,49 @@ def student_interactive(script_dir):
     found = False
     correct_pass = ""
 
-    print("\n🔍 Starting password scan...\n")
-    time.sleep(0.5)
-
-    # Try each password
-    with open(wordlist_file, "r") as wl:
-        for pw in wl:
-            pw = pw.strip()
-            print(f"\r[🔐] Trying password: {pw:<20}", end="", flush=True)
-            time.sleep(0.05)
-            try:
-                result = subprocess.run(
-                    ["unzip", "-P", pw, "-t", cipher_zip],
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    text=True
-                )
-                if "OK" in result.stdout:
-                    print(f"\n\n✅ Password found: \"{pw}\"")
-                    correct_pass = pw
-                    found = True
-                    break
-            except FileNotFoundError:
-                print("\n❌ ERROR: 'unzip' command not found.")
-                sys.exit(1)
+    print("\n⚡ Two ways to crack it:")
+    print("   1) Animated scan   → watch every password being tried with unzip (slow, classic)")
+    print("   2) Turbo engine    → test passwords inside Python on every CPU core (fast)\n")
+    choice = input("Choose [1/2] (default 1): ").strip()
+
+    if choice == "2":
+        print("\n🚀 Starting turbo scan...\n")
+        try:
+            correct_pass, tried, elapsed = crack_zip_password(cipher_zip, wordlist_file)
+        except (OSError, ValueError, zipfile.BadZipFile) as e:
+            print(f"❌ ERROR: Could not read secret.zip: {e}")
+            pause("Press ENTER to close this terminal...")
+            sys.exit(1)
+        rate = tried / elapsed if elapsed else tried
+        print(f"🔎 Tested {tried} passwords in {elapsed:.2f}s ({rate:,.0f} passwords/sec)")
+        if correct_pass:
+            print(f"\n✅ Password found: \"{correct_pass}\"")
+            found = True
+    else:
+        print("\n🔍 Starting password scan...\n")
+        time.sleep(0.5)
+
+        # Try each password
+        with open(wordlist_file, "r") as wl:
+            for pw in wl:
+                pw = pw.strip()
+                print(f"\r[🔐] Trying password: {pw:<20}", end="", flush=True)
+                time.sleep(0.05)
+                try:
+                    result = subprocess.run(
+                        ["unzip", "-P", pw, "-t", cipher_zip],
+                        stdout=subprocess.PIPE,
+                        stderr=subprocess.PIPE,
+                        text=True
+                    )
+                    if "OK" in result.stdout:
+                        print(f"\n\n✅ Password found: \"{pw}\"")
+                        correct_pass = pw
+                        found = True
+                        break
+                except FileNotFoundError:
+                    print("\n❌ ERROR: 'unzip' command not found.")
+                    sys.exit(1)
 
     if not found:
         print("\n❌ Password not found in wordlist.txt.")
@@ -4,6 +4,14 @@ import sys
 import subprocess
 import time
 import json
+import base64
+import binascii
+import hashlib
+import itertools
+import zipfile
+import shutil
+import multiprocessing
+from collections import deque
 
 # === Hashcat ChainCrack Demo ===
 
@@ -43,117 +51,273 @@ def run_hashcat(hashes_file, wordlist_file, potfile):
         stderr=subprocess.DEVNULL
     )
 
-def decode_base64_file(input_path, output_path):
-    """Decode a base64 file and save output."""
-    decoded_dir = os.path.dirname(output_path)
-    os.makedirs(decoded_dir, exist_ok=True)  # Ensure output dir exists
-    try:
-        result = subprocess.run(
-            ["base64", "--decode", input_path],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            check=True
-        )
-        with open(output_path, "w") as f_out:
-            f_out.write(result.stdout)
-        return result.stdout.strip()
-    except subprocess.CalledProcessError:
-        return None
-
-def flatten_extracted_dir(extracted_dir):
+# === Built-in dictionary attack (hashcat fallback) ===
+# Pure-Python MD5 cracker for lab VMs without hashcat (or with only a slow CPU
+# backend). Hashes are loaded into a set, the wordlist is streamed in batches
+# that are hashed across a process pool, and results are written in hashcat's
+# potfile format (hash:password) so extract_zip_files works unchanged.
+
+CANDIDATE_BATCH_SIZE = 20000
+IN_FLIGHT_PER_WORKER = 2  # batches queued per worker; bounds memory on huge wordlists
+
+# A few common hashcat-style rules (a subset of best64) for the optional mutation pass
+COMMON_RULES = [":", "c", "u", "r", "d", "$1", "$!", "$1$2$3", "c$1", "sa@", "so0", "se3", "^1"]
+
+def apply_rule(rule, word):
     """
-    Move files from subdirectories up to extracted_dir,
-    then remove empty subdirectories.
+    Apply one hashcat-style rule to word (bytes). Supported functions:
+    : (noop)  l u c (case)  r (reverse)  d (duplicate)  $X (append)
+    ^X (prepend)  sXY (replace X with Y)
     """
-    for root, dirs, files in os.walk(extracted_dir):
-        for f in files:
-            src = os.path.join(root, f)
-            dst = os.path.join(extracted_dir, f)
-            if src != dst:
-                try:
-                    os.rename(src, dst)
-                except FileExistsError:
-                    os.remove(dst)
-                    os.rename(src, dst)
-        for d in dirs:
-            dir_to_remove = os.path.join(root, d)
-            if os.path.isdir(dir_to_remove):
-                try:
-                    os.rmdir(dir_to_remove)
-                except OSError:
-                    pass
-
-def reassemble_flags(decoded_dir, assembled_file):
-    """Reassemble decoded segments into candidate flags."""
-    decoded_files = sorted(
-        [f for f in os.listdir(decoded_dir) if f.endswith(".txt")],
-        key=lambda x: int("".join(filter(str.isdigit, x)))  # Extract digits from filename
-    )
-    assembled_lines = []
-    try:
-        with open(assembled_file, "w") as out_f:
-            for i in range(5):  # Assume 5 candidate flags
-                parts = []
-                for decoded_file in decoded_files:
-                    path = os.path.join(decoded_dir, decoded_file)
-                    lines = open(path).readlines()
-                    if i < len(lines):
-                        parts.append(lines[i].strip())
-                    else:
-                        parts.append("MISSING")  # Graceful fallback
-                flag = "-".join(parts)
-                assembled_lines.append(flag)
-                out_f.write(flag + "\n")
-        return assembled_lines
-    except Exception as e:
-        print(f"❌ ERROR during flag reassembly: {e}", file=sys.stderr)
-        return []
+    i = 0
+    while i < len(rule):
+        op = rule[i]
+        if op == ":":
+            pass
+        elif op == "l":
+            word = word.lower()
+        elif op == "u":
+            word = word.upper()
+        elif op == "c":
+            word = word.capitalize()
+        elif op == "r":
+            word = word[::-1]
+        elif op == "d":
+            word = word + word
+        elif op == "$":
+            i += 1
+            word = word + rule[i].encode()
+        elif op == "^":
+            i += 1
+            word = rule[i].encode() + word
+        elif op == "s":
+            word = word.replace(rule[i + 1].encode(), rule[i + 2].encode())
+            i += 2
+        elif op != " ":
+            raise ValueError(f"Unsupported rule function '{op}' in rule '{rule}'")
+        i += 1
+    return word
+
+def load_hashes(hashes_file):
+    """Load MD5 hashes (one per line) into a set."""
+    with open(hashes_file, "r") as f:
+        return {line.strip().lower() for line in f if line.strip()}
 
-def extract_zip_files(hashes_file, potfile, segments_dir, extracted_dir, decoded_dir):
-    """Pair hashes and passwords, then extract ZIP files."""
-    os.makedirs(decoded_dir, exist_ok=True)  # Ensure decoded_dir exists
+def load_potfile(potfile):
+    """Return {hash: password} from an existing potfile, if any."""
+    cracked = {}
+    if os.path.isfile(potfile):
+        with open(potfile, "r", errors="replace") as pf:
+            for line in pf:
+                if ':' in line:
+                    hash_val, password = line.rstrip("\n").split(':', 1)
+                    cracked[hash_val.lower()] = password
+    return cracked
+
+def potfile_plain(candidate):
+    """Format a plaintext like hashcat: $HEX[...] when not printable ASCII or contains ':'."""
+    if all(0x20 <= b < 0x7F for b in candidate) and b":" not in candidate:
+        return candidate.decode("ascii")
+    return f"$HEX[{candidate.hex()}]"
+
+def wordlist_batches(wordlist_file, batch_size=CANDIDATE_BATCH_SIZE):
+    """Stream the wordlist as lists of candidate words (bytes)."""
+    batch = []
+    with open(wordlist_file, "rb") as wl:
+        for line in wl:
+            word = line.rstrip(b"\r\n")
+            if word:
+                batch.append(word)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+    if batch:
+        yield batch
+
+_worker_targets = None
+_worker_rules = None
+
+def init_crack_worker(targets, rules):
+    """Pool initializer: ship the target set and rules to each worker once."""
+    global _worker_targets, _worker_rules
+    _worker_targets = targets
+    _worker_rules = rules
+
+def crack_batch(batch):
+    """Hash every candidate (after each rule) in one batch; return (hits, count)."""
+    md5 = hashlib.md5
+    targets = _worker_targets
+    hits = []
+    tried = 0
+    for word in batch:
+        for rule in _worker_rules:
+            candidate = word if rule == ":" else apply_rule(rule, word)
+            tried += 1
+            digest = md5(candidate).hexdigest()
+            if digest in targets:
+                hits.append((digest, candidate))
+    return hits, tried
+
+def bounded_imap(pool, func, items, window):
+    """
+    Like pool.imap, but with at most window tasks in flight. Pool.imap's feeder
+    thread drains the whole iterable into the task queue up front, which would
+    load a rockyou-sized wordlist into memory; here items are only read as
+    results are consumed, and closing the generator stops all submission.
+    """
+    pending = deque()
+    for item in items:
+        pending.append(pool.apply_async(func, (item,)))
+        if len(pending) >= window:
+            yield pending.popleft().get()
+    while pending:
+        yield pending.popleft().get()
+
+def builtin_dictionary_attack(hashes_file, wordlist_file, potfile, rules=(":",), workers=None):
+    """
+    Crack MD5 hashes with a wordlist (plus optional rules) and append results
+    to potfile in hashcat format. Returns (cracked count, candidates tried, seconds).
+    """
+    start_time = time.perf_counter()
+    already = load_potfile(potfile)
+    targets = load_hashes(hashes_file) - set(already)
+    rules = list(rules)
+    for rule in rules:
+        apply_rule(rule, b"test")  # Fail fast on unsupported rules
+    workers = workers or os.cpu_count() or 1
+
+    found = {}
+    tried = 0
+    if targets:
+        batches = wordlist_batches(wordlist_file)
+        if workers == 1:
+            init_crack_worker(targets, rules)
+            results = map(crack_batch, batches)
+            pool = None
+        else:
+            pool = multiprocessing.Pool(workers, initializer=init_crack_worker, initargs=(targets, rules))
+            results = bounded_imap(pool, crack_batch, batches, workers * IN_FLIGHT_PER_WORKER)
+        try:
+            for hits, count in results:
+                tried += count
+                for digest, candidate in hits:
+                    found.setdefault(digest, candidate)
+                if len(found) == len(targets):
+                    break  # Everything cracked: stop reading and submitting batches
+        finally:
+            if pool:
+                results.close()
+                pool.terminate()
+                pool.join()
+
+    if found:
+        with open(potfile, "a") as pf:
+            for digest, candidate in found.items():
+                pf.write(f"{digest}:{potfile_plain(candidate)}\n")
+    elif not os.path.exists(potfile):
+        open(potfile, "w").close()
+
+    return len(found), tried, time.perf_counter() - start_time
+
+def hashcat_available():
+    return shutil.which("hashcat") is not None
+
+def crack_hashes(hashes_file, wordlist_file, potfile, use_builtin=None, rules=(":",)):
+    """Crack with hashcat when installed, otherwise with the built-in engine."""
+    if use_builtin is None:
+        use_builtin = not hashcat_available()
+    if not use_builtin:
+        run_hashcat(hashes_file, wordlist_file, potfile)
+        return
+    cracked, tried, elapsed = builtin_dictionary_attack(hashes_file, wordlist_file, potfile, rules=rules)
+    rate = tried / elapsed if elapsed else tried
+    print(f"⚙️ Built-in engine: cracked {cracked} hash(es), {tried:,} candidates in {elapsed:.2f}s ({rate:,.0f} H/s)")
 
+def load_cracked_passwords(potfile):
+    """Return {hash: password bytes} from a hashcat potfile, decoding $HEX[...] entries."""
+    cracked = {}
+    for hash_val, password in load_potfile(potfile).items():
+        if password.startswith("$HEX[") and password.endswith("]"):
+            cracked[hash_val] = bytes.fromhex(password[5:-1])
+        else:
+            cracked[hash_val] = password.encode("utf-8")
+    return cracked
+
+def unlock_segments(hashes_file, potfile, segments_dir):
+    """
+    Pair hashes with cracked passwords and decrypt partN.zip entirely in
+    memory: ZIP (with password) -> Base64 decode -> list of segment lines.
+    Returns the segments in part order; nothing is written to disk.
+    """
     # Load hashes.txt (original order)
     with open(hashes_file, "r") as f:
-        hash_list = [line.strip() for line in f if line.strip()]
+        hash_list = [line.strip().lower() for line in f if line.strip()]
 
-    # Load cracked hashes
-    cracked = {}
-    with open(potfile, "r") as pf:
-        for line in pf:
-            if ':' in line:
-                hash_val, password = line.strip().split(':', 1)
-                cracked[hash_val] = password
+    cracked = load_cracked_passwords(potfile)
 
-    # Map ZIP files to cracked passwords
+    segments = []
     for idx, hash_val in enumerate(hash_list, start=1):
         password = cracked.get(hash_val)
-        zipfile = os.path.join(segments_dir, f"part{idx}.zip")
+        zip_path = os.path.join(segments_dir, f"part{idx}.zip")
         if password is None:
             print(f"❌ No cracked password found for hash {hash_val}", file=sys.stderr)
             continue
 
-        print(f"\n🔑 Unlocking {zipfile} with password: {password}")
-        result = subprocess.run(
-            ["unzip", "-P", password, zipfile, "-d", extracted_dir],
-            capture_output=True,
-            text=True
-        )
-        if result.returncode != 0:
-            print(f"❌ Failed to unzip {zipfile} with password '{password}'", file=sys.stderr)
-            print(f"📄 unzip error: {result.stderr.strip()}", file=sys.stderr)
+        print(f"\n🔑 Unlocking {zip_path} with password: {password.decode('utf-8', errors='replace')}")
+        try:
+            with zipfile.ZipFile(zip_path) as zf:
+                names = sorted(
+                    (n for n in zf.namelist() if os.path.basename(n).startswith("encoded_")),
+                    key=lambda n: int("".join(filter(str.isdigit, os.path.basename(n))) or 0)
+                )
+                for name in names:
+                    print(f"📦 Decoding {os.path.basename(name)}...")
+                    decoded = base64.b64decode(zf.read(name, pwd=password)).decode("utf-8")
+                    segments.append((os.path.basename(name), decoded.splitlines()))
+        except (OSError, RuntimeError, zipfile.BadZipFile, binascii.Error, UnicodeDecodeError) as e:
+            print(f"❌ Failed to unlock {zip_path}: {e}", file=sys.stderr)
             continue
-        else:
-            print(f"✅ Unzipped {zipfile} successfully.")
+        print(f"✅ Unlocked {zip_path} successfully.")
 
-        flatten_extracted_dir(extracted_dir)
-        for f in os.listdir(extracted_dir):
-            if f.startswith("encoded_"):
-                seg_path = os.path.join(extracted_dir, f)
-                decoded_path = os.path.join(decoded_dir, f"decoded_{f}")
-                print(f"📦 Decoding {f}...")
-                decode_base64_file(seg_path, decoded_path)
+    return segments
+
+def save_segments(segments, decoded_dir):
+    """Write decoded segments to decoded_dir (only when the student asks)."""
+    os.makedirs(decoded_dir, exist_ok=True)
+    for name, lines in segments:
+        with open(os.path.join(decoded_dir, f"decoded_{name}"), "w") as f_out:
+            f_out.write("\n".join(lines) + "\n")
+
+def iter_candidate_flags(columns):
+    """
+    Yield candidate flags by joining line N of every segment. Works for any
+    number of segments and candidates; short segments contribute "MISSING"
+    (graceful fallback).
+    """
+    trimmed = []
+    for column in columns:
+        column = [line.strip() for line in column]
+        while column and not column[-1]:
+            column.pop()  # Ignore trailing blank lines
+        trimmed.append(column)
+    for parts in itertools.zip_longest(*trimmed, fillvalue="MISSING"):
+        yield "-".join(parts)
+
+def reassemble_flags(segments, assembled_file=None):
+    """Reassemble decoded segments into candidate flags, optionally saving them."""
+    columns = [lines for _, lines in segments]
+    assembled_lines = []
+    try:
+        if assembled_file is None:
+            return list(iter_candidate_flags(columns))
+        with open(assembled_file, "w") as out_f:
+            for flag in iter_candidate_flags(columns):
+                assembled_lines.append(flag)
+                out_f.write(flag + "\n")
+        return assembled_lines
+    except Exception as e:
+        print(f"❌ ERROR during flag reassembly: {e}", file=sys.stderr)
+        return []
 
 def validate_challenge(script_dir, project_root):
     """Run validation using expected flag and hash-password-ZIP mapping."""
@@ -161,9 +325,6 @@ def validate_challenge(script_dir, project_root):
     wordlist_file = os.path.join(script_dir, "wordlist.txt")
     potfile = os.path.join(script_dir, "hashcat.potfile")
     segments_dir = os.path.join(script_dir, "segments")
-    extracted_dir = os.path.join(script_dir, "extracted")
-    decoded_dir = os.path.join(script_dir, "decoded_segments")
-    assembled_file = os.path.join(script_dir, "assembled_flag.txt")
     unlock_file = os.path.join(project_root, "web_version_admin", "validation_unlocks.json")
 
     # Load expected flag
@@ -175,8 +336,11 @@ def validate_challenge(script_dir, project_root):
         print(f"❌ ERROR: Could not load validation unlocks: {e}", file=sys.stderr)
         sys.exit(1)
 
-    print("\n🛠️ [Validation] Running Hashcat...")
-    run_hashcat(hashes_file, wordlist_file, potfile)
+    if hashcat_available():
+        print("\n🛠️ [Validation] Running Hashcat...")
+    else:
+        print("\n🛠️ [Validation] Hashcat not found, using built-in dictionary attack...")
+    crack_hashes(hashes_file, wordlist_file, potfile)
 
     print("\n[✅] Cracked hashes:")
     with open(potfile, "r") as pf:
@@ -185,10 +349,10 @@ def validate_challenge(script_dir, project_root):
                 hash_val, password = line.strip().split(':', 1)
                 print(f"🔓 {hash_val} : {password}")
 
-    extract_zip_files(hashes_file, potfile, segments_dir, extracted_dir, decoded_dir)
+    segments = unlock_segments(hashes_file, potfile, segments_dir)
 
     print("\n🧩 Assembling candidate flags...")
-    candidate_flags = reassemble_flags(decoded_dir, assembled_file)
+    candidate_flags = reassemble_flags(segments)
 
     if expected_flag in candidate_flags:
         print(f"✅ Validation success: found flag {expected_flag}")
@@ -203,7 +367,7 @@ def student_interactive(script_dir):
     wordlist_file = os.path.join(script_dir, "wordlist.txt")
     potfile = os.path.join(script_dir, "hashcat.potfile")
     segments_dir = os.path.join(script_dir, "segments")
-    extracted_dir = os.path.join(script_dir, "extracted")
+    extracted_dir = os.path.join(script_dir, "extracted")  # Left behind by older versions
     decoded_dir = os.path.join(script_dir, "decoded_segments")
     assembled_file = os.path.join(script_dir, "assembled_flag.txt")
 
@@ -233,13 +397,28 @@ def student_interactive(script_dir):
                 os.remove(path)
         for directory in [extracted_dir, decoded_dir]:
             if os.path.exists(directory):
-                subprocess.run(["rm", "-rf", directory])
-        os.makedirs(extracted_dir, exist_ok=True)
-        os.makedirs(decoded_dir, exist_ok=True)
-
-        print("\n🛠️ Running Hashcat...")
+                shutil.rmtree(directory)
+
+        use_builtin = True
+        rules = (":",)
+        if hashcat_available():
+            print("\n🛠️ Cracking engines available:")
+            print("   1) Hashcat            → the real tool (slow to start on CPU-only VMs)")
+            print("   2) Built-in engine    → Python MD5 dictionary attack on every CPU core")
+            use_builtin = input("Choose [1/2] (default 1): ").strip() == "2"
+        else:
+            print("\n⚠️ Hashcat is not installed here, so we'll use the built-in dictionary attack.")
+            print("   It works like: hashcat -m 0 -a 0 hashes.txt wordlist.txt")
+
+        if use_builtin:
+            print("\n💡 Rules mutate each word (e.g. 'c' = Capitalize, '$1' = append 1).")
+            if input("Also try common rules? (slower) [y/N]: ").strip().lower() == "y":
+                rules = tuple(COMMON_RULES)
+            print("\n🛠️ Running built-in dictionary attack...")
+        else:
+            print("\n🛠️ Running Hashcat...")
         pause("Press ENTER to continue...")
-        run_hashcat(hashes_file, wordlist_file, potfile)
+        crack_hashes(hashes_file, wordlist_file, potfile, use_builtin=use_builtin, rules=rules)
 
         print("\n[✅] Cracked hashes:")
         with open(potfile, "r") as pf:
@@ -248,17 +427,23 @@ def student_interactive(script_dir):
                     hash_val, password = line.strip().split(':', 1)
                     print(f"🔓 {hash_val} : {password}")
 
-        pause("\nPress ENTER to extract ZIPs and decode segments...")
-        extract_zip_files(hashes_file, potfile, segments_dir, extracted_dir, decoded_dir)
+        pause("\nPress ENTER to unlock ZIPs and decode segments (in memory)...")
+        segments = unlock_segments(hashes_file, potfile, segments_dir)
+
+        save = input("\n💾 Save decoded segments and candidate flags to disk? [y/N]: ").strip().lower() == "y"
+        if save:
+            save_segments(segments, decoded_dir)
+            print(f"📁 Decoded segments saved to: {decoded_dir}")
 
         print("\n🧩 Assembling candidate flags...")
         print_progress_bar()
-        candidate_flags = reassemble_flags(decoded_dir, assembled_file)
+        candidate_flags = reassemble_flags(segments, assembled_file if save else None)
         print("\n🎯 Candidate Flags:")
         for flag in candidate_flags:
             print(f"- {flag}")
 
-        print(f"\n✅ Flags saved to: {assembled_file}")
+        if save:
+            print(f"\n✅ Flags saved to: {assembled_file}")
         pause("\n🎉 Press ENTER to exit...")
     except Exception as e:
         print(f"❌ Unexpected error: {e}", file=sys.stderr)
@@ -6,6 +6,20 @@ import time
 import json
 import re
 
+# === Locate project root and add to sys.path (shared binary scanner) ===
+from pathlib import Path
+
+dir_path = Path(__file__).resolve().parent
+for parent in [dir_path] + list(dir_path.parents):
+    if (parent / ".ccri_ctf_root").exists():
+        sys.path.insert(0, str(parent))
+        break
+else:
+    print("❌ ERROR: Could not find project root (.ccri_ctf_root)", file=sys.stderr)
+    sys.exit(1)
+
+from flag_generators.binary_scan import BinaryScanner
+
 # === Binary Forensics Challenge ===
 
 def find_project_root():
@@ -26,24 +40,23 @@ def pause(prompt="Press ENTER to continue..."):
         input(prompt)
 
 def run_strings(binary_path, output_path):
+    """Same output as `strings binary > output`, extracted in Python from a memory map."""
     try:
-        with open(output_path, "w") as out_f:
-            subprocess.run(["strings", binary_path], stdout=out_f, check=True)
-    except subprocess.CalledProcessError:
-        print("❌ ERROR: Failed to run 'strings'.", file=sys.stderr)
+        return BinaryScanner.write_strings(binary_path, output_path)
+    except OSError as e:
+        print(f"❌ ERROR: Failed to extract strings: {e}", file=sys.stderr)
         sys.exit(1)
 
-def search_for_flags(file_path, regex_pattern):
-    matches = []
+def search_for_flags(binary_path, regex_pattern):
+    """
+    Scan the binary itself (no strings dump needed) with one compiled regex.
+    Returns a list of (offset, match).
+    """
     try:
-        with open(file_path, "r") as f:
-            for line in f:
-                if re.search(regex_pattern, line):
-                    matches.append(line.strip())
-    except Exception as e:
+        return BinaryScanner.find_flags(binary_path, regex_pattern)
+    except (OSError, re.error) as e:
         print(f"❌ ERROR during flag search: {e}", file=sys.stderr)
         sys.exit(1)
-    return matches
 
 def main():
     project_root = find_project_root()
@@ -67,8 +80,7 @@ def main():
             print(f"❌ ERROR: Target binary '{target_binary}' missing.", file=sys.stderr)
             sys.exit(1)
 
-        run_strings(target_binary, outfile)
-        matches = search_for_flags(outfile, regex_pattern)
+        matches = [match for _, match in search_for_flags(target_binary, regex_pattern)]
 
         if expected_flag in matches:
             print(f"✅ Validation success: found flag {expected_flag}")
@@ -93,10 +105,10 @@ def main():
         sys.exit(1)
 
     # Run strings and save results
-    print(f"\n🔍 Running: strings \"{target_binary}\" > \"{outfile}\"")
-    run_strings(target_binary, outfile)
+    print(f"\n🔍 Extracting strings (like: strings \"{target_binary}\" > \"{outfile}\")")
+    count = run_strings(target_binary, outfile)
     time.sleep(0.5)
-    print(f"✅ All extracted strings saved to: {outfile}\n")
+    print(f"✅ All {count} extracted strings saved to: {outfile}\n")
 
     # Preview some output
     preview_lines = 15
@@ -116,12 +128,13 @@ def main():
     # Search for flag patterns
     print("🔎 Scanning for flag-like patterns (format: XXXX-YYYY-ZZZZ)...")
     time.sleep(0.5)
-    matches = search_for_flags(outfile, regex_pattern)
+    matches = search_for_flags(target_binary, regex_pattern)
 
     if matches:
         print(f"\n📌 Found {len(matches)} possible flag(s):")
-        for m in matches:
-            print(f"   ➡️ {m}")
+        for offset, m in matches:
+            print(f"   ➡️ {m}   (byte offset 0x{offset:x})")
+        print("\n💡 Tip: view one in context with: xxd -s <offset> -l 64 hidden_flag")
     else:
         print("\n⚠️ No obvious flags found. Try scanning manually in extracted_strings.txt.")
 
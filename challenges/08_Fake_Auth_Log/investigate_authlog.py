@@ -1,10 +1,12 @@
 #!/usr/bin/env python3
 import os
 import sys
-import subprocess
 import time
 import json
 import re
+import mmap
+from array import array
+from contextlib import contextmanager
 
 # === Auth Log Investigation Helper ===
 
@@ -25,18 +27,157 @@ def pause(prompt="Press ENTER to continue..."):
     if not validation_mode:
         input(prompt)
 
+# === Streaming log scanner ===
+# auth.log is memory-mapped and searched with one compiled pattern over the
+# whole buffer; only matching lines are decoded. Line numbers are computed
+# lazily by counting newlines between consecutive hits, so a scan stays a
+# single forward pass no matter how large the log is.
+
+AUTH_LINE = re.compile(
+    rb"^\w{3} +\d+ [\d:]{8} \S+ [\w./-]+\[(?P<pid>[^\]\n]*)\]:"
+    rb"(?:[^\n]*? for (?:invalid user )?(?P<user>\S+))?"
+    rb"(?:[^\n]*? from (?P<ip>\S+))?",
+    re.MULTILINE,
+)
+INDEX_FIELDS = ("user", "ip", "pid")
+HIGHLIGHT = "\033[1;31m{}\033[0m"
+COUNT_CHUNK = 16 * 1024 * 1024  # bytes per newline-count slice
+
+@contextmanager
+def mapped_log(log_file):
+    """Read-only memory map of the log (empty bytes for an empty file)."""
+    with open(log_file, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm
+
+class LineLocator:
+    """Turns increasing byte offsets into (line number, line text) with one forward newline count."""
+
+    def __init__(self, data):
+        self.data = data
+        self.offset = 0
+        self.line_no = 1
+
+    def line_at(self, position):
+        data = self.data
+        # mmap has no count(); count in bounded slices so huge gaps never copy much at once
+        while self.offset < position:
+            chunk_end = min(position, self.offset + COUNT_CHUNK)
+            self.line_no += data[self.offset:chunk_end].count(b"\n")
+            self.offset = chunk_end
+        start = data.rfind(b"\n", 0, position) + 1
+        end = data.find(b"\n", position)
+        if end == -1:
+            end = len(data)
+        return self.line_no, data[start:end].decode("utf-8", errors="replace").rstrip("\r"), end
+
+def iter_pattern_lines(log_file, pattern):
+    """
+    Yield (line number, line) for every line matching a compiled bytes regex,
+    once per line, lazily.
+    """
+    with mapped_log(log_file) as data:
+        locator = LineLocator(data)
+        line_end = -1
+        for match in pattern.finditer(data):
+            if match.start() <= line_end:
+                continue  # another hit on a line we already yielded
+            line_no, line, line_end = locator.line_at(match.start())
+            yield line_no, line
+
 def scan_for_flags(log_file, regex_pattern):
-    """Scan the full log file for flag-like patterns."""
-    matches = []
+    """Scan the full log file for flag-like patterns, yielding (line number, line)."""
     try:
-        with open(log_file, "r") as f:
-            for line in f:
-                if re.search(regex_pattern, line):
-                    matches.append(line.strip())
-    except Exception as e:
+        yield from iter_pattern_lines(log_file, re.compile(regex_pattern.encode("ascii")))
+    except OSError as e:
         print(f"❌ ERROR while scanning auth.log: {e}", file=sys.stderr)
         sys.exit(1)
-    return matches
+
+def search_keyword(log_file, keyword):
+    """Plain substring search (like grep KEYWORD), yielding (line number, line)."""
+    yield from iter_pattern_lines(log_file, re.compile(re.escape(keyword.encode("utf-8"))))
+
+class AuthLogIndex:
+    """
+    user / ip / sshd PID -> line offsets, built in one pass on first use.
+    Offsets are kept in compact arrays, so even huge logs index in little memory.
+    """
+
+    def __init__(self, log_file):
+        self.log_file = log_file
+        self.fields = None
+
+    def build(self):
+        fields = {name: {} for name in INDEX_FIELDS}
+        pids, users, ips = fields["pid"], fields["user"], fields["ip"]
+
+        def add(bucket_map, value, offset):
+            # Most values (PIDs especially) occur once: keep a bare int until a repeat
+            existing = bucket_map.get(value)
+            if existing is None:
+                bucket_map[value] = offset
+            elif type(existing) is int:
+                bucket_map[value] = array("Q", (existing, offset))
+            else:
+                existing.append(offset)
+
+        with mapped_log(self.log_file) as data:
+            for match in AUTH_LINE.finditer(data):
+                offset = match.start()
+                pid, user, ip = match.group("pid", "user", "ip")
+                add(pids, pid, offset)
+                if user:
+                    add(users, user, offset)
+                if ip:
+                    add(ips, ip, offset)
+        self.fields = fields
+
+    def values(self, field):
+        """Distinct values seen for a field, most frequent first."""
+        if self.fields is None:
+            self.build()
+        counts = {value.decode("utf-8", errors="replace"): 1 if type(offsets) is int else len(offsets)
+                  for value, offsets in self.fields[field].items()}
+        return sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+
+    def lookup(self, field, value):
+        """Yield (line number, line) for every line whose field equals value."""
+        if self.fields is None:
+            self.build()
+        offsets = self.fields[field].get(value.encode("utf-8"), ())
+        if type(offsets) is int:
+            offsets = (offsets,)
+        with mapped_log(self.log_file) as data:
+            locator = LineLocator(data)
+            for offset in offsets:
+                line_no, line, _ = locator.line_at(offset)
+                yield line_no, line
+
+def run_query(index, log_file, query, limit=50):
+    """
+    Student search: 'user:NAME', 'ip:ADDRESS', 'pid:PID' use the field index;
+    anything else is a keyword search over the whole log.
+    """
+    field, colon, value = query.partition(":")
+    if colon and field.lower() in INDEX_FIELDS and value:
+        results = index.lookup(field.lower(), value)
+        keyword = value
+    else:
+        results = search_keyword(log_file, query)
+        keyword = query
+
+    shown = total = 0
+    for line_no, line in results:
+        total += 1
+        if shown < limit:
+            print(f"{line_no:>7}: {line.replace(keyword, HIGHLIGHT.format(keyword))}")
+            shown += 1
+    if total > shown:
+        print(f"... ({total - shown} more matching lines not shown)")
+    print(f"\n📊 {total} matching line(s).")
 
 def flatten_authlog_dir(script_dir):
     """
@@ -83,10 +224,8 @@ def main():
             print(f"❌ ERROR: auth.log not found in {script_dir}.", file=sys.stderr)
             sys.exit(1)
 
-        matches = scan_for_flags(log_file, regex_pattern)
-
-        # Check if the expected flag is present anywhere in the log
-        found_flag = any(expected_flag in line for line in matches)
+        # Check if the expected flag is present anywhere in the log (stops at the first hit)
+        found_flag = any(expected_flag in line for _, line in scan_for_flags(log_file, regex_pattern))
         if found_flag:
             print(f"✅ Validation success: found flag {expected_flag}")
             sys.exit(0)
@@ -99,7 +238,7 @@ def main():
     print("🕵️‍♂️ Auth Log Investigation")
     print("==============================\n")
     print("📄 Target file: auth.log")
-    print("🔧 Tool in use: grep\n")
+    print("🔧 Tool in use: a grep-style Python scanner\n")
     print("🎯 Goal: Identify a suspicious login record by analyzing fake auth logs.")
     print("   ➡️ One of these records contains a **PID** that hides the real flag!\n")
     pause()
@@ -127,41 +266,50 @@ def main():
     # Scan for CCRI-style flags
     print("\n🔍 Scanning for entries with flag-like patterns (format: CCRI-XXXX-1234)...")
     time.sleep(0.5)
-    matches = scan_for_flags(log_file, regex_pattern)
-
-    if matches:
-        with open(candidates_file, "w") as f_out:
-            for line in matches:
-                f_out.write(line + "\n")
+    match_count = 0
+    preview = []
+    with open(candidates_file, "w") as f_out:
+        for line_no, line in scan_for_flags(log_file, regex_pattern):
+            f_out.write(line + "\n")
+            match_count += 1
+            if len(preview) < 5:
+                preview.append((line_no, line))
 
-        print(f"\n📌 Found {len(matches)} potential flag(s).")
+    if match_count:
+        print(f"\n📌 Found {match_count} potential flag(s).")
         print(f"💾 Saved to: {candidates_file}\n")
         pause("Press ENTER to preview suspicious entries...")
         print("\n-------------------------------------------")
-        for i, line in enumerate(matches):
-            if i >= 5:
-                print("... (only first 5 shown)")
-                break
-            print(line)
+        for line_no, line in preview:
+            print(f"{line_no:>5}: {line}")
+        if match_count > len(preview):
+            print("... (only first 5 shown)")
         print("-------------------------------------------\n")
     else:
+        os.remove(candidates_file)
         print("⚠️ No suspicious entries found in auth.log.")
         pause("Press ENTER to close this terminal...")
         sys.exit(0)
 
-    # Optional search
-    pattern = input("🔎 Enter a username, IP, or keyword to search in the full log (or press ENTER to skip): ").strip()
-    if pattern:
-        print(f"\n🔎 Searching for '{pattern}' in auth.log...")
-        try:
-            subprocess.run(
-                ["grep", "--color=always", pattern, log_file],
-                check=False
-            )
-        except FileNotFoundError:
-            print("❌ ERROR: grep command not found.")
-    else:
-        print("⏭️  Skipping custom search.")
+    # Optional searches (field queries use an index built on the first one)
+    index = AuthLogIndex(log_file)
+    print("🔎 Search the full log:")
+    print("   user:alice      → every line for that username")
+    print("   ip:10.0.0.5     → every line from that IP address")
+    print("   pid:12345       → every line logged by that sshd PID")
+    print("   users / ips     → list the distinct values seen")
+    print("   anything else   → keyword search (like grep)\n")
+    while True:
+        query = input("🔎 Search (or press ENTER to finish): ").strip()
+        if not query:
+            break
+        print()
+        if query.lower() in ("users", "ips"):
+            for value, count in index.values(query.lower()[:-1])[:25]:
+                print(f"   {count:>6}  {value}")
+        else:
+            run_query(index, log_file, query)
+        print()
 
     print("\n🧠 Hint: One of the flagged PIDs hides the official flag!")
     print("   Format: CCRI-AAAA-1111\n")
@@ -3,10 +3,17 @@ import os
 import sys
 import json
 import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 
 # === Interactive Hidden File Explorer ===
 
+DEFAULT_WORKERS = min(16, (os.cpu_count() or 1) + 4)  # Workers mostly wait on file reads
+BATCH_SIZE = 64                # files per pool task (amortizes scheduling on small files)
+QUEUE_DEPTH = 4                # batches queued per worker (bounds memory on huge trees)
+READ_CHUNK_SIZE = 1 << 16      # 64 KB per read
+
 def find_project_root():
     dir_path = os.path.abspath(os.path.dirname(__file__))
     while dir_path != "/":
@@ -30,21 +37,117 @@ def list_directory(path):
     except FileNotFoundError:
         return []
 
-def validate_hidden_flag(root_dir, expected_flag):
+def iter_files(root_dir):
+    """Yield every regular file under root_dir using os.scandir (no per-file stat calls)."""
+    stack = [root_dir]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            yield entry.path
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+def search_file(file_path, pattern, overlap, stop=None):
     """
-    For validation mode: search recursively for the expected flag.
+    Search one file as bytes, chunk by chunk, for a compiled bytes pattern.
+    The last overlap bytes of each chunk are carried into the next, so matches
+    up to overlap + 1 bytes long are found even across chunk boundaries.
+    Returns the matched text, or None (also when stop is set mid-file).
     """
-    for dirpath, dirnames, filenames in os.walk(root_dir):
-        for filename in filenames:
-            file_path = os.path.join(dirpath, filename)
-            try:
-                with open(file_path, "r") as f:
-                    content = f.read()
-                    if expected_flag in content:
-                        print(f"✅ Validation success: found flag {expected_flag} in {file_path}")
-                        return True
-            except Exception:
+    try:
+        with open(file_path, "rb") as f:
+            tail = b""
+            while not (stop and stop.is_set()):
+                chunk = f.read(READ_CHUNK_SIZE)
+                if not chunk:
+                    return None
+                data = tail + chunk
+                match = pattern.search(data)
+                if match:
+                    return match.group().decode("utf-8", errors="replace")
+                tail = data[-overlap:] if overlap else b""
+    except OSError:
+        return None
+    return None
+
+def parallel_search(root_dir, pattern, overlap=256, workers=DEFAULT_WORKERS):
+    """
+    Search every file under root_dir on a thread pool until one matches.
+    Files are fed to the pool in batches as the tree is walked; the first hit
+    stops all workers (queued batches are cancelled, running ones stop at the
+    next file or chunk). Without a hit, every batch runs to completion.
+    Returns ((file_path, match) or None, files searched).
+    """
+    if isinstance(pattern, str):
+        pattern = pattern.encode("utf-8")
+    if isinstance(pattern, bytes):
+        pattern = re.compile(pattern)
+
+    stop = threading.Event()
+    hit = None
+    searched = 0
+
+    def search(batch):
+        count = 0
+        for file_path in batch:
+            if stop.is_set():
+                break
+            count += 1
+            match = search_file(file_path, pattern, overlap, stop)
+            if match is not None:
+                stop.set()
+                return (file_path, match), count
+        return None, count
+
+    def collect(done):
+        nonlocal hit, searched
+        for future in done:
+            result, count = future.result()
+            searched += count
+            if result and hit is None:
+                hit = result
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        pending = set()
+        batch = []
+        for file_path in iter_files(root_dir):
+            batch.append(file_path)
+            if len(batch) < BATCH_SIZE:
                 continue
+            pending.add(pool.submit(search, batch))
+            batch = []
+            if len(pending) >= workers * QUEUE_DEPTH:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+            if stop.is_set():
+                break
+        if batch and not stop.is_set():
+            pending.add(pool.submit(search, batch))
+        if stop.is_set():
+            for future in pending:
+                future.cancel()
+        # Without a hit every queued batch must still run, or files go unsearched
+        done, _ = wait(pending)
+        collect(f for f in done if not f.cancelled())
+
+    return hit, searched
+
+def validate_hidden_flag(root_dir, expected_flag):
+    """
+    For validation mode: search recursively (in parallel) for the expected flag.
+    """
+    needle = expected_flag.encode("utf-8")
+    hit, searched = parallel_search(root_dir, re.escape(needle), overlap=len(needle) - 1)
+    if hit:
+        print(f"✅ Validation success: found flag {expected_flag} in {hit[0]} ({searched} files searched)")
+        return True
     print(f"❌ Validation failed: flag {expected_flag} not found.", file=sys.stderr)
     return False
 
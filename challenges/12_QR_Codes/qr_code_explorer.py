@@ -2,11 +2,19 @@
 import os
 import sys
 import json
+import glob
+import hashlib
+import shutil
 import subprocess
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 # === QR Code Explorer ===
 
+CACHE_FILE = ".qr_decode_cache.json"   # sha256 of image -> decoded text
+DEFAULT_WORKERS = min(16, (os.cpu_count() or 1) + 4)  # Workers mostly wait on zbarimg processes
+HASH_CHUNK_SIZE = 1 << 20
+
 def find_project_root():
     dir_path = os.path.abspath(os.path.dirname(__file__))
     while dir_path != "/":
@@ -37,7 +45,54 @@ def open_image(file_path, duration=20):
     except Exception as e:
         print(f"❌ Could not open image: {e}")
 
+def load_inprocess_decoder():
+    """
+    Return a function(path) -> text using an importable QR library, or None.
+    pyzbar (the zbar library zbarimg wraps) is preferred, then OpenCV's detector.
+    Output is formatted like zbarimg ("QR-Code:<text>") so callers don't care which ran.
+    """
+    try:
+        from pyzbar.pyzbar import decode as zbar_decode
+        from PIL import Image
+
+        def decode_with_pyzbar(file_path):
+            with Image.open(file_path) as img:
+                symbols = zbar_decode(img)
+            return "\n".join(
+                f"QR-Code:{sym.data.decode('utf-8', errors='replace')}" for sym in symbols
+            )
+        return decode_with_pyzbar
+    except ImportError:
+        pass
+
+    try:
+        import cv2
+
+        def decode_with_opencv(file_path):
+            img = cv2.imread(file_path)
+            if img is None:
+                return ""
+            text, _, _ = cv2.QRCodeDetector().detectAndDecode(img)
+            return f"QR-Code:{text}" if text else ""
+        return decode_with_opencv
+    except ImportError:
+        return None
+
+inprocess_decoder = load_inprocess_decoder()
+
+def require_decoder():
+    """Exit (from the main thread) when neither a QR library nor zbarimg is available."""
+    if inprocess_decoder is None and shutil.which("zbarimg") is None:
+        print("❌ ERROR: zbarimg is not installed.")
+        sys.exit(1)
+
 def decode_qr(file_path):
+    """Decode one image. Runs in worker threads, so it never exits: call require_decoder() first."""
+    if inprocess_decoder is not None:
+        try:
+            return inprocess_decoder(file_path).strip()
+        except Exception:
+            pass  # Unreadable by the library; let zbarimg have a go
     try:
         result = subprocess.run(
             ["zbarimg", file_path],
@@ -47,16 +102,83 @@ def decode_qr(file_path):
         )
         return result.stdout.strip()
     except FileNotFoundError:
-        print("❌ ERROR: zbarimg is not installed.")
-        sys.exit(1)
+        return ""  # Only reached when the in-process library already failed on this image
 
-def validate_all_qrs(qr_codes, expected_flag):
+def discover_qr_codes(folder):
+    """All qr_*.png images in folder, in name order (5 normally, hundreds in harder variants)."""
+    return sorted(glob.glob(os.path.join(folder, "qr_*.png")))
+
+def file_digest(file_path):
+    """sha256 of the image bytes, so cached results follow content rather than filenames."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def load_decode_cache(cache_path):
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def save_decode_cache(cache_path, cache):
+    try:
+        with open(cache_path, "w", encoding="utf-8") as f:
+            json.dump(cache, f, indent=2, sort_keys=True)
+    except OSError as e:
+        print(f"⚠️ Could not save QR decode cache: {e}", file=sys.stderr)
+
+def decode_batch(qr_codes, cache_path=None, workers=DEFAULT_WORKERS):
+    """
+    Decode many QR images at once. Returns {path: decoded_text}.
+
+    Images already in the cache (same sha256) are not decoded again; the rest
+    are decoded concurrently. Threads are enough here: zbarimg runs as its own
+    process and the decoder libraries release the GIL while scanning.
+    Empty results are not cached so a missing decoder can't poison the cache.
     """
-    For validation mode: scan all QR codes for the expected flag.
+    cache = load_decode_cache(cache_path) if cache_path else {}
+    digests = {qr: file_digest(qr) for qr in qr_codes}
+    results = {qr: cache[digests[qr]] for qr in qr_codes if digests[qr] in cache}
+    pending = [qr for qr in qr_codes if qr not in results]
+
+    if pending:
+        require_decoder()
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            for qr, decoded in zip(pending, pool.map(decode_qr, pending)):
+                results[qr] = decoded
+                if decoded:
+                    cache[digests[qr]] = decoded
+        if cache_path:
+            save_decode_cache(cache_path, cache)
+
+    return {qr: results[qr] for qr in qr_codes}
+
+def batch_decode_menu(qr_codes, cache_path):
+    """Student option: decode every QR code at once and save the results to one file."""
+    print(f"\n⚡ Batch-decoding {len(qr_codes)} QR code(s) with up to {DEFAULT_WORKERS} workers...")
+    start = time.perf_counter()
+    results = decode_batch(qr_codes, cache_path)
+    elapsed = time.perf_counter() - start
+
+    summary_file = os.path.join(os.path.dirname(cache_path), "qr_batch_results.txt")
+    with open(summary_file, "w", encoding="utf-8") as f:
+        for qr, decoded in results.items():
+            text = decoded or "(no QR code found)"
+            print(f"   {os.path.basename(qr)}: {text}")
+            f.write(f"{os.path.basename(qr)}: {text}\n")
+    print(f"\n✅ Decoded {sum(1 for d in results.values() if d)}/{len(results)} in {elapsed:.2f}s")
+    print(f"💾 Saved to: {os.path.basename(summary_file)}")
+
+def validate_all_qrs(qr_codes, expected_flag, cache_path=None):
+    """
+    For validation mode: batch-decode all QR codes and look for the expected flag.
     """
     print("🔍 Validation: scanning all QR codes for the expected flag...")
-    for qr in qr_codes:
-        decoded = decode_qr(qr)
+    for qr, decoded in decode_batch(qr_codes, cache_path).items():
         if expected_flag in decoded:
             print(f"✅ Validation success: found flag {expected_flag} in {os.path.basename(qr)}")
             return True
@@ -66,7 +188,8 @@ def validate_all_qrs(qr_codes, expected_flag):
 def main():
     project_root = find_project_root()
     script_dir = os.path.abspath(os.path.dirname(__file__))
-    qr_codes = [os.path.join(script_dir, f"qr_0{i}.png") for i in range(1, 6)]
+    qr_codes = discover_qr_codes(script_dir)
+    cache_path = os.path.join(script_dir, CACHE_FILE)
 
     if validation_mode:
         # Load expected flag from validation unlocks
@@ -79,7 +202,7 @@ def main():
             print(f"❌ ERROR: Could not load validation unlocks: {e}", file=sys.stderr)
             sys.exit(1)
 
-        # Run validation
+        # Run validation (never from the decode cache: the images must really decode)
         if validate_all_qrs(qr_codes, expected_flag):
             sys.exit(0)
         else:
@@ -91,7 +214,7 @@ def main():
     print("==========================\n")
     print("🎯 Mission Briefing:")
     print("----------------------------")
-    print("🔍 You’ve recovered 5 mysterious QR codes from a digital drop site.")
+    print(f"🔍 You’ve recovered {len(qr_codes)} mysterious QR codes from a digital drop site.")
     print("Each one may contain:")
     print("  • A secret message")
     print("  • A fake flag")
@@ -102,24 +225,33 @@ def main():
     print("📖 Behind the scenes:")
     print("   This script runs:")
     print("      zbarimg qr_XX.png")
-    print("   → zbarimg scans and decodes barcodes/QR codes from images.\n")
+    print("   → zbarimg scans and decodes barcodes/QR codes from images.")
+    print("   Choose 'A' to decode every QR code at once (results are cached by file hash).\n")
     print("⏳ Each QR image will open in the viewer for **20 seconds**.")
     print("   After that, the decoded result (if any) is saved to a text file.\n")
     pause("Press ENTER to begin exploring.")
     clear_screen()
 
+    exit_choice = str(len(qr_codes) + 1)
     while True:
         print("🗂️  Available QR codes:")
         for i, qr in enumerate(qr_codes, 1):
             print(f"{i}. {os.path.basename(qr)}")
-        print("6. Exit Explorer\n")
+        print("A. Decode ALL QR codes (batch)")
+        print(f"{exit_choice}. Exit Explorer\n")
 
-        choice = input("Select a QR code to view and decode (1-5), or 6 to exit: ").strip()
+        choice = input(f"Select a QR code to view and decode (1-{len(qr_codes)}), A for all, or {exit_choice} to exit: ").strip()
 
-        if choice == "6":
+        if choice == exit_choice:
             print("\n👋 Exiting QR Code Explorer. Don’t forget to submit the correct flag!")
             break
 
+        if choice.lower() == "a":
+            batch_decode_menu(qr_codes, cache_path)
+            pause("\nPress ENTER to return to QR list...")
+            clear_screen()
+            continue
+
         try:
             index = int(choice) - 1
             if 0 <= index < len(qr_codes):
@@ -130,9 +262,9 @@ def main():
                 open_image(file_path)
 
                 print(f"\n🔎 Scanning QR code in {os.path.basename(file_path)}...")
-                print(f"💻 Running: zbarimg \"{os.path.basename(file_path)}\"\n")
+                print(f"💻 Equivalent to: zbarimg \"{os.path.basename(file_path)}\"\n")
 
-                result = decode_qr(file_path)
+                result = decode_batch([file_path], cache_path)[file_path]
 
                 if not result:
                     print("❌ No QR code found or unable to decode.")
@@ -148,7 +280,7 @@ def main():
                 pause("\nPress ENTER to return to QR list...")
                 clear_screen()
             else:
-                print("❌ Invalid choice. Please enter a number from 1 to 6.")
+                print(f"❌ Invalid choice. Please enter a number from 1 to {exit_choice}.")
                 pause()
                 clear_screen()
         except ValueError:
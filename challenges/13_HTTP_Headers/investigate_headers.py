@@ -3,6 +3,24 @@ import os
 import sys
 import subprocess
 import json
+import re
+
+# === Locate project root and add to sys.path (shared HTTP corpus engine) ===
+from pathlib import Path
+
+dir_path = Path(__file__).resolve().parent
+for parent in [dir_path] + list(dir_path.parents):
+    if (parent / ".ccri_ctf_root").exists():
+        sys.path.insert(0, str(parent))
+        break
+else:
+    print("❌ ERROR: Could not find project root (.ccri_ctf_root)", file=sys.stderr)
+    sys.exit(1)
+
+from flag_generators.http_corpus import HttpCorpus
+
+CORPUS_FILE = "responses.corpus"
+FLAG_REGEX = re.compile(r"CCRI-[A-Z]{4}-[0-9]{4}")
 
 # === HTTP Headers Mystery ===
 
@@ -38,20 +56,54 @@ def view_file_with_less(file_path):
         print("❌ ERROR: 'less' command not found on this system.")
         sys.exit(1)
 
-def bulk_scan_for_flags(script_dir):
+def view_text_with_less(text):
     try:
-        result = subprocess.run(
-            ["grep", "-E", "CCRI-[A-Z]{4}-[0-9]{4}", os.path.join(script_dir, "response_*.txt")],
-            text=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.DEVNULL
-        )
-        if result.stdout:
-            print(result.stdout)
-        else:
-            print("⚠️ No flags found in bulk scan.")
-    except Exception as e:
-        print(f"❌ ERROR during bulk scan: {e}")
+        subprocess.run(["less"], input=text, text=True)
+    except FileNotFoundError:
+        print(text)
+
+def bulk_scan_for_flags(responses):
+    """
+    grep-style scan (file:line) of every response file with one compiled regex.
+    """
+    found = False
+    for response in responses:
+        try:
+            with open(response, "r", encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    if FLAG_REGEX.search(line):
+                        print(f"{os.path.basename(response)}:{line.rstrip()}")
+                        found = True
+        except Exception as e:
+            print(f"❌ ERROR during bulk scan of {os.path.basename(response)}: {e}")
+    if not found:
+        print("⚠️ No flags found in bulk scan.")
+
+def print_header_matches(corpus, matches, limit=50):
+    shown = 0
+    for response_id, header, value in matches:
+        if shown < limit:
+            print(f"{corpus.names[response_id]}: {header}: {value}")
+        shown += 1
+    if shown > limit:
+        print(f"... and {shown - limit} more")
+    if not shown:
+        print("⚠️ No matching headers found.")
+    else:
+        print(f"\n📊 {shown} matching header(s) across {len(corpus)} responses.")
+
+def list_header_values(corpus, header):
+    entry = corpus.headers.get(header.lower())
+    if not entry:
+        print(f"⚠️ No '{header}' header in any response.")
+        return
+    values = entry["values"]
+    print(f"📋 '{header}' appears in {entry['count']} response(s).")
+    if values is None:
+        print("   (Too many distinct values to list. Try searching it instead.)")
+        return
+    for value, ids in sorted(values.items(), key=lambda item: -len(item[1])):
+        print(f"   {len(ids):>7}  {value}")
 
 def validate_responses(responses, expected_flag):
     """
@@ -70,10 +122,88 @@ def validate_responses(responses, expected_flag):
     print(f"❌ Validation failed: flag {expected_flag} not found in any HTTP response.", file=sys.stderr)
     return False
 
+def validate_corpus(corpus, expected_flag):
+    """
+    For validation mode: one pass over the response corpus for the expected flag.
+    """
+    print(f"🔍 Validation: scanning {len(corpus)} HTTP responses in {CORPUS_FILE} for the expected flag...")
+    for response_id, match in corpus.search(re.escape(expected_flag)):
+        print(f"✅ Validation success: found flag {expected_flag} in {corpus.names[response_id]}")
+        return True
+    print(f"❌ Validation failed: flag {expected_flag} not found in any HTTP response.", file=sys.stderr)
+    return False
+
+def corpus_menu(corpus):
+    """
+    Interactive mode for a corpus archive: thousands of responses in one file.
+    """
+    clear_screen()
+    print("📡 HTTP Headers Mystery")
+    print("=================================\n")
+    print("🎯 Mission Briefing:")
+    print("---------------------------------")
+    print(f"You've intercepted **{len(corpus)} HTTP responses** during a network investigation.")
+    print("The real flag is hidden in one of their HTTP headers.\n")
+    print("🧠 Flag format: CCRI-AAAA-1111")
+    print("💡 Tip: Too many responses to read one by one. Search their headers instead!\n")
+
+    while True:
+        print("\n📂 Options:")
+        print("1. Search one header across all responses (e.g. X-Flag)")
+        print("2. Bulk scan all headers for flag-like patterns")
+        print("3. List the values seen for a header (e.g. Server)")
+        print("4. View a response by number")
+        print("5. Exit\n")
+
+        choice = input("Select an option (1-5): ").strip()
+
+        if choice == "1":
+            header = input("Header name [X-Flag]: ").strip() or "X-Flag"
+            print(f"\n🔎 Searching every '{header}' header...\n")
+            print_header_matches(corpus, corpus.search_headers(rb".*?", header))
+            pause("\nPress ENTER to return to the menu.")
+
+        elif choice == "2":
+            print("\n🔎 Bulk scanning all HTTP headers for flag patterns...\n")
+            print_header_matches(corpus, corpus.search_headers())
+            pause("\nPress ENTER to return to the menu.")
+
+        elif choice == "3":
+            header = input("Header name [Server]: ").strip() or "Server"
+            print()
+            list_header_values(corpus, header)
+            pause("\nPress ENTER to return to the menu.")
+
+        elif choice == "4":
+            number = input(f"Response number (1-{len(corpus)}): ").strip()
+            if not number.isdigit() or not 1 <= int(number) <= len(corpus):
+                print("\n❌ Invalid response number.")
+                pause()
+                continue
+            response_id = int(number) - 1
+            print(f"\n🔍 Opening {corpus.names[response_id]} (press 'q' to quit)...")
+            view_text_with_less(corpus.response(response_id))
+
+        elif choice == "5":
+            print("\n👋 Exiting HTTP Headers Mystery. Stay sharp, agent!")
+            break
+
+        else:
+            print("\n❌ Invalid option. Please select a number from 1 to 5.")
+            pause()
+
 def main():
     project_root = find_project_root()
     script_dir = os.path.abspath(os.path.dirname(__file__))
     responses = [os.path.join(script_dir, f"response_{i}.txt") for i in range(1, 6)]
+    corpus_path = os.path.join(script_dir, CORPUS_FILE)
+    corpus = None
+    if os.path.isfile(corpus_path):
+        try:
+            corpus = HttpCorpus.open(corpus_path)
+        except (OSError, ValueError) as e:
+            print(f"❌ ERROR: Could not open {CORPUS_FILE}: {e}", file=sys.stderr)
+            sys.exit(1)
 
     if validation_mode:
         # Load expected flag from validation unlocks
@@ -87,12 +217,17 @@ def main():
             sys.exit(1)
 
         # Validate
-        if validate_responses(responses, expected_flag):
+        valid = validate_corpus(corpus, expected_flag) if corpus else validate_responses(responses, expected_flag)
+        if valid:
             sys.exit(0)
         else:
             sys.exit(1)
 
     # === Student Interactive Mode ===
+    if corpus:
+        corpus_menu(corpus)
+        return
+
     clear_screen()
     print("📡 HTTP Headers Mystery")
     print("=================================\n")
@@ -129,8 +264,8 @@ def main():
 
         elif choice == "6":
             print("\n🔎 Bulk scanning all HTTP headers for flag patterns...")
-            print("💻 Running: grep -E 'CCRI-[A-Z]{4}-[0-9]{4}' response_*.txt\n")
-            bulk_scan_for_flags(script_dir)
+            print("💻 Equivalent to: grep -E 'CCRI-[A-Z]{4}-[0-9]{4}' response_*.txt\n")
+            bulk_scan_for_flags(responses)
             pause("\nPress ENTER to return to the menu.")
 
         elif choice == "7":
@@ -3,9 +3,36 @@ import os
 import sys
 import subprocess
 import json
+import re
+import hashlib
+from array import array
+
+# === Locate project root and add to sys.path (shared array packing helpers) ===
+from pathlib import Path
+
+dir_path = Path(__file__).resolve().parent
+for parent in [dir_path] + list(dir_path.parents):
+    if (parent / ".ccri_ctf_root").exists():
+        sys.path.insert(0, str(parent))
+        break
+else:
+    print("❌ ERROR: Could not find project root (.ccri_ctf_root)", file=sys.stderr)
+    sys.exit(1)
+
+from flag_generators.flag_helpers import pack_array, unpack_array
 
 # === Subdomain Sweep ===
 
+INDEX_FILE = ".subdomain_index.json"
+INDEX_VERSION = 1
+SWEEP_THRESHOLD = 20  # more subdomains than this switches to the indexed sweep menu
+FLAG_REGEX = re.compile(r"CCRI-[A-Z]{4}-[0-9]{4}")
+CANDIDATE_REGEX = re.compile(rb"\b[A-Z0-9]{4}-[A-Z0-9]{4}-[A-Z0-9]{4}\b")  # real and decoy shapes
+TITLE_REGEX = re.compile(rb"<title>(.*?)</title>", re.S)
+TAG_REGEX = re.compile(rb"<[^>]+>")
+WORD_REGEX = re.compile(rb"[a-z0-9]{3,}")
+DEFAULT_DOMAINS = ["alpha", "beta", "gamma", "delta", "omega"]
+
 def find_project_root():
     dir_path = os.path.abspath(os.path.dirname(__file__))
     while dir_path != "/":
@@ -23,6 +50,129 @@ def pause(prompt="Press ENTER to continue..."):
     if not validation_mode:
         input(prompt)
 
+def load_domains(script_dir):
+    """
+    Subdomain labels from domains.txt (without .liber8.local), or the classic five.
+    """
+    domains_file = os.path.join(script_dir, "domains.txt")
+    try:
+        with open(domains_file, "r", encoding="utf-8") as f:
+            domains = [line.strip() for line in f if line.strip()]
+    except OSError:
+        return list(DEFAULT_DOMAINS)
+    domains = [d[:-len(".liber8.local")] if d.endswith(".liber8.local") else d for d in domains]
+    return domains or list(DEFAULT_DOMAINS)
+
+def html_path(script_dir, domain):
+    return os.path.join(script_dir, f"{domain}.liber8.local.html")
+
+class SubdomainIndex:
+    """
+    One-pass index over every subdomain page: its title, the flag-shaped
+    strings it contains, and an inverted word index (word -> page ids) for
+    keyword searches. Cached in .subdomain_index.json and rebuilt whenever
+    domains.txt or any page changes size or mtime.
+    """
+
+    def __init__(self, domains, titles, candidates, words):
+        self.domains = domains
+        self.titles = titles
+        self.candidates = candidates  # page id -> flag-shaped strings
+        self.words = words            # word -> array of page ids
+
+    @staticmethod
+    def signature(script_dir, domains):
+        digest = hashlib.sha1("\n".join(domains).encode("utf-8"))
+        with os.scandir(script_dir) as entries:
+            for entry in sorted(entries, key=lambda e: e.name):
+                if entry.name.endswith(".liber8.local.html"):
+                    st = entry.stat()
+                    digest.update(f"{entry.name}:{st.st_size}:{st.st_mtime_ns}\n".encode("utf-8"))
+        return digest.hexdigest()
+
+    @classmethod
+    def build(cls, script_dir, domains):
+        titles = []
+        candidates = {}
+        words = {}
+        for page_id, domain in enumerate(domains):
+            try:
+                with open(html_path(script_dir, domain), "rb") as f:
+                    data = f.read()
+            except OSError:
+                titles.append("")
+                continue
+            title = TITLE_REGEX.search(data)
+            titles.append(title.group(1).decode("utf-8", errors="replace").strip() if title else "")
+            found = CANDIDATE_REGEX.findall(data)
+            if found:
+                candidates[page_id] = sorted({c.decode("ascii") for c in found})
+            text = TAG_REGEX.sub(b" ", data).lower()
+            for word in set(WORD_REGEX.findall(text)):
+                bucket = words.get(word)
+                if bucket is None:
+                    bucket = words[word] = array("I")
+                bucket.append(page_id)
+        words = {word.decode("ascii"): ids for word, ids in words.items()}
+        return cls(domains, titles, candidates, words)
+
+    def save(self, path, signature):
+        document = {
+            "version": INDEX_VERSION,
+            "signature": signature,
+            "domains": self.domains,
+            "titles": self.titles,
+            "candidates": {str(page_id): found for page_id, found in self.candidates.items()},
+            "words": {word: pack_array(ids) for word, ids in self.words.items()},
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(document, f, separators=(",", ":"))
+
+    @classmethod
+    def open(cls, script_dir, domains, rebuild=False):
+        """Cached index when it matches the pages on disk, else a fresh one (saved for next time)."""
+        path = os.path.join(script_dir, INDEX_FILE)
+        signature = cls.signature(script_dir, domains)
+        if not rebuild:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    document = json.load(f)
+                if document.get("version") == INDEX_VERSION and document.get("signature") == signature:
+                    return cls(
+                        document["domains"],
+                        document["titles"],
+                        {int(page_id): found for page_id, found in document["candidates"].items()},
+                        {word: unpack_array(ids) for word, ids in document["words"].items()},
+                    )
+            except (OSError, ValueError, KeyError):
+                pass
+        index = cls.build(script_dir, domains)
+        try:
+            index.save(path, signature)
+        except OSError:
+            pass  # Read-only folder: index still works for this session
+        return index
+
+    def flags(self):
+        """(page id, flag) for every string in the agency flag format."""
+        for page_id in sorted(self.candidates):
+            for found in self.candidates[page_id]:
+                if FLAG_REGEX.fullmatch(found):
+                    yield page_id, found
+
+    def search(self, query):
+        """Page ids containing every word of the query."""
+        ids = None
+        for word in WORD_REGEX.findall(query.lower().encode("utf-8")):
+            found = set(self.words.get(word.decode("ascii"), ()))
+            ids = found if ids is None else ids & found
+        return sorted(ids) if ids else []
+
+    def find(self, text):
+        """Page ids whose subdomain name contains text."""
+        text = text.lower()
+        return [page_id for page_id, domain in enumerate(self.domains) if text in domain]
+
 def flatten_html_files(script_dir, domains):
     """
     Move all *.html files to script_dir if they are nested
@@ -46,10 +196,13 @@ def flatten_html_files(script_dir, domains):
 def check_html_files(domains, script_dir):
     missing = []
     for domain in domains:
-        html_file = os.path.join(script_dir, f"{domain}.liber8.local.html")
+        html_file = html_path(script_dir, domain)
         if not os.path.isfile(html_file):
-            print(f"❌ ERROR: Missing file '{os.path.basename(html_file)}'")
+            if len(missing) < 5:
+                print(f"❌ ERROR: Missing file '{os.path.basename(html_file)}'")
             missing.append(html_file)
+    if len(missing) > 5:
+        print(f"❌ ... and {len(missing) - 5} more missing pages")
     return missing
 
 def open_in_browser(file_path):
@@ -58,20 +211,30 @@ def open_in_browser(file_path):
     except FileNotFoundError:
         print("❌ ERROR: Could not open browser (xdg-open not found).")
 
-def auto_scan_for_flags(script_dir):
-    try:
-        result = subprocess.run(
-            ["grep", "-E", "CCRI-[A-Z]{4}-[0-9]{4}", os.path.join(script_dir, "*.html")],
-            text=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.DEVNULL
-        )
-        if result.stdout:
-            print(result.stdout)
-        else:
-            print("⚠️ No flags found in auto-scan.")
-    except Exception as e:
-        print(f"❌ ERROR during auto-scan: {e}")
+def auto_scan_for_flags(script_dir, domains):
+    """
+    grep-style scan (file:line) of every subdomain page with one compiled regex.
+    """
+    found = False
+    for domain in domains:
+        html_file = html_path(script_dir, domain)
+        try:
+            with open(html_file, "r", encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    if FLAG_REGEX.search(line):
+                        print(f"{os.path.basename(html_file)}:{line.rstrip()}")
+                        found = True
+        except Exception as e:
+            print(f"❌ ERROR during auto-scan of {os.path.basename(html_file)}: {e}")
+    if not found:
+        print("⚠️ No flags found in auto-scan.")
+
+def print_pages(index, page_ids, limit=25):
+    for page_id in page_ids[:limit]:
+        title = index.titles[page_id] if page_id < len(index.titles) else ""
+        print(f"   {index.domains[page_id]}.liber8.local  –  {title}")
+    if len(page_ids) > limit:
+        print(f"   ... and {len(page_ids) - limit} more")
 
 def validate_subdomains(domains, script_dir, expected_flag):
     """
@@ -79,7 +242,7 @@ def validate_subdomains(domains, script_dir, expected_flag):
     """
     print("🔍 Validation: scanning all subdomain HTML pages for the expected flag...")
     for domain in domains:
-        html_file = os.path.join(script_dir, f"{domain}.liber8.local.html")
+        html_file = html_path(script_dir, domain)
         try:
             with open(html_file, "r", encoding="utf-8") as f:
                 content = f.read()
@@ -91,10 +254,105 @@ def validate_subdomains(domains, script_dir, expected_flag):
     print(f"❌ Validation failed: flag {expected_flag} not found in any subdomain HTML file.", file=sys.stderr)
     return False
 
+def validate_sweep(index, expected_flag):
+    """
+    For validation mode: look the expected flag up in the sweep index.
+    """
+    print(f"🔍 Validation: checking the index of {len(index.domains)} subdomain pages for the expected flag...")
+    for page_id, found in index.candidates.items():
+        if expected_flag in found:
+            print(f"✅ Validation success: found flag {expected_flag} in {index.domains[page_id]}.liber8.local.html")
+            return True
+    print(f"❌ Validation failed: flag {expected_flag} not found in any subdomain HTML file.", file=sys.stderr)
+    return False
+
+def sweep_menu(script_dir, domains):
+    """
+    Interactive mode for the large sweep: thousands of subdomains, one index.
+    """
+    clear_screen()
+    print("🌐 Subdomain Sweep")
+    print("=================================\n")
+    print("🎯 Mission Briefing:")
+    print(f"DNS enumeration turned up **{len(domains)} subdomains** (see domains.txt).")
+    print("Each one has an HTML page that *might* hide a secret flag.\n")
+    print("🧠 Flag format: CCRI-AAAA-1111")
+    print("💡 Too many pages to open one by one: index them once, then sweep the index.\n")
+
+    print("📇 Indexing subdomain pages (cached after the first run)...")
+    index = SubdomainIndex.open(script_dir, domains)
+    print(f"✅ {len(index.domains)} pages indexed, {len(index.candidates)} contain flag-like strings.")
+
+    while True:
+        print("\n📂 Options:")
+        print("1. Sweep all subdomains for flag patterns")
+        print("2. Show every flag-like string (real format and decoys)")
+        print("3. Search pages by keyword (e.g. maintenance, api)")
+        print("4. Find a subdomain by name and open it")
+        print("5. Rebuild the index")
+        print("6. Exit\n")
+
+        choice = input("Select an option (1-6): ").strip()
+
+        if choice == "1":
+            print("\n🔎 Sweeping the index for CCRI-AAAA-1111 patterns...\n")
+            hits = list(index.flags())
+            for page_id, flag in hits:
+                print(f"   {index.domains[page_id]}.liber8.local: {flag}")
+            if not hits:
+                print("⚠️ No flags found in sweep.")
+            pause("\nPress ENTER to return to the menu.")
+
+        elif choice == "2":
+            print()
+            for page_id in sorted(index.candidates):
+                print(f"   {index.domains[page_id]}.liber8.local: {', '.join(index.candidates[page_id])}")
+            if not index.candidates:
+                print("⚠️ No flag-like strings found.")
+            pause("\nPress ENTER to return to the menu.")
+
+        elif choice == "3":
+            query = input("Keyword(s): ").strip()
+            page_ids = index.search(query)
+            print(f"\n📊 {len(page_ids)} page(s) contain: {query}")
+            print_pages(index, page_ids)
+            pause("\nPress ENTER to return to the menu.")
+
+        elif choice == "4":
+            name = input("Part of the subdomain name (e.g. omega-vpn): ").strip()
+            page_ids = index.find(name) if name else []
+            if not page_ids:
+                print("\n⚠️ No matching subdomains.")
+            elif len(page_ids) > 1:
+                print(f"\n📊 {len(page_ids)} matching subdomains:")
+                print_pages(index, page_ids)
+                print("\n💡 Narrow the name down to a single subdomain to open it.")
+            else:
+                html_file = html_path(script_dir, index.domains[page_ids[0]])
+                print(f"\n🌐 Opening {os.path.basename(html_file)} in your browser...")
+                open_in_browser(html_file)
+                print("\n💻 Tip: View the page AND its source (Ctrl+U) for hidden data.")
+            pause("\nPress ENTER to return to the menu.")
+
+        elif choice == "5":
+            print("\n📇 Rebuilding index...")
+            index = SubdomainIndex.open(script_dir, domains, rebuild=True)
+            print(f"✅ {len(index.domains)} pages indexed.")
+            pause("\nPress ENTER to return to the menu.")
+
+        elif choice == "6":
+            print("\n👋 Exiting Subdomain Sweep. Stay sharp, agent!")
+            break
+
+        else:
+            print("\n❌ Invalid choice. Please enter a number from 1 to 6.")
+            pause()
+
 def main():
     project_root = find_project_root()
     script_dir = os.path.abspath(os.path.dirname(__file__))
-    domains = ["alpha", "beta", "gamma", "delta", "omega"]
+    domains = load_domains(script_dir)
+    sweep = len(domains) > SWEEP_THRESHOLD
 
     # Flatten nested HTML files if needed
     flatten_html_files(script_dir, domains)
@@ -111,17 +369,28 @@ def main():
             sys.exit(1)
 
         # Validate
-        if validate_subdomains(domains, script_dir, expected_flag):
+        if sweep:
+            valid = validate_sweep(SubdomainIndex.open(script_dir, domains), expected_flag)
+        else:
+            valid = validate_subdomains(domains, script_dir, expected_flag)
+        if valid:
             sys.exit(0)
         else:
             sys.exit(1)
 
     # === Student Interactive Mode ===
+    if sweep:
+        if check_html_files(domains, script_dir):
+            pause("\n⚠️ One or more HTML files are missing. Press ENTER to exit.")
+            sys.exit(1)
+        sweep_menu(script_dir, domains)
+        return
+
     clear_screen()
     print("🌐 Subdomain Sweep")
     print("=================================\n")
     print("🎯 Mission Briefing:")
-    print("You've discovered **five subdomains** hosted by the target organization.")
+    print(f"You've discovered **{len(domains)} subdomains** hosted by the target organization.")
     print("Each one has an HTML page that *might* hide a secret flag.\n")
     print("🧠 Flag format: CCRI-AAAA-1111")
     print("💡 In real CTFs, you'd use tools like curl, grep, or open the page in a browser to search for hidden data.\n")
@@ -132,18 +401,21 @@ def main():
         pause("\n⚠️ One or more HTML files are missing. Press ENTER to exit.")
         sys.exit(1)
 
+    scan_option = len(domains) + 1
+    exit_option = len(domains) + 2
+
     while True:
         print("\n📂 Available subdomains:")
         for i, domain in enumerate(domains, 1):
             print(f"{i}. {domain}.liber8.local")
-        print("6. Auto-scan all subdomains for flag patterns")
-        print("7. Exit\n")
+        print(f"{scan_option}. Auto-scan all subdomains for flag patterns")
+        print(f"{exit_option}. Exit\n")
 
-        choice = input("Select an option (1-7): ").strip()
+        choice = input(f"Select an option (1-{exit_option}): ").strip()
 
-        if choice in {"1", "2", "3", "4", "5"}:
+        if choice.isdigit() and 1 <= int(choice) <= len(domains):
             idx = int(choice) - 1
-            html_file = os.path.join(script_dir, f"{domains[idx]}.liber8.local.html")
+            html_file = html_path(script_dir, domains[idx])
             print(f"\n🌐 Opening {os.path.basename(html_file)} in your browser...")
             open_in_browser(html_file)
             print("\n💻 Tip: View the page AND its source (Ctrl+U) for hidden data.")
@@ -151,19 +423,19 @@ def main():
             pause("Press ENTER to return to the menu.")
             clear_screen()
 
-        elif choice == "6":
-            print("\n🔎 Auto-scanning all subdomains for flags using:")
+        elif choice == str(scan_option):
+            print("\n🔎 Auto-scanning all subdomains for flags (equivalent to):")
             print("    grep -E 'CCRI-[A-Z]{4}-[0-9]{4}' *.html\n")
-            auto_scan_for_flags(script_dir)
+            auto_scan_for_flags(script_dir, domains)
             pause("\nPress ENTER to return to the menu.")
             clear_screen()
 
-        elif choice == "7":
+        elif choice == str(exit_option):
             print("\n👋 Exiting Subdomain Sweep. Stay sharp, agent!")
             break
 
         else:
-            print("\n❌ Invalid choice. Please enter a number from 1 to 7.")
+            print(f"\n❌ Invalid choice. Please enter a number from 1 to {exit_option}.")
             pause()
             clear_screen()
 
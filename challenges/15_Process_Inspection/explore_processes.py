@@ -5,6 +5,20 @@ import subprocess
 import json
 import time
 
+# === Locate project root and add to sys.path (shared ps dump engine) ===
+from pathlib import Path
+
+dir_path = Path(__file__).resolve().parent
+for parent in [dir_path] + list(dir_path.parents):
+    if (parent / ".ccri_ctf_root").exists():
+        sys.path.insert(0, str(parent))
+        break
+else:
+    print("❌ ERROR: Could not find project root (.ccri_ctf_root)", file=sys.stderr)
+    sys.exit(1)
+
+from flag_generators.ps_dump import PsDump
+
 # === Process Inspection Helper ===
 
 def find_project_root():
@@ -49,16 +63,41 @@ def relaunch_in_bigger_terminal(script_path):
 def validate_flag_in_ps_dump(ps_dump_file, expected_flag):
     print("🔍 Validation: scanning ps_dump.txt for the expected flag...")
     try:
-        with open(ps_dump_file, "r", encoding="utf-8") as f:
-            for line in f:
-                if expected_flag in line:
-                    print(f"✅ Validation success: found flag {expected_flag} in ps_dump.txt")
-                    return True
+        dump = PsDump.open(ps_dump_file)
+        if dump.filter(contains=expected_flag):
+            print(f"✅ Validation success: found flag {expected_flag} in ps_dump.txt")
+            return True
     except Exception as e:
         print(f"❌ ERROR while validating: {e}", file=sys.stderr)
     print(f"❌ Validation failed: flag {expected_flag} not found in ps_dump.txt", file=sys.stderr)
     return False
 
+def format_rows(dump, row_ids):
+    """Matching process lines with each --option on its own line (like the sed in the tip)."""
+    return "\n".join(dump.line(i) for i in row_ids).replace("--", "\n    --") + "\n"
+
+def show_and_offer_save(formatted, script_dir):
+    print(formatted)
+    print("=================================")
+    while True:
+        print("\nOptions:")
+        print("1. Return to process list")
+        print("2. Save this output to a file (process_output.txt)\n")
+        save_choice = input("Choose an option (1-2): ").strip()
+        if save_choice == "1":
+            clear_screen()
+            break
+        elif save_choice == "2":
+            output_file = os.path.join(script_dir, "process_output.txt")
+            with open(output_file, "w") as f:
+                f.write(formatted)
+            print(f"✅ Saved output to {os.path.basename(output_file)}")
+            pause()
+            clear_screen()
+            break
+        else:
+            print("❌ Invalid choice. Please select 1 or 2.")
+
 def main():
     project_root = find_project_root()
     script_dir = os.path.abspath(os.path.dirname(__file__))
@@ -98,26 +137,25 @@ def main():
         pause("Press ENTER to exit...")
         sys.exit(1)
 
-    # Build unique process list
-    processes = []
-    with open(ps_dump, "r") as f:
-        next(f)  # skip header
-        for line in f:
-            parts = line.strip().split()
-            if len(parts) > 11 and parts[11].startswith("/"):
-                proc_name = parts[11]
-                if proc_name not in processes:
-                    processes.append(proc_name)
+    # Load the snapshot once; lookups below filter it in-process (no grep per lookup)
+    dump = PsDump.open(ps_dump)
+    processes = dump.keys("command")
+    users = dump.keys("user")
 
     while True:
+        filter_user = len(processes) + 1
+        search_text = len(processes) + 2
+        exit_choice = len(processes) + 3
         print("=================================")
-        print("📂 Process List (from ps_dump.txt):")
+        print(f"📂 Process List (from ps_dump.txt, {dump.rows} processes):")
         for idx, proc in enumerate(processes, 1):
-            print(f"{idx}. {proc}")
-        print(f"{len(processes)+1}. Exit\n")
+            print(f"{idx}. {proc} ({len(dump.lookup('command', proc))})")
+        print(f"{filter_user}. Filter by user")
+        print(f"{search_text}. Search command lines for text")
+        print(f"{exit_choice}. Exit\n")
 
         try:
-            choice = int(input(f"Select a process to inspect (1-{len(processes)+1}): ").strip())
+            choice = int(input(f"Select a process to inspect (1-{exit_choice}): ").strip())
         except ValueError:
             print("❌ Invalid input. Please enter a number.")
             pause()
@@ -127,42 +165,39 @@ def main():
         if 1 <= choice <= len(processes):
             proc_name = processes[choice - 1]
             print(f"\n🔍 Inspecting process: {proc_name}")
-            print("   → Command: grep \"{proc_name}\" ps_dump.txt | sed 's/--/\\n    --/g'")
+            print(f"   → Same as: grep \"{proc_name}\" ps_dump.txt | sed 's/--/\\n    --/g'")
             print("=================================\n")
             time.sleep(0.5)
+            show_and_offer_save(format_rows(dump, dump.lookup("command", proc_name)), script_dir)
+
+        elif choice == filter_user:
+            print("\n👤 Users: " + ", ".join(users))
+            user = input("Enter a user name: ").strip()
+            rows = dump.lookup("user", user)
+            if not rows:
+                print(f"❌ No processes for user '{user}'.")
+                pause()
+                clear_screen()
+                continue
+            print(f"\n🔍 {len(rows)} process(es) owned by {user}")
+            print(f"   → Same as: grep \"^{user} \" ps_dump.txt")
+            print("=================================\n")
+            show_and_offer_save(format_rows(dump, rows), script_dir)
+
+        elif choice == search_text:
+            text = input("\nEnter text to search for (e.g. --flag=): ").strip()
+            rows = dump.filter(contains=text) if text else []
+            if not rows:
+                print(f"❌ No command lines contain '{text}'.")
+                pause()
+                clear_screen()
+                continue
+            print(f"\n🔍 {len(rows)} process(es) matching '{text}'")
+            print(f"   → Same as: grep -F \"{text}\" ps_dump.txt")
+            print("=================================\n")
+            show_and_offer_save(format_rows(dump, rows), script_dir)
 
-            try:
-                result = subprocess.run(
-                    ["grep", proc_name, ps_dump],
-                    stdout=subprocess.PIPE,
-                    text=True
-                )
-                formatted = result.stdout.replace("--", "\n    --")
-                print(formatted)
-                print("=================================")
-            except Exception as e:
-                print(f"❌ Error while inspecting process: {e}")
-
-            while True:
-                print("\nOptions:")
-                print("1. Return to process list")
-                print("2. Save this output to a file (process_output.txt)\n")
-                save_choice = input("Choose an option (1-2): ").strip()
-                if save_choice == "1":
-                    clear_screen()
-                    break
-                elif save_choice == "2":
-                    output_file = os.path.join(script_dir, "process_output.txt")
-                    with open(output_file, "w") as f:
-                        f.write(formatted)
-                    print(f"✅ Saved output to {os.path.basename(output_file)}")
-                    pause()
-                    clear_screen()
-                    break
-                else:
-                    print("❌ Invalid choice. Please select 1 or 2.")
-
-        elif choice == len(processes)+1:
+        elif choice == exit_choice:
             print("\n👋 Exiting. Good luck identifying the rogue process!")
             break
         else:
@@ -6,6 +6,20 @@ import json
 import time
 import re
 
+# === Locate project root and add to sys.path (shared binary scanner) ===
+from pathlib import Path
+
+dir_path = Path(__file__).resolve().parent
+for parent in [dir_path] + list(dir_path.parents):
+    if (parent / ".ccri_ctf_root").exists():
+        sys.path.insert(0, str(parent))
+        break
+else:
+    print("❌ ERROR: Could not find project root (.ccri_ctf_root)", file=sys.stderr)
+    sys.exit(1)
+
+from flag_generators.binary_scan import BinaryScanner
+
 # === Hex Flag Hunter Helper ===
 
 def find_project_root():
@@ -33,28 +47,28 @@ def scanning_animation():
             print(".", end="", flush=True)
         print()
 
-def search_flags(binary_file, pattern=r"CCRI-[A-Z]{4}-[0-9]{4}"):
+def search_flags_with_offsets(binary_file, pattern=r"CCRI-[A-Z]{4}-[0-9]{4}"):
     """
-    Scan the binary file using strings and regex for flag-like patterns.
+    Scan the memory-mapped binary with one compiled regex.
+    Returns (offset, flag) pairs so each hit can be shown in a hexdump.
     """
     try:
-        strings_output = subprocess.run(
-            ["strings", binary_file],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.DEVNULL,
-            text=True
-        )
-        if strings_output.returncode != 0:
-            return []
-        flags = []
-        for line in strings_output.stdout.strip().splitlines():
-            if re.match(pattern, line.strip()):
-                flags.append(line.strip())
-        return flags
-    except Exception as e:
+        return BinaryScanner.find_flags(binary_file, pattern)
+    except (OSError, re.error) as e:
         print(f"❌ Error while scanning binary: {e}")
         sys.exit(1)
 
+def search_flags(binary_file, pattern=r"CCRI-[A-Z]{4}-[0-9]{4}"):
+    """
+    Scan the binary file for flag-like patterns (no external strings needed).
+    """
+    return [flag for _, flag in search_flags_with_offsets(binary_file, pattern)]
+
+def show_flag_in_hex(binary_file, offset):
+    """Print the bytes around a hit the way xxd would."""
+    print(f"📍 Offset 0x{offset:08x} ({offset}):")
+    print(BinaryScanner.hexdump(binary_file, offset))
+
 def validate_flag_in_binary(binary_file, expected_flag):
     print("🔍 Validation: scanning hex_flag.bin for expected flag...")
     flags = search_flags(binary_file)
@@ -64,11 +78,9 @@ def validate_flag_in_binary(binary_file, expected_flag):
 
     # Fallback: raw byte search
     try:
-        with open(binary_file, "rb") as f:
-            data = f.read()
-            if expected_flag.encode("utf-8") in data:
-                print(f"✅ Validation fallback: found flag {expected_flag} in raw bytes")
-                return True
+        if BinaryScanner.find_bytes(binary_file, expected_flag.encode("utf-8")) != -1:
+            print(f"✅ Validation fallback: found flag {expected_flag} in raw bytes")
+            return True
     except Exception as e:
         print(f"❌ Error during fallback search: {e}", file=sys.stderr)
 
@@ -4,9 +4,23 @@ import sys
 import subprocess
 import json
 import time
+import asyncio
+import shutil
+import socket
+from datetime import datetime
 
 # === Nmap Scan Puzzle Helper ===
 
+SCAN_HOST = "localhost"
+SCAN_PORTS = range(8000, 8101)
+MAX_CONCURRENCY = 50        # simultaneous connection attempts
+CONNECT_TIMEOUT = 1.0       # seconds per connect()
+BANNER_WAIT = 0.3           # how long to wait for a service that speaks first
+READ_TIMEOUT = 3.0          # seconds to read a full response
+MAX_RESPONSE_BYTES = 65536
+
+scan_cache = {}  # port -> probe result from the built-in scanner
+
 def find_project_root():
     dir_path = os.path.abspath(os.path.dirname(__file__))
     while dir_path != "/":
@@ -24,7 +38,141 @@ def pause(prompt="Press ENTER to continue..."):
     if not validation_mode:
         input(prompt)
 
+# === Built-in asyncio scanner (used when nmap/curl are missing, and in validation) ===
+
+def use_builtin_scanner():
+    """Use the Python scanner in validation mode or when nmap or curl is not installed."""
+    return validation_mode or shutil.which("nmap") is None or shutil.which("curl") is None
+
+def parse_http_response(raw):
+    """Split a raw HTTP/1.x response into (status line, headers dict, body text)."""
+    head, sep, body = raw.partition(b"\r\n\r\n")
+    if not sep:
+        head, sep, body = raw.partition(b"\n\n")
+    lines = head.decode("iso-8859-1").splitlines()
+    headers = {}
+    for line in lines[1:]:
+        name, colon, value = line.partition(":")
+        if colon:
+            headers[name.strip().lower()] = value.strip()
+    return lines[0] if lines else "", headers, body.decode("utf-8", errors="replace")
+
+async def read_until_eof(reader):
+    """Read the rest of the response (capped at MAX_RESPONSE_BYTES)."""
+    chunks = []
+    size = 0
+    while size < MAX_RESPONSE_BYTES:
+        chunk = await reader.read(MAX_RESPONSE_BYTES - size)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        size += len(chunk)
+    return b"".join(chunks)
+
+async def probe_port(ip, host, port, semaphore):
+    """
+    Connect to one port. If it is open, grab a banner if the service speaks
+    first, otherwise send an HTTP GET, and return what came back.
+    Returns None for closed/filtered ports.
+    """
+    async with semaphore:
+        try:
+            reader, writer = await asyncio.wait_for(asyncio.open_connection(ip, port), CONNECT_TIMEOUT)
+        except (OSError, asyncio.TimeoutError):
+            return None
+
+        result = {"port": port, "banner": "", "status": "", "headers": {}, "body": ""}
+        try:
+            try:
+                banner = await asyncio.wait_for(reader.read(MAX_RESPONSE_BYTES), BANNER_WAIT)
+            except asyncio.TimeoutError:
+                banner = b""
+
+            if banner and not banner.startswith(b"HTTP/"):
+                result["banner"] = banner.decode("utf-8", errors="replace").strip()
+            else:
+                if not banner:
+                    writer.write(
+                        f"GET / HTTP/1.0\r\nHost: {host}:{port}\r\nUser-Agent: ccri-scan\r\n\r\n".encode("ascii")
+                    )
+                    await writer.drain()
+                raw = banner + await asyncio.wait_for(read_until_eof(reader), READ_TIMEOUT)
+                if raw.startswith(b"HTTP/"):
+                    result["status"], result["headers"], result["body"] = parse_http_response(raw)
+                else:
+                    result["banner"] = raw.decode("utf-8", errors="replace").strip()
+        except (OSError, asyncio.TimeoutError):
+            pass  # Port is open even if the service never answered
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+        return result
+
+async def scan_ports_async(host, ports, concurrency=MAX_CONCURRENCY):
+    ip = socket.gethostbyname(host)
+    semaphore = asyncio.Semaphore(concurrency)
+    results = await asyncio.gather(*(probe_port(ip, host, port, semaphore) for port in ports))
+    return ip, [r for r in results if r is not None]
+
+def service_name(result):
+    """Service label the way the hub reports it: X-Service-Name, then Server, then a guess."""
+    headers = result["headers"]
+    return headers.get("x-service-name") or headers.get("server") or ("http" if result["status"] else "unknown")
+
+def format_scan_report(host, ip, results, total_ports, elapsed, started):
+    """Render results like `nmap -sV` so students (and extract_open_ports) read it the same way."""
+    lines = [
+        f"Starting CCRI Python scanner ( nmap-style ) at {started:%Y-%m-%d %H:%M %Z}".rstrip(),
+        f"Scan report for {host} ({ip})",
+        "Host is up.",
+        f"Not shown: {total_ports - len(results)} closed tcp ports (conn-refused)",
+        "",
+        f"{'PORT':<9}{'STATE':<6}{'SERVICE':<20}VERSION",
+    ]
+    for result in sorted(results, key=lambda r: r["port"]):
+        version = result["headers"].get("server", "")
+        if result["status"]:
+            version = f"{version} ({result['status']})".strip()
+        elif result["banner"]:
+            version = result["banner"].splitlines()[0][:60]
+        lines.append(f"{str(result['port']) + '/tcp':<9}{'open':<6}{service_name(result):<20}{version}")
+    lines += ["", f"Scan done: 1 IP address (1 host up) scanned in {elapsed:.2f} seconds"]
+    return "\n".join(lines)
+
+def run_builtin_scan(host=SCAN_HOST, ports=SCAN_PORTS):
+    """Scan with asyncio and cache every response so no port is contacted twice."""
+    if not validation_mode:
+        print(f"\n📡 Running built-in Python scanner: {host} ports {ports[0]}-{ports[-1]}\n")
+    started = datetime.now().astimezone()
+    start = time.perf_counter()
+    try:
+        ip, results = asyncio.run(scan_ports_async(host, ports))
+    except socket.gaierror as e:
+        print(f"❌ ERROR: Could not resolve {host}: {e}")
+        sys.exit(1)
+    elapsed = time.perf_counter() - start
+    scan_cache.clear()
+    scan_cache.update({str(result["port"]): result for result in results})
+    return format_scan_report(host, ip, results, len(ports), elapsed, started)
+
+def fetch_builtin_response(port):
+    """Body of the service on port (what `curl -s` would print), from the scan cache when possible."""
+    result = scan_cache.get(str(port))
+    if result is None:
+        _, results = asyncio.run(scan_ports_async(SCAN_HOST, [int(port)]))
+        if not results:
+            return ""
+        result = scan_cache[str(port)] = results[0]
+    return (result["body"] or result["banner"]).strip()
+
+# === nmap + curl ===
+
 def run_nmap_scan():
+    if use_builtin_scanner():
+        return run_builtin_scan()
     if not validation_mode:
         print("\n📡 Running: nmap -sV --version-light -p8000-8100 localhost\n")
     try:
@@ -51,6 +199,8 @@ def extract_open_ports(scan_output):
     return ports
 
 def fetch_port_response(port):
+    if use_builtin_scanner():
+        return fetch_builtin_response(port)
     try:
         result = subprocess.run(
             ["curl", "-s", f"http://localhost:{port}"],
@@ -103,13 +253,17 @@ def main():
     print("🎯 Your goal: Scan localhost (127.0.0.1) for open ports in the range 8000–8100, and find the REAL flag.")
     print("⚠️ Some ports contain random junk responses. Only one flag is correct.\n")
     print("🔧 Under the hood:")
-    print("   We'll use 'nmap' to scan the ports and see what services respond.")
-    print("   Then we'll query each open port for its reported response.\n")
+    if use_builtin_scanner():
+        print("   nmap/curl aren't installed, so we'll use a built-in Python scanner instead.")
+        print("   It knocks on every port at once (asyncio) and reads each service's reply, just like nmap + curl.\n")
+    else:
+        print("   We'll use 'nmap' to scan the ports and see what services respond.")
+        print("   Then we'll query each open port for its reported response.\n")
     pause()
 
     scan_output = run_nmap_scan()
     clear_screen()
-    print("📝 Nmap Scan Results:")
+    print("📝 Scan Results:" if use_builtin_scanner() else "📝 Nmap Scan Results:")
     print("--------------------------------------")
     print(scan_output)
     print("\n✅ Scan complete.\n")
@@ -4,6 +4,11 @@ import sys
 import subprocess
 import json
 import time
+import mmap
+import re
+import shlex
+import socket
+import struct
 
 # === PCAP Investigation Tool Helper ===
 
@@ -24,19 +29,546 @@ def pause(prompt="Press ENTER to continue..."):
     if not validation_mode:
         input(prompt)
 
-def check_tshark():
+# === Native pcap reader (no tshark needed) ===
+# Reads classic libpcap files record by record from a memory map, decodes
+# IPv4/IPv6 + TCP with struct, reassembles each direction of every flow in
+# sequence order and emits one dict per HTTP header block. Finished flows keep
+# only their stream ID (their buffers are freed), the oldest flows are evicted
+# and buffers are capped, so memory stays flat even for multi-GB captures.
+
+PCAP_MAGIC = {
+    b"\xd4\xc3\xb2\xa1": ("<", 1e-6),
+    b"\xa1\xb2\xc3\xd4": (">", 1e-6),
+    b"\x4d\x3c\xb2\xa1": ("<", 1e-9),  # nanosecond timestamps
+    b"\xa1\xb2\x3c\x4d": (">", 1e-9),
+}
+LINKTYPE_NULL, LINKTYPE_ETHERNET, LINKTYPE_RAW_BSD, LINKTYPE_RAW = 0, 1, 12, 101
+LINKTYPE_LINUX_SLL, LINKTYPE_IPV4, LINKTYPE_IPV6, LINKTYPE_LINUX_SLL2 = 113, 228, 229, 276
+
+TCP_FIN, TCP_SYN, TCP_RST, TCP_ACK = 0x01, 0x02, 0x04, 0x10
+MAX_FLOW_BUFFER = 256 * 1024   # unparsed bytes kept per direction
+MAX_OUT_OF_ORDER = 64          # segments held waiting for a gap to fill
+MAX_OPEN_FLOWS = 65536         # oldest flows are evicted beyond this
+CLOSED_FLOW_TIMEOUT = 120.0    # seconds a closed flow keeps its stream ID (TCP TIME_WAIT, 2 x MSL)
+
+HTTP_START = re.compile(rb"(?:HTTP/\d\.\d \d{3}|[A-Z]{3,10} \S+ HTTP/\d\.\d)")
+
+def iter_pcap_records(pcap_file):
+    """Yield (timestamp, linktype, packet bytes, file offset of the packet) for every record."""
+    with open(pcap_file, "rb") as f:
+        if os.fstat(f.fileno()).st_size < 24:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            magic = mm[:4]
+            if magic == b"\x0a\x0d\x0d\x0a":
+                raise ValueError("pcapng files are not supported; save the capture as classic pcap")
+            if magic not in PCAP_MAGIC:
+                raise ValueError("not a pcap file (bad magic number)")
+            endian, ts_unit = PCAP_MAGIC[magic]
+            linktype = struct.unpack_from(endian + "I", mm, 20)[0] & 0x0FFFFFFF
+            record = struct.Struct(endian + "IIII")
+
+            offset, size = 24, len(mm)
+            while offset + 16 <= size:
+                ts_sec, ts_frac, incl_len, _ = record.unpack_from(mm, offset)
+                offset += 16
+                if offset + incl_len > size:
+                    break  # truncated capture
+                yield ts_sec + ts_frac * ts_unit, linktype, mm[offset:offset + incl_len], offset
+                offset += incl_len
+
+def network_layer(linktype, frame):
+    """Return (ip version, IP packet) for the link types we understand, else (None, None)."""
+    if linktype == LINKTYPE_ETHERNET:
+        if len(frame) < 14:
+            return None, None
+        ethertype, offset = struct.unpack_from("!H", frame, 12)[0], 14
+        while ethertype in (0x8100, 0x88A8) and len(frame) >= offset + 4:  # VLAN tags
+            ethertype, offset = struct.unpack_from("!H", frame, offset + 2)[0], offset + 4
+        version = {0x0800: 4, 0x86DD: 6}.get(ethertype)
+        return version, frame[offset:]
+    if linktype == LINKTYPE_NULL:
+        if len(frame) < 4:
+            return None, None
+        family = max(struct.unpack_from("<I", frame)[0], struct.unpack_from(">I", frame)[0]) & 0xFF
+        return (4 if family == 2 else 6 if family in (24, 28, 30) else None), frame[4:]
+    if linktype == LINKTYPE_LINUX_SLL:
+        if len(frame) < 16:
+            return None, None
+        return {0x0800: 4, 0x86DD: 6}.get(struct.unpack_from("!H", frame, 14)[0]), frame[16:]
+    if linktype == LINKTYPE_LINUX_SLL2:
+        if len(frame) < 20:
+            return None, None
+        return {0x0800: 4, 0x86DD: 6}.get(struct.unpack_from("!H", frame, 0)[0]), frame[20:]
+    if linktype in (LINKTYPE_RAW, LINKTYPE_RAW_BSD, LINKTYPE_IPV4, LINKTYPE_IPV6):
+        if not len(frame):
+            return None, None
+        return frame[0] >> 4, frame
+    return None, None
+
+def parse_tcp_segment(linktype, frame):
+    """
+    Decode one frame down to TCP.
+    Returns (src, sport, dst, dport, seq, flags, payload bytes, payload offset
+    within the frame) or None. Addresses stay as raw 4/16-byte strings; see format_ip().
+    """
+    version, packet = network_layer(linktype, frame)
+    if version == 4:
+        if len(packet) < 20:
+            return None
+        ihl = (packet[0] & 0x0F) * 4
+        total_len, frag, proto = struct.unpack_from("!H2xHxB", packet, 2)
+        if proto != 6 or frag & 0x1FFF:  # not TCP, or a non-first fragment
+            return None
+        src, dst = packet[12:16], packet[16:20]
+        segment = packet[ihl:total_len] if total_len >= ihl else packet[ihl:]
+        segment_start = len(frame) - len(packet) + ihl
+    elif version == 6:
+        if len(packet) < 40 or packet[6] != 6:  # extension headers are not followed
+            return None
+        payload_len = struct.unpack_from("!H", packet, 4)[0]
+        src, dst = packet[8:24], packet[24:40]
+        segment = packet[40:40 + payload_len]
+        segment_start = len(frame) - len(packet) + 40
+    else:
+        return None
+
+    if len(segment) < 20:
+        return None
+    sport, dport, seq, offset_flags = struct.unpack_from("!HHI4xH", segment)
+    data_offset = (offset_flags >> 12) * 4
+    return src, sport, dst, dport, seq, offset_flags & 0x3F, segment[data_offset:], segment_start + data_offset
+
+def format_ip(raw):
+    """Dotted/colon notation for a raw IPv4 or IPv6 address."""
+    return socket.inet_ntop(socket.AF_INET if len(raw) == 4 else socket.AF_INET6, raw)
+
+def parse_http_header_block(block):
+    """Split an HTTP header block into (start line, [(name, value), ...])."""
+    lines = block.decode("iso-8859-1").split("\r\n")
+    headers = []
+    for line in lines[1:]:
+        if line[:1] in (" ", "\t") and headers:  # folded continuation line
+            name, value = headers[-1]
+            headers[-1] = (name, value + " " + line.strip())
+            continue
+        name, colon, value = line.partition(":")
+        if colon:
+            headers.append((name.strip(), value.strip()))
+    return lines[0], headers
+
+class TcpHttpReassembler:
+    """
+    Per-flow TCP reassembly that yields HTTP header blocks as soon as they complete.
+    Stream IDs are assigned in first-seen order, like tshark's tcp.stream.
+    A flow closed by FIN in both directions or by RST keeps its stream ID, so
+    the final ACK and any retransmitted FINs stay in the same stream; only a
+    new SYN on the same 4-tuple, or a packet after CLOSED_FLOW_TIMEOUT, starts
+    a new stream.
+    """
+
+    def __init__(self):
+        self.flows = {}      # canonical 4-tuple -> flow state
+        self.next_stream = 0
+        self.current_stream = None  # stream ID of the last segment fed
+
+    def feed(self, timestamp, segment):
+        src, sport, dst, dport, seq, flags, payload = segment[:7]
+        key = (src, sport, dst, dport) if (src, sport) <= (dst, dport) else (dst, dport, src, sport)
+        flow = self.flows.get(key)
+        if flow is not None and flow["closed_at"] is not None:
+            reused = flags & TCP_SYN and not flags & TCP_ACK
+            if reused or timestamp - flow["closed_at"] > CLOSED_FLOW_TIMEOUT:
+                del self.flows[key]  # 4-tuple reused: a new conversation
+                flow = None
+        if flow is None:
+            if len(self.flows) >= MAX_OPEN_FLOWS:
+                self.flows.pop(next(iter(self.flows)))
+            flow = self.flows[key] = {"stream": self.next_stream, "directions": {}, "closed_at": None}
+            self.next_stream += 1
+        self.current_stream = flow["stream"]
+        if flow["closed_at"] is not None:
+            return  # Final ACK or retransmission after the close: nothing left to reassemble
+
+        direction = flow["directions"].get((src, sport))
+        if direction is None:
+            direction = flow["directions"][(src, sport)] = {
+                "next_seq": None, "pending": {}, "buffer": bytearray(), "skip": 0, "closed": False,
+            }
+        if flags & TCP_SYN:
+            direction["next_seq"] = (seq + 1) & 0xFFFFFFFF
+        elif payload:
+            if direction["next_seq"] is None:
+                direction["next_seq"] = seq  # capture started mid-connection
+            self._add_payload(direction, seq, payload)
+            yield from self._http_messages(flow["stream"], timestamp, src, sport, dst, dport, direction)
+
+        if flags & (TCP_FIN | TCP_RST):
+            direction["closed"] = True
+            if flags & TCP_RST or all(d["closed"] for d in flow["directions"].values()) \
+                    and len(flow["directions"]) == 2:
+                flow["closed_at"] = timestamp
+                flow["directions"] = {}  # Free the buffers; only the stream ID is kept
+
+    @staticmethod
+    def _add_payload(direction, seq, payload):
+        """Append in-order data to the buffer, holding early segments until the gap fills."""
+        pending = direction["pending"]
+        pending[seq] = payload
+        while True:
+            expected = direction["next_seq"]
+            data = pending.pop(expected, None)
+            if data is None:
+                # Accept overlapping retransmissions that extend past what we have
+                for start in list(pending):
+                    overlap = (expected - start) & 0xFFFFFFFF
+                    if overlap < len(pending[start]):
+                        data = pending.pop(start)[overlap:]
+                        break
+                    if overlap < 0x80000000:
+                        del pending[start]  # fully old retransmission
+                if data is None:
+                    break
+            direction["buffer"] += data
+            direction["next_seq"] = (expected + len(data)) & 0xFFFFFFFF
+        if len(pending) > MAX_OUT_OF_ORDER:
+            # Give up on the gap: resume from the lowest held segment
+            direction["next_seq"] = min(pending)
+            direction["buffer"].clear()
+            direction["skip"] = 0
+        if len(direction["buffer"]) > MAX_FLOW_BUFFER:
+            del direction["buffer"][:-MAX_FLOW_BUFFER]
+
+    @staticmethod
+    def _http_messages(stream, timestamp, src, sport, dst, dport, direction):
+        buffer = direction["buffer"]
+        while buffer:
+            if direction["skip"]:
+                if direction["skip"] == -1:
+                    # Body of unknown length: resync on the next message start line
+                    match = HTTP_START.search(buffer, 1)
+                    if match is None:
+                        del buffer[:max(0, len(buffer) - 32)]
+                        return
+                    del buffer[:match.start()]
+                    direction["skip"] = 0
+                else:
+                    taken = min(direction["skip"], len(buffer))
+                    del buffer[:taken]
+                    direction["skip"] -= taken
+                continue
+
+            match = HTTP_START.match(buffer)
+            if match is None:
+                match = HTTP_START.search(buffer)
+                if match is None:
+                    del buffer[:max(0, len(buffer) - 32)]
+                    return
+                del buffer[:match.start()]
+            end = buffer.find(b"\r\n\r\n")
+            if end == -1:
+                return
+            start_line, headers = parse_http_header_block(bytes(buffer[:end]))
+            del buffer[:end + 4]
+
+            lowered = {name.lower(): value for name, value in headers}
+            is_response = start_line.startswith("HTTP/")
+            if lowered.get("content-length", "").isdigit():
+                direction["skip"] = int(lowered["content-length"])
+            elif is_response or "chunked" in lowered.get("transfer-encoding", "").lower():
+                direction["skip"] = -1
+
+            yield {
+                "stream": stream, "time": timestamp,
+                "src": format_ip(src), "sport": sport, "dst": format_ip(dst), "dport": dport,
+                "start_line": start_line, "is_response": is_response, "headers": headers,
+            }
+
+def iter_http_messages(pcap_file):
+    """Stream every HTTP request/response header block out of a pcap file."""
+    reassembler = TcpHttpReassembler()
+    for timestamp, linktype, frame, _ in iter_pcap_records(pcap_file):
+        segment = parse_tcp_segment(linktype, frame)
+        if segment is not None:
+            yield from reassembler.feed(timestamp, segment)
+
+# === Display-filter subset ===
+# <field> <op> <value> clauses joined with and / or / not, e.g.
+#   http.header contains X-Flag
+#   http.response.code == 200 and ip.src == 192.168.50.20
+#   http.header.server matches "nginx/1\.1[0-9]"
+
+FILTER_OPS = ("contains", "==", "!=", "matches")
+EMPTY_MESSAGE = {"stream": 0, "time": 0.0, "src": "", "sport": 0, "dst": "", "dport": 0,
+                 "start_line": "", "is_response": False, "headers": []}
+
+def http_field_values(message, field):
+    """All string values a message has for a display-filter field."""
+    headers = message["headers"]
+    parts = message["start_line"].split(" ", 2)
+    if field == "http.header":
+        return [f"{name}: {value}" for name, value in headers]
+    if field.startswith("http.header."):
+        wanted = field[len("http.header."):].replace("_", "-").lower()
+        return [value for name, value in headers if name.lower() == wanted]
+    if field == "http.request.method":
+        return [] if message["is_response"] else parts[:1]
+    if field == "http.request.uri":
+        return [] if message["is_response"] or len(parts) < 2 else [parts[1]]
+    if field == "http.response.code":
+        return parts[1:2] if message["is_response"] else []
+    if field in ("http.host", "http.server", "http.user_agent", "http.content_type", "http.cookie", "http.set_cookie"):
+        return http_field_values(message, "http.header." + field[len("http."):])
+    if field == "ip.src":
+        return [message["src"]]
+    if field == "ip.dst":
+        return [message["dst"]]
+    if field == "ip.addr":
+        return [message["src"], message["dst"]]
+    if field == "tcp.srcport":
+        return [str(message["sport"])]
+    if field == "tcp.dstport":
+        return [str(message["dport"])]
+    if field == "tcp.port":
+        return [str(message["sport"]), str(message["dport"])]
+    if field == "tcp.stream":
+        return [str(message["stream"])]
+    if field == "http":
+        return [message["start_line"]]
+    raise ValueError(f"unknown filter field: {field}")
+
+def compile_filter(expression):
+    """Compile a display-filter expression into a predicate over HTTP message dicts."""
+    tokens = shlex.split(expression)
+    position = 0
+
+    def peek():
+        return tokens[position].lower() if position < len(tokens) else None
+
+    def take():
+        nonlocal position
+        if position >= len(tokens):
+            raise ValueError(f"incomplete filter: {expression!r}")
+        position += 1
+        return tokens[position - 1]
+
+    def clause():
+        if peek() == "not":
+            take()
+            inner = clause()
+            return lambda message: not inner(message)
+        field = take().lower()
+        http_field_values(EMPTY_MESSAGE, field)  # raises ValueError for unknown fields
+        if peek() not in FILTER_OPS:
+            return lambda message: bool(http_field_values(message, field))  # field present
+        op, value = take().lower(), take()
+        if op == "contains":
+            return lambda message: any(value in v for v in http_field_values(message, field))
+        if op == "==":
+            return lambda message: any(v == value for v in http_field_values(message, field))
+        if op == "!=":
+            return lambda message: all(v != value for v in http_field_values(message, field))
+        pattern = re.compile(value)
+        return lambda message: any(pattern.search(v) for v in http_field_values(message, field))
+
+    def conjunction():
+        predicates = [clause()]
+        while peek() in ("and", "&&"):
+            take()
+            predicates.append(clause())
+        return lambda message: all(p(message) for p in predicates)
+
+    predicates = [conjunction()]
+    while peek() in ("or", "||"):
+        take()
+        predicates.append(conjunction())
+    if position != len(tokens):
+        raise ValueError(f"unexpected {tokens[position]!r} in filter")
+    return lambda message: any(p(message) for p in predicates)
+
+def search_pcap(pcap_file, expression):
+    """Yield HTTP messages in pcap_file matching a display-filter expression."""
+    predicate = compile_filter(expression)
+    for message in iter_http_messages(pcap_file):
+        if predicate(message):
+            yield message
+
+def format_http_message(message):
+    direction = "⬅️ Response" if message["is_response"] else "➡️ Request"
+    lines = [f"🔗 Stream {message['stream']}: {message['src']}:{message['sport']} → "
+             f"{message['dst']}:{message['dport']}  ({direction})",
+             f"   {message['start_line']}"]
+    lines += [f"   {name}: {value}" for name, value in message["headers"]]
+    return "\n".join(lines)
+
+def filter_search_menu(pcap_file):
+    """Let the student run display-filter searches with the built-in parser."""
+    while True:
+        clear_screen()
+        print("🔍 Filter Search (built-in pcap parser)")
+        print("-----------------------------------------")
+        print("Examples:")
+        print("   http.header contains X-Flag")
+        print("   http.response.code == 200 and http.server contains nginx")
+        print("   ip.addr == 192.168.50.10\n")
+        expression = input("Filter (blank to go back): ").strip()
+        if not expression:
+            return
+        try:
+            matches = 0
+            start = time.perf_counter()
+            for message in search_pcap(pcap_file, expression):
+                print("\n" + format_http_message(message))
+                matches += 1
+            print(f"\n✅ {matches} matching HTTP message(s) in {time.perf_counter() - start:.2f}s")
+        except ValueError as e:
+            print(f"⚠️ {e}")
+        pause()
+
+# === One-pass stream index ===
+# A single pass over the capture records, for every TCP stream: endpoints,
+# packet/byte counts, the file offset and length of each payload, HTTP start
+# lines and flag-like matches. It is cached next to the pcap as
+# .<name>.index.json and rebuilt only when the pcap's size or mtime changes,
+# so every menu action after the first is instant even on huge captures.
+
+STREAM_INDEX_VERSION = 2  # 2: closed flows keep their stream ID (no phantom stream for the final ACK)
+FLAG_LIKE = re.compile(rb"[A-Z]{4}-[A-Z]{4}-[0-9]{4}|[A-Z]{4}-[0-9]{4}-[A-Z]{4}")
+FLAG_LIKE_OVERLAP = 13  # longest match minus one, carried between segments
+MAX_HTTP_LINES = 20     # HTTP start lines remembered per stream
+
+_stream_index_memo = {}  # pcap path -> index already loaded in this process
+
+def stream_index_path(pcap_file):
+    folder, name = os.path.split(os.path.abspath(pcap_file))
+    return os.path.join(folder, f".{name}.index.json")
+
+def build_stream_index(pcap_file):
+    """Build the stream index in one pass over the capture."""
+    reassembler = TcpHttpReassembler()
+    streams = {}
+    tails = {}  # (stream, direction) -> last bytes seen, so matches can span segments
+    origins = {}  # stream -> raw (src, sport) of its first packet
+
+    for timestamp, linktype, frame, frame_offset in iter_pcap_records(pcap_file):
+        segment = parse_tcp_segment(linktype, frame)
+        if segment is None:
+            continue
+        src, sport, dst, dport, seq, flags, payload, payload_offset = segment
+        messages = list(reassembler.feed(timestamp, segment))
+        sid = str(reassembler.current_stream)
+
+        entry = streams.get(sid)
+        if entry is None:
+            origins[sid] = (src, sport)
+            entry = streams[sid] = {
+                "src": format_ip(src), "sport": sport, "dst": format_ip(dst), "dport": dport,
+                "first_time": timestamp, "packets": 0, "bytes": 0,
+                "payloads": [], "http": [], "matches": [],
+            }
+        entry["packets"] += 1
+        for message in messages:
+            if len(entry["http"]) < MAX_HTTP_LINES:
+                entry["http"].append(message["start_line"])
+        if not payload:
+            continue
+
+        # Direction 0 = from the stream's first-seen source, 1 = the reply side
+        direction = 0 if (src, sport) == origins[sid] else 1
+        entry["payloads"].append([frame_offset + payload_offset, len(payload), direction])
+        entry["bytes"] += len(payload)
+
+        tail_key = (sid, direction)
+        tail = tails.get(tail_key, b"")
+        window = tail + payload
+        for match in FLAG_LIKE.finditer(window):
+            if match.end() > len(tail):  # skip matches already found in the previous window
+                text = match.group().decode("ascii")
+                if text not in entry["matches"]:
+                    entry["matches"].append(text)
+        tails[tail_key] = window[-FLAG_LIKE_OVERLAP:]
+
+    return streams
+
+def load_stream_index(pcap_file):
+    """Return the cached stream index, rebuilding it if the pcap changed."""
+    stat = os.stat(pcap_file)
+    signature = {"version": STREAM_INDEX_VERSION, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    cached = _stream_index_memo.get(pcap_file)
+    if cached is not None and cached["signature"] == signature:
+        return cached
+
+    index_file = stream_index_path(pcap_file)
     try:
-        subprocess.run(["tshark", "-v"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-    except FileNotFoundError:
-        print("❌ ERROR: tshark is not installed or not in PATH.")
-        if not validation_mode:
-            pause()
-        sys.exit(1)
+        with open(index_file, "r", encoding="utf-8") as f:
+            index = json.load(f)
+        if index.get("signature") == signature:
+            _stream_index_memo[pcap_file] = index
+            return index
+    except (OSError, ValueError):
+        pass
+
+    if not validation_mode:
+        print("🗂️ Indexing TCP streams (one pass over the capture)...")
+    start = time.perf_counter()
+    index = {"signature": signature, "streams": build_stream_index(pcap_file)}
+    if not validation_mode:
+        print(f"✅ Indexed {len(index['streams'])} streams in {time.perf_counter() - start:.2f}s")
+
+    try:
+        tmp_file = index_file + ".tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(index, f, separators=(",", ":"))
+        os.replace(tmp_file, index_file)
+    except OSError as e:
+        print(f"⚠️ Could not cache stream index: {e}", file=sys.stderr)
+    _stream_index_memo[pcap_file] = index
+    return index
+
+def follow_stream_text(pcap_file, entry, max_bytes=64 * 1024):
+    """
+    Like `tshark -qz follow,tcp,ascii,<id>`: each payload with its direction,
+    read straight from the recorded file offsets (non-printables shown as '.').
+    """
+    lines = [
+        "===================================================================",
+        "Follow: tcp,ascii",
+        f"Node 0: {entry['src']}:{entry['sport']}",
+        f"Node 1: {entry['dst']}:{entry['dport']}",
+    ]
+    shown = 0
+    with open(pcap_file, "rb") as f:
+        for offset, length, direction in entry["payloads"]:
+            if shown >= max_bytes:
+                lines.append(f"... ({entry['bytes'] - shown} more bytes not shown)")
+                break
+            f.seek(offset)
+            data = f.read(min(length, max_bytes - shown))
+            shown += len(data)
+            text = "".join(chr(b) if 32 <= b < 127 or b in (9, 10) else "." for b in data.replace(b"\r\n", b"\n"))
+            indent = "\t" if direction else ""
+            lines.append(f"{indent}{length}")
+            lines.extend(indent + line for line in text.split("\n"))
+    lines.append("===================================================================")
+    return "\n".join(lines)
 
 def fast_validate_flag(pcap_file, expected_flag):
     """
-    Fast validation: search all payloads for the expected flag in one tshark run.
+    Fast validation: find the flag in the X-Flag headers with the built-in
+    parser (one streaming pass, no tshark). Falls back to a tshark payload
+    dump if the capture can't be parsed natively.
     """
+    try:
+        for message in search_pcap(pcap_file, "http.header contains X-Flag"):
+            if any(expected_flag in value for value in http_field_values(message, "http.header.x-flag")):
+                print(f"✅ Validation success: found flag {expected_flag} (stream {message['stream']})")
+                return True
+    except ValueError as e:
+        print(f"⚠️ Built-in parser could not read the capture ({e}); trying tshark...", file=sys.stderr)
+    else:
+        print(f"❌ Validation failed: flag {expected_flag} not found", file=sys.stderr)
+        return False
+
     try:
         cmd = (
             f"tshark -r {pcap_file} -Y 'tcp' -T fields -e tcp.payload | "
@@ -60,32 +592,19 @@ def fast_validate_flag(pcap_file, expected_flag):
 
 def extract_tcp_streams(pcap_file):
     """
-    Extract all unique TCP stream IDs from the capture file.
+    Extract all unique TCP stream IDs from the capture file (via the stream index).
     """
-    result = subprocess.run(
-        ["tshark", "-r", pcap_file, "-Y", "tcp", "-T", "fields", "-e", "tcp.stream"],
-        stdout=subprocess.PIPE,
-        text=True
-    )
-    streams = sorted(set(result.stdout.strip().splitlines()))
-    return streams
+    return [str(sid) for sid in sorted(load_stream_index(pcap_file)["streams"], key=int)]
 
 def scan_for_flags(pcap_file, streams):
     """
-    Scan streams for any flag-like patterns (for student interactive mode).
+    Report streams whose payload contains flag-like patterns (for student interactive mode).
+    Matches were collected while building the index, so this never re-reads the capture.
     """
+    index = load_stream_index(pcap_file)["streams"]
     flag_streams = []
-    pattern = r"[A-Z]{4}-[A-Z]{4}-[0-9]{4}|[A-Z]{4}-[0-9]{4}-[A-Z]{4}"
-
     for sid in streams:
-        cmd = f"tshark -r {pcap_file} -Y 'tcp.stream=={sid}' -T fields -e tcp.payload | xxd -r -p | strings"
-        grep = subprocess.run(
-            cmd, shell=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.DEVNULL,
-            text=True
-        )
-        if any(line for line in grep.stdout.splitlines() if pattern in line):
+        if index[sid]["matches"]:
             print(f"\n🔎 Found potential flag in Stream ID: {sid}")
             flag_streams.append(sid)
 
@@ -96,43 +615,24 @@ def show_stream_details(pcap_file, sid):
     """
     Display endpoints and payload for a single TCP stream.
     """
+    entry = load_stream_index(pcap_file)["streams"][sid]
     print(f"🔗 Stream ID: {sid}")
     print("-----------------------------------------")
-    # Show endpoints
-    result = subprocess.run(
-        ["tshark", "-r", pcap_file, "-Y", f"tcp.stream=={sid}", "-T", "fields",
-         "-e", "ip.src", "-e", "tcp.srcport", "-e", "ip.dst", "-e", "tcp.dstport"],
-        stdout=subprocess.PIPE,
-        text=True
-    )
-    first_line = result.stdout.strip().splitlines()[0]
-    fields = first_line.split()
-    if len(fields) >= 4:
-        print(f"📨 From: {fields[0]}:{fields[1]}\n📬 To: {fields[2]}:{fields[3]}")
+    print(f"📨 From: {entry['src']}:{entry['sport']}\n📬 To: {entry['dst']}:{entry['dport']}")
 
     print("\n📝 Payload Preview:")
-    subprocess.run(["tshark", "-r", pcap_file, "-qz", f"follow,tcp,ascii,{sid}"])
+    print(follow_stream_text(pcap_file, entry))
 
 def save_stream_summary(pcap_file, sid, out_file):
     """
     Save summary of a single TCP stream to a text file.
     """
+    entry = load_stream_index(pcap_file)["streams"][sid]
     with open(out_file, "a") as f:
         f.write(f"🔗 Stream ID: {sid}\n")
-        result = subprocess.run(
-            ["tshark", "-r", pcap_file, "-Y", f"tcp.stream=={sid}", "-T", "fields",
-             "-e", "ip.src", "-e", "tcp.srcport", "-e", "ip.dst", "-e", "tcp.dstport"],
-            stdout=subprocess.PIPE,
-            text=True
-        )
-        fields = result.stdout.strip().splitlines()[0].split()
-        if len(fields) >= 4:
-            f.write(f"📨 From: {fields[0]}:{fields[1]}\n📬 To: {fields[2]}:{fields[3]}\n")
+        f.write(f"📨 From: {entry['src']}:{entry['sport']}\n📬 To: {entry['dst']}:{entry['dport']}\n")
         f.write("Payload:\n")
-        subprocess.run(
-            ["tshark", "-r", pcap_file, "-qz", f"follow,tcp,ascii,{sid}"],
-            stdout=f
-        )
+        f.write(follow_stream_text(pcap_file, entry) + "\n")
         f.write("-----------------------------------------\n")
     print(f"✅ Saved to {os.path.basename(out_file)}")
     time.sleep(1)
@@ -142,8 +642,6 @@ def main():
     script_dir = os.path.abspath(os.path.dirname(__file__))
     os.chdir(script_dir)
 
-    check_tshark()
-
     pcap_file = os.path.join(script_dir, "traffic.pcap")
     if not os.path.isfile(pcap_file):
         print(f"❌ ERROR: {os.path.basename(pcap_file)} not found in this folder!")
@@ -175,9 +673,10 @@ def main():
     print("🎯 Goal: Investigate the traffic and identify the REAL flag.")
     print("⚠️ Four streams contain fake flags. Only ONE has the real flag (CCRI-AAAA-1111 format).\n")
     print("🔧 Under the hood:")
-    print("   1️⃣ We'll use 'tshark' to extract all TCP streams.")
+    print("   1️⃣ We'll index every TCP stream in one pass (a built-in Python pcap reader, like tshark).")
     print("   2️⃣ Then, we’ll scan them for flag-like patterns.")
-    print("   3️⃣ You’ll review candidate streams interactively.\n")
+    print("   3️⃣ You’ll review candidate streams interactively.")
+    print("   4️⃣ Or search HTTP headers with Wireshark-style filters (built-in Python pcap reader).\n")
 
     pause()
 
@@ -206,10 +705,11 @@ def main():
         print("📜 Flag Candidate Streams:")
         for idx, sid in enumerate(flag_streams, 1):
             print(f"{idx}. Stream ID: {sid}")
-        print(f"{len(flag_streams)+1}. Exit\n")
+        print(f"{len(flag_streams)+1}. 🔍 Filter search (e.g. http.header contains X-Flag)")
+        print(f"{len(flag_streams)+2}. Exit\n")
 
         try:
-            choice = int(input(f"Select a stream to view (1-{len(flag_streams)+1}): ").strip())
+            choice = int(input(f"Select an option (1-{len(flag_streams)+2}): ").strip())
         except ValueError:
             print("⚠️ Invalid input. Please enter a number.")
             time.sleep(1)
@@ -237,6 +737,8 @@ def main():
                 else:
                     print("⚠️ Invalid choice. Please select 1-3.")
         elif choice == len(flag_streams)+1:
+            filter_search_menu(pcap_file)
+        elif choice == len(flag_streams)+2:
             print("👋 Exiting tool. Review your findings carefully.")
             break
         else:
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+
+import mmap
+import re
+from contextlib import contextmanager
+
+FLAG_PATTERN = rb"CCRI-[A-Z]{4}-\d{4}"
+MIN_STRING_LENGTH = 4  # Same default as GNU strings
+
+
+class BinaryScanner:
+    """
+    Pure-Python `strings`/grep for binary files, shared by the binary helpers.
+
+    The file is memory-mapped and scanned with one compiled bytes regex, so
+    nothing is copied into Python except the matches themselves. That keeps
+    memory flat for multi-GB files and avoids the strings + temp file + re-read
+    round trip. Every result carries its byte offset for hexdump/xxd follow-up.
+    """
+    _STRING_PATTERNS = {}
+
+    @staticmethod
+    @contextmanager
+    def mapped(path):
+        """Read-only memory map of path (empty bytes for an empty file)."""
+        with open(path, "rb") as f:
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty files cannot be mapped
+                yield b""
+                return
+            try:
+                yield mm
+            finally:
+                mm.close()
+
+    @classmethod
+    def string_pattern(cls, min_length: int = MIN_STRING_LENGTH):
+        """Compiled regex for runs of printable ASCII (plus tab) like `strings -n min_length`."""
+        pattern = cls._STRING_PATTERNS.get(min_length)
+        if pattern is None:
+            pattern = cls._STRING_PATTERNS[min_length] = re.compile(rb"[\t\x20-\x7e]{%d,}" % min_length)
+        return pattern
+
+    @classmethod
+    def iter_strings(cls, path, min_length: int = MIN_STRING_LENGTH):
+        """Yield (offset, text) for every printable run in the file, in file order."""
+        pattern = cls.string_pattern(min_length)
+        with cls.mapped(path) as data:
+            for match in pattern.finditer(data):
+                yield match.start(), match.group().decode("ascii")
+
+    @classmethod
+    def iter_matches(cls, path, pattern=FLAG_PATTERN):
+        """Yield (offset, text) for every match of a bytes regex (str or compiled) in the file."""
+        if isinstance(pattern, str):
+            pattern = pattern.encode("ascii")
+        if isinstance(pattern, bytes):
+            pattern = re.compile(pattern)
+        with cls.mapped(path) as data:
+            for match in pattern.finditer(data):
+                yield match.start(), match.group().decode("latin-1")
+
+    @classmethod
+    def find_flags(cls, path, pattern=FLAG_PATTERN) -> list:
+        """All flag-shaped matches as a list of (offset, flag)."""
+        return list(cls.iter_matches(path, pattern))
+
+    @classmethod
+    def find_bytes(cls, path, needle: bytes) -> int:
+        """Offset of the first occurrence of needle, or -1."""
+        with cls.mapped(path) as data:
+            return data.find(needle)
+
+    @classmethod
+    def write_strings(cls, path, output_path, min_length: int = MIN_STRING_LENGTH) -> int:
+        """Write one printable run per line (like `strings path > output_path`). Returns the count."""
+        count = 0
+        with open(output_path, "w", encoding="ascii") as out:
+            for _, text in cls.iter_strings(path, min_length):
+                out.write(text + "\n")
+                count += 1
+        return count
+
+    @classmethod
+    def hexdump(cls, path, offset: int, length: int = 48, width: int = 16) -> str:
+        """`xxd`-style dump of length bytes around offset (aligned to width)."""
+        start = max(0, offset - offset % width)
+        with cls.mapped(path) as data:
+            chunk = data[start:offset + length]
+        lines = []
+        for row in range(0, len(chunk), width):
+            piece = chunk[row:row + width]
+            hex_part = " ".join(piece[i:i + 2].hex() for i in range(0, len(piece), 2))
+            text = "".join(chr(b) if 0x20 <= b < 0x7F else "." for b in piece)
+            lines.append(f"{start + row:08x}: {hex_part:<{width * 2 + width // 2 - 1}}  {text}")
+        return "\n".join(lines)
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+
+import re
+import string
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # Translate-table kernels are used instead
+
+# English letter frequencies (a-z), used to score candidate plaintexts
+ENGLISH_FREQ = [
+    0.08167, 0.01492, 0.02782, 0.04253, 0.12702, 0.02228, 0.02015, 0.06094, 0.06966,
+    0.00153, 0.00772, 0.04025, 0.02406, 0.06749, 0.07507, 0.01929, 0.00095, 0.05987,
+    0.06327, 0.09056, 0.02758, 0.00978, 0.02360, 0.00150, 0.01974, 0.00074,
+]
+
+STREAM_CHUNK_SIZE = 1 << 20  # 1 MB per read when transforming files
+
+
+class ShiftCipher:
+    """
+    Monoalphabetic ciphers over A-Z/a-z: ROT-N, Caesar and Atbash.
+
+    Every transform is a single str.translate (or bytes.translate for files)
+    with a cached table, so whole messages are converted in one C-level pass.
+    Only ASCII letters change, exactly like codecs' rot_13.
+    """
+    _STR_TABLES = {}
+    _BYTES_TABLES = {}
+
+    @staticmethod
+    def _alphabets(shift: int = None):
+        """Source and target alphabets for a ROT-N shift, or Atbash when shift is None."""
+        lower, upper = string.ascii_lowercase, string.ascii_uppercase
+        if shift is None:
+            return lower + upper, lower[::-1] + upper[::-1]
+        shift %= 26
+        return lower + upper, lower[shift:] + lower[:shift] + upper[shift:] + upper[:shift]
+
+    @classmethod
+    def table(cls, shift: int = None) -> dict:
+        """Cached str.maketrans table for ROT-shift (Atbash when shift is None)."""
+        key = None if shift is None else shift % 26
+        table = cls._STR_TABLES.get(key)
+        if table is None:
+            table = cls._STR_TABLES[key] = str.maketrans(*cls._alphabets(key))
+        return table
+
+    @classmethod
+    def bytes_table(cls, shift: int = None) -> bytes:
+        """Cached bytes.maketrans table for ROT-shift (Atbash when shift is None)."""
+        key = None if shift is None else shift % 26
+        table = cls._BYTES_TABLES.get(key)
+        if table is None:
+            source, target = cls._alphabets(key)
+            table = cls._BYTES_TABLES[key] = bytes.maketrans(source.encode(), target.encode())
+        return table
+
+    @classmethod
+    def rot(cls, text: str, shift: int = 13) -> str:
+        """Rotate every letter forward by shift places (ROT13 by default)."""
+        return text.translate(cls.table(shift))
+
+    @classmethod
+    def caesar_encrypt(cls, text: str, shift: int = 3) -> str:
+        return cls.rot(text, shift)
+
+    @classmethod
+    def caesar_decrypt(cls, text: str, shift: int = 3) -> str:
+        return cls.rot(text, -shift)
+
+    @classmethod
+    def atbash(cls, text: str) -> str:
+        """Mirror the alphabet (A<->Z, B<->Y, ...). Its own inverse."""
+        return text.translate(cls.table(None))
+
+    @classmethod
+    def transform_file(cls, source, destination, shift: int = 13, chunk_size: int = STREAM_CHUNK_SIZE) -> int:
+        """
+        Stream source through ROT-shift (Atbash when shift is None) into destination.
+        Works on raw bytes, so any file size or encoding is handled in constant
+        memory; non-letter bytes (including UTF-8 sequences) pass through unchanged.
+        Returns the number of bytes written.
+        """
+        table = cls.bytes_table(shift)
+        written = 0
+        with open(source, "rb") as f_in, open(destination, "wb") as f_out:
+            while True:
+                chunk = f_in.read(chunk_size)
+                if not chunk:
+                    break
+                written += f_out.write(chunk.translate(table))
+        return written
+
+    @staticmethod
+    def letter_counts(text: str) -> list:
+        """Counts of a-z in text, ignoring case."""
+        lowered = text.lower()
+        return [lowered.count(letter) for letter in string.ascii_lowercase]
+
+    @staticmethod
+    def chi_squared(counts: list) -> float:
+        """Chi-squared distance between letter counts and English (lower is more English)."""
+        total = sum(counts)
+        if not total:
+            return float("inf")
+        return sum(
+            (count - total * freq) ** 2 / (total * freq)
+            for count, freq in zip(counts, ENGLISH_FREQ)
+        )
+
+    @classmethod
+    def brute_force(cls, text: str, shifts=range(1, 26)) -> list:
+        """
+        Score every ROT shift against English letter frequencies.
+        Letters are counted once; each shift only rotates the 26 counts, so
+        scoring all 25 shifts costs one pass over the text. Returns a list of
+        (shift, chi_squared) sorted best first; decode the winner with rot().
+        """
+        counts = cls.letter_counts(text)
+        results = []
+        for shift in shifts:
+            # Plain letter i comes from cipher letter (i - shift) after ROT-shift
+            rotated = [counts[(i - shift) % 26] for i in range(26)]
+            results.append((shift % 26, cls.chi_squared(rotated)))
+        results.sort(key=lambda item: item[1])
+        return results
+
+
+class VigenereCipher:
+    """
+    Bulk Vigenère encrypt/decrypt shared by the generator and the helper script.
+
+    Semantics match the original per-character loop exactly: only letters
+    (str.isalpha) are shifted, case is preserved, and the key only advances
+    on letters. ASCII-letter text runs through vectorized kernels (NumPy
+    when installed, bytes.translate otherwise); text containing non-ASCII
+    letters falls back to the reference loop so results never change.
+    """
+    NUMPY_MIN_SIZE = 4096  # Below this the translate kernel is faster
+    _LETTER_RUNS = re.compile(rb"[A-Za-z]+")
+    _NON_LETTERS = bytes(b for b in range(256) if not (65 <= b <= 90 or 97 <= b <= 122))
+    _SHIFT_TABLES = {}
+
+    @classmethod
+    def encrypt(cls, text: str, key: str) -> str:
+        return cls.transform(text, key, decrypt=False)
+
+    @classmethod
+    def decrypt(cls, text: str, key: str) -> str:
+        return cls.transform(text, key, decrypt=True)
+
+    @classmethod
+    def transform(cls, text: str, key: str, decrypt: bool = False) -> str:
+        """Shift every letter of text by the matching key letter (negated when decrypting)."""
+        sign = -1 if decrypt else 1
+        shifts = [(sign * (ord(k) - ord('a'))) % 26 for k in key.lower()]
+        if not shifts:
+            raise ValueError("Vigenère key must not be empty")
+
+        if not text.isascii() and any(c.isalpha() for c in text if not c.isascii()):
+            return cls.reference_transform(text, key, decrypt)
+
+        data = text.encode("utf-8")
+        if np is not None and len(data) >= cls.NUMPY_MIN_SIZE:
+            out = cls._numpy_kernel(data, shifts)
+        else:
+            out = cls._translate_kernel(data, shifts)
+        return out.decode("utf-8")
+
+    @staticmethod
+    def reference_transform(text: str, key: str, decrypt: bool = False) -> str:
+        """Original character-by-character algorithm (used for non-ASCII letters)."""
+        result = []
+        key = key.lower()
+        key_len = len(key)
+        key_indices = [ord(k) - ord('a') for k in key]
+        key_pos = 0
+        sign = -1 if decrypt else 1
+
+        for char in text:
+            if char.isalpha():
+                offset = ord('A') if char.isupper() else ord('a')
+                pi = ord(char) - offset
+                ki = key_indices[key_pos % key_len]
+                result.append(chr((pi + sign * ki) % 26 + offset))
+                key_pos += 1
+            else:
+                result.append(char)
+        return ''.join(result)
+
+    @classmethod
+    def _shift_table(cls, shift: int) -> bytes:
+        """256-byte translate table rotating A-Z and a-z by shift."""
+        table = cls._SHIFT_TABLES.get(shift)
+        if table is None:
+            table = bytearray(range(256))
+            for i in range(26):
+                table[65 + i] = 65 + (i + shift) % 26
+                table[97 + i] = 97 + (i + shift) % 26
+            table = cls._SHIFT_TABLES[shift] = bytes(table)
+        return table
+
+    @classmethod
+    def _translate_kernel(cls, data: bytes, shifts: list) -> bytes:
+        """Pure-Python kernel: one bytes.translate per key position, then scatter back."""
+        letters = data.translate(None, cls._NON_LETTERS)
+        shifted = bytearray(len(letters))
+        key_len = len(shifts)
+        for i, shift in enumerate(shifts):
+            shifted[i::key_len] = letters[i::key_len].translate(cls._shift_table(shift))
+
+        # Scatter the shifted letters back over each run of letters in the original
+        out = bytearray(data)
+        pos = 0
+        for start, end in map(re.Match.span, cls._LETTER_RUNS.finditer(data)):
+            length = end - start
+            out[start:end] = shifted[pos:pos + length]
+            pos += length
+        return bytes(out)
+
+    @staticmethod
+    def _numpy_kernel(data: bytes, shifts: list) -> bytes:
+        """NumPy kernel: shift all letters at once using their letter index mod key length."""
+        arr = np.frombuffer(data, dtype=np.uint8)
+        upper = (arr >= 65) & (arr <= 90)
+        lower = (arr >= 97) & (arr <= 122)
+        idx = np.flatnonzero(upper | lower)
+        base = np.where(upper[idx], 65, 97).astype(np.int16)
+        key = np.asarray(shifts, dtype=np.int16)
+        key_pos = np.arange(idx.size) % key.size
+        out = arr.copy()
+        out[idx] = ((arr[idx] - base + key[key_pos]) % 26 + base).astype(np.uint8)
+        return out.tobytes()
@@ -1,6 +1,10 @@
+import base64
+import os
 import random
 import string
 import re
+import sys
+from array import array
 
 class FlagUtils:
     """
@@ -41,4 +45,67 @@ class FlagUtils:
         """
         Validate flag format: CCRI-XXXX-1234
         """
-        return bool(re.match(r"^CCRI-[A-Z]{4}-\d{4}$", flag))
\ No newline at end of file
+        return bool(re.match(r"^CCRI-[A-Z]{4}-\d{4}$", flag))
+
+    @staticmethod
+    def ints_from_env(name: str, min_parts: int = 1, max_parts: int = 1,
+                      minimum: int = 1, maximum: int = None, example: str = None):
+        """
+        Read generator scale settings from an environment variable: one integer,
+        or min_parts to max_parts integers joined by "x" (e.g. "4x6x8").
+        Returns a list of ints, or None when unset. Invalid or out-of-range
+        values print a ⚠️ warning and are ignored (None).
+        """
+        value = os.environ.get(name, "").strip().lower()
+        if not value:
+            return None
+        try:
+            numbers = [int(part) for part in value.split("x")]
+            if not min_parts <= len(numbers) <= max_parts:
+                raise ValueError
+            if any(n < minimum or (maximum is not None and n > maximum) for n in numbers):
+                raise ValueError
+            return numbers
+        except ValueError:
+            limits = f"{minimum} to {maximum}" if maximum is not None else f">= {minimum}"
+            expected = f"a number {limits}" if max_parts == 1 else f"numbers {limits}, e.g. {example}"
+            print(f"⚠️ Ignoring invalid {name}={value!r} (expected {expected})", file=sys.stderr)
+            return None
+
+    @classmethod
+    def int_from_env(cls, name: str, minimum: int = 1, maximum: int = None):
+        """Single-integer form of ints_from_env(): an int, or None when unset or invalid."""
+        numbers = cls.ints_from_env(name, minimum=minimum, maximum=maximum)
+        return numbers[0] if numbers else None
+
+
+# === Shared I/O helpers (generators and challenge helpers) ===
+
+def pack_array(arr: array) -> str:
+    """Typed array -> base64 text for JSON indexes (always little-endian on disk)."""
+    if sys.byteorder != "little":
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return base64.b64encode(arr.tobytes()).decode("ascii")
+
+
+def unpack_array(data: str, typecode: str = "I") -> array:
+    """Inverse of pack_array()."""
+    arr = array(typecode)
+    arr.frombytes(base64.b64decode(data))
+    if sys.byteorder != "little":
+        arr.byteswap()
+    return arr
+
+
+def write_files(items) -> int:
+    """Write (path, bytes) pairs with raw os-level calls. Returns bytes written."""
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+    total = 0
+    for path, data in items:
+        fd = os.open(path, flags, 0o644)
+        try:
+            total += os.write(fd, data)
+        finally:
+            os.close(fd)
+    return total
\ No newline at end of file
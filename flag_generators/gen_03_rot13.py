@@ -2,10 +2,10 @@
 
 from pathlib import Path
 import random
-import codecs
 import sys
 import time
 from flag_generators.flag_helpers import FlagUtils
+from flag_generators.ciphers import ShiftCipher
 
 
 class ROT13FlagGenerator:
@@ -33,8 +33,8 @@ class ROT13FlagGenerator:
 
     @staticmethod
     def rot13(text: str) -> str:
-        """Apply ROT13 cipher to the given text."""
-        return codecs.encode(text, "rot_13")
+        """Apply ROT13 cipher to the given text (one str.translate pass)."""
+        return ShiftCipher.rot(text, 13)
 
     @staticmethod
     def animate_rot13_line_by_line(text_lines, delay=0.05):
@@ -43,12 +43,7 @@ class ROT13FlagGenerator:
         for line in text_lines:
             original = line.rstrip("\n")
             for shift in range(1, 14):  # ROT13 is 13 shifts
-                rotated = "".join(
-                    chr(((ord(c) - ord('A') + 1) % 26 + ord('A')) if c.isupper()
-                        else chr(((ord(c) - ord('a') + 1) % 26 + ord('a')))
-                        if c.islower() else c)
-                    for c in original
-                )
+                rotated = ShiftCipher.rot(original, 1)
                 sys.stdout.write(f"\r{rotated}   ")  # Overwrite line
                 sys.stdout.flush()
                 original = rotated  # Update for next shift
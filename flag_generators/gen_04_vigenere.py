@@ -4,6 +4,7 @@ from pathlib import Path
 import random
 import sys
 from flag_generators.flag_helpers import FlagUtils
+from flag_generators.ciphers import VigenereCipher
 
 
 class VigenereFlagGenerator:
@@ -34,25 +35,11 @@ class VigenereFlagGenerator:
     def vigenere_encrypt(cls, plaintext: str, key: str = None) -> str:
         """
         Encrypt plaintext using Vigenère cipher with the given key.
-        Mirrors decryption logic to ensure perfect round-trip.
+        Mirrors decryption logic to ensure perfect round-trip
+        (shared VigenereCipher kernels, also used by break_vigenere.py).
         """
         key = (key or cls.VIGENERE_KEY).lower()  # Force lowercase
-        result = []
-        key_len = len(key)
-        key_indices = [ord(k) - ord('a') for k in key]
-        key_pos = 0
-
-        for char in plaintext:
-            if char.isalpha():
-                offset = ord('A') if char.isupper() else ord('a')
-                pi = ord(char) - offset
-                ki = key_indices[key_pos % key_len]
-                encrypted = chr((pi + ki) % 26 + offset)
-                result.append(encrypted)
-                key_pos += 1
-            else:
-                result.append(char)  # Leave non-alpha chars unchanged
-        return ''.join(result)
+        return VigenereCipher.encrypt(plaintext, key)
 
     def safe_cleanup(self, challenge_folder: Path):
         """
@@ -1,10 +1,13 @@
 #!/usr/bin/env python3
 
 from pathlib import Path
+import os
 import random
 import shutil
 import sys
-from flag_generators.flag_helpers import FlagUtils
+from flag_generators.flag_helpers import FlagUtils, write_files
+
+TREE_ENV = "CCRI_HIDDEN_TREE"  # e.g. "4x6x8" = depth x breadth x files per folder
 
 
 class HiddenFlagGenerator:
@@ -12,6 +15,12 @@ class HiddenFlagGenerator:
     Generator for the Hidden Flag challenge.
     Builds a fake folder structure and hides real + fake flags in random files.
     Stores unlock metadata for validation workflow.
+
+    By default the classic 10-file tree is built. With depth/breadth (or
+    CCRI_HIDDEN_TREE=DxBxF) a large haystack is synthesized instead: breadth
+    subfolders per level down to depth, files_per_dir files in each, plus
+    symlink traps. Junk bodies come from pre-rendered pools and are streamed
+    straight to disk, so tens of thousands of files take seconds.
     """
 
     FOLDERS_AND_FILES = {
@@ -77,9 +86,26 @@ class HiddenFlagGenerator:
         ],
     }
 
-    def __init__(self, project_root: Path = None):
+    # Extra names used when synthesizing large trees
+    TREE_DIR_NAMES = [
+        "archive", "cache", "conf", "home", "lib", "mail", "old", "opt",
+        "run", "share", "spool", "srv", "tmp", "var", "www", "etc",
+    ]
+    JUNK_POOL_SIZE = 32        # pre-rendered bodies per file type
+    SYMLINK_TRAP_RATE = 0.05   # fraction of folders that get a symlink trap
+    MAX_TREE_FILES = 500_000
+
+    def __init__(self, project_root: Path = None, depth: int = None, breadth: int = None, files_per_dir: int = 8):
         self.project_root = project_root or self.find_project_root()
         self.metadata = {}  # For unlock info
+        if depth is None:
+            shape = FlagUtils.ints_from_env(TREE_ENV, 2, 3, example="4x6 or 4x6x8")
+            if shape:
+                depth, breadth = shape[:2]
+                files_per_dir = shape[2] if len(shape) == 3 else files_per_dir
+        self.depth = depth
+        self.breadth = breadth or 4
+        self.files_per_dir = files_per_dir
 
     @staticmethod
     def find_project_root() -> Path:
@@ -170,10 +196,137 @@ class HiddenFlagGenerator:
             "hint": "Use grep -R or find/strings to locate the flag in junk/"
         }
 
+    def build_junk_pools(self) -> dict:
+        """Pre-render JUNK_POOL_SIZE flagless bodies per file type, as bytes ready to write."""
+        return {
+            file_name: [
+                (self.generate_junk_for_file(file_name) + "\n").encode("utf-8")
+                for _ in range(self.JUNK_POOL_SIZE)
+            ]
+            for file_name in self.FILE_BASED_JUNK
+        }
+
+    def plan_directories(self, base_dir: Path) -> list:
+        """Every folder of the large tree, parents before children (breadth-first)."""
+        names = list(self.FOLDERS_AND_FILES) + self.TREE_DIR_NAMES
+        directories = []
+        level = [str(base_dir)]
+        for _ in range(self.depth):
+            next_level = []
+            for parent in level:
+                for name in random.sample(names, min(self.breadth, len(names))):
+                    if random.random() < 0.3:
+                        name = "." + name  # Hidden folders too
+                    next_level.append(os.path.join(parent, name))
+            directories.extend(next_level)
+            level = next_level
+        return directories
+
+    def plan_files(self, directories: list) -> list:
+        """(path, junk type) for every file; names are junk types, numbered when repeated."""
+        file_types = list(self.FILE_BASED_JUNK)
+        taken = set(directories)  # Hidden folders like .archive share names with junk files
+        files = []
+        for directory in directories:
+            chosen = random.choices(file_types, k=self.files_per_dir)
+            seen = {}
+            for file_type in chosen:
+                path = os.path.join(directory, file_type)
+                while path in taken:
+                    seen[file_type] = seen.get(file_type, 0) + 1
+                    path = os.path.join(directory, f"{file_type}.{seen[file_type]}")
+                taken.add(path)
+                files.append((path, file_type))
+        return files
+
+    def add_symlink_traps(self, base_dir: Path, directories: list) -> int:
+        """Loops back up the tree, dangling links and links to other files (grep -R / find -L bait)."""
+        traps = 0
+        for directory in directories:
+            if random.random() >= self.SYMLINK_TRAP_RATE:
+                continue
+            rel_depth = len(Path(directory).relative_to(base_dir).parts)
+            kind = random.choice(("loop", "dangling", "alias"))
+            if kind == "loop":
+                target, name = os.path.join(*[".."] * random.randint(1, rel_depth)), ".mirror"
+            elif kind == "dangling":
+                target, name = "/var/tmp/.ccri_missing/" + random.choice(list(self.FILE_BASED_JUNK)), ".lnk"
+            else:
+                target, name = os.path.join("..", random.choice(list(self.FILE_BASED_JUNK))), ".alias"
+            try:
+                os.symlink(target, os.path.join(directory, name))
+                traps += 1
+            except OSError:
+                continue
+        return traps
+
+    def create_large_tree(self, base_dir: Path, real_flag: str, fake_flags: list):
+        """
+        Synthesize a depth x breadth tree with files_per_dir files per folder,
+        hiding the real and fake flags in random files.
+        """
+        directories = self.plan_directories(base_dir)
+        file_count = len(directories) * self.files_per_dir
+        flag_count = 1 + len(fake_flags)
+        if file_count > self.MAX_TREE_FILES:
+            print(f"❌ Tree would contain {file_count} files (limit {self.MAX_TREE_FILES}). "
+                  f"Reduce depth/breadth.", file=sys.stderr)
+            sys.exit(1)
+        if file_count < flag_count:
+            print(f"❌ Tree would contain only {file_count} files, too few to hide {flag_count} flags. "
+                  f"Increase depth/breadth/files per folder.", file=sys.stderr)
+            sys.exit(1)
+
+        self.safe_cleanup(base_dir)
+
+        try:
+            os.makedirs(base_dir, exist_ok=True)
+            for directory in directories:
+                # One plain os.mkdir per folder: the plan is parents-first, so
+                # no makedirs-style existence checks are needed
+                os.mkdir(directory)
+        except OSError as e:
+            print(f"❌ Failed to prepare folder structure: {e}", file=sys.stderr)
+            sys.exit(1)
+
+        files = self.plan_files(directories)
+        flag_slots = random.sample(range(len(files)), flag_count)
+        flag_for_slot = dict(zip(flag_slots, [real_flag] + fake_flags))
+        pools = self.build_junk_pools()
+        pick = random.choice
+
+        def contents():
+            for i, (path, file_type) in enumerate(files):
+                flag = flag_for_slot.get(i)
+                if flag:
+                    yield path, (self.generate_junk_for_file(file_type, flag) + "\n").encode("utf-8")
+                else:
+                    yield path, pick(pools[file_type])
+
+        print(f"🎭 Fake flags: {', '.join(fake_flags)}")
+        try:
+            written = write_files(contents())
+        except OSError as e:
+            print(f"❌ Failed to write junk tree: {e}", file=sys.stderr)
+            sys.exit(1)
+        traps = self.add_symlink_traps(base_dir, directories)
+
+        real_flag_file = Path(files[flag_slots[0]][0])
+        print(f"✅ Real flag hidden in: {real_flag_file.relative_to(base_dir)}")
+        print(f"📁 Large tree created: {len(directories)} folders, {len(files)} files "
+              f"({written / 1e6:.1f} MB), {traps} symlink traps.")
+
+        self.metadata = {
+            "real_flag": real_flag,
+            "challenge_folder": str(base_dir.relative_to(self.project_root)),
+            "unlock_method": "Search recursively for the flag in hidden files",
+            "hint": "Use grep -r (not -R: watch for symlink loops) or find/strings to locate the flag in junk/"
+        }
+
     def generate_flag(self, challenge_folder: Path) -> str:
         """
-        Generate the fixed folder structure with 1 real + 4 fake flags,
-        and return the real flag.
+        Generate the folder structure (fixed, or large when depth is set)
+        with 1 real + 4 fake flags, and return the real flag.
         """
         real_flag = FlagUtils.generate_real_flag()
         fake_flags = [FlagUtils.generate_fake_flag() for _ in range(4)]
@@ -181,5 +334,8 @@ class HiddenFlagGenerator:
         while real_flag in fake_flags:
             real_flag = FlagUtils.generate_real_flag()
 
-        self.create_folder_structure(challenge_folder / "junk", real_flag, fake_flags)
+        if self.depth:
+            self.create_large_tree(challenge_folder / "junk", real_flag, fake_flags)
+        else:
+            self.create_folder_structure(challenge_folder / "junk", real_flag, fake_flags)
         return real_flag
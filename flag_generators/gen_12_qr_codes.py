@@ -2,9 +2,9 @@
 
 from pathlib import Path
 import random
-import subprocess
 import sys
 from flag_generators.flag_helpers import FlagUtils
+from flag_generators.qr_encoder import QREncoder
 
 
 class QRCodeFlagGenerator:
@@ -12,6 +12,7 @@ class QRCodeFlagGenerator:
     Generator for the QR Codes challenge.
     Produces 5 QR code PNGs in the challenge folder with 1 real flag and 4 decoys.
     Stores unlock metadata for validation workflow.
+    QR images are encoded in-process (QREncoder), so no qrencode binary is needed.
     """
 
     def __init__(self, project_root: Path = None):
@@ -31,21 +32,25 @@ class QRCodeFlagGenerator:
         sys.exit(1)
 
     @staticmethod
-    def check_qrencode_installed():
-        """Verify qrencode is installed, or exit with error."""
-        result = subprocess.run(["which", "qrencode"], capture_output=True)
-        if result.returncode != 0:
-            print("❌ ERROR: qrencode is not installed.")
-            print("👉 To fix, run: sudo apt install qrencode")
+    def make_encoder(payloads: list, ecc: str = "M") -> QREncoder:
+        """One encoder sized for the longest payload, shared by the whole batch."""
+        longest = max(len(text.encode("utf-8")) for text in payloads)
+        try:
+            return QREncoder(version=QREncoder.fitting_version(longest, ecc), ecc=ecc)
+        except ValueError as e:
+            print(f"❌ Failed to generate QR code: {e}", file=sys.stderr)
             sys.exit(1)
-        else:
-            print("✅ qrencode is installed.")
 
     def create_qr_code(self, output_file: Path, text: str):
-        """Use qrencode to generate a QR code PNG."""
+        """Encode text as a QR code PNG."""
+        self.create_qr_codes([(output_file, text)])
+
+    def create_qr_codes(self, items: list, encoder: QREncoder = None) -> int:
+        """Encode a batch of (output_file, text) pairs with one shared encoder."""
+        encoder = encoder or self.make_encoder([text for _, text in items])
         try:
-            subprocess.run(["qrencode", "-o", str(output_file), text], check=True)
-        except subprocess.CalledProcessError as e:
+            return encoder.write_many(items)
+        except (OSError, ValueError) as e:
             print(f"❌ Failed to generate QR code: {e}", file=sys.stderr)
             sys.exit(1)
 
@@ -75,9 +80,10 @@ class QRCodeFlagGenerator:
         print(f"🎭 Fake flags: {', '.join(fake_flags)}")
         print(f"🎯 Generating QR codes in: {challenge_folder.relative_to(self.project_root)}")
 
-        for i, flag in enumerate(all_flags, start=1):
-            qr_file = challenge_folder / f"qr_{i:02}.png"
-            self.create_qr_code(qr_file, flag)
+        items = [(challenge_folder / f"qr_{i:02}.png", flag) for i, flag in enumerate(all_flags, start=1)]
+        self.create_qr_codes(items)
+
+        for qr_file, flag in items:
             if flag == real_flag:
                 print(f"✅ {qr_file.name} (REAL flag)")
             else:
@@ -96,8 +102,6 @@ class QRCodeFlagGenerator:
         Generate QR code PNGs with 1 real and 4 fake flags.
         Return the real flag.
         """
-        self.check_qrencode_installed()
-
         real_flag = FlagUtils.generate_real_flag()
         fake_flags = list({FlagUtils.generate_fake_flag() for _ in range(4)})
 
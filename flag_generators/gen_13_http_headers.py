@@ -4,12 +4,20 @@ from pathlib import Path
 import random
 import sys
 from flag_generators.flag_helpers import FlagUtils
+from flag_generators.http_corpus import HttpCorpus
+
+RESPONSE_COUNT_ENV = "CCRI_HTTP_RESPONSES"  # e.g. 5000 for corpus mode
+CORPUS_FILE = "responses.corpus"
 
 
 class HTTPHeaderFlagGenerator:
     """
     Generator for the HTTP Headers challenge.
     Produces 5 response_*.txt files in the challenge folder with 1 real flag and 4 decoys.
+
+    Corpus mode (response_count, or CCRI_HTTP_RESPONSES) instead streams
+    thousands of responses into a single indexed archive, responses.corpus,
+    with the flagged responses scattered among unflagged traffic.
     """
 
     SERVERS = [
@@ -79,9 +87,13 @@ This endpoint returns plain text responses."""
         "<!-- To-do: Update security headers on staging -->"
     ]
 
-    def __init__(self, project_root: Path = None):
+    def __init__(self, project_root: Path = None, response_count: int = None):
         self.project_root = project_root or self.find_project_root()
         self.metadata = {}  # For unlock info
+        if response_count is None:
+            # Corpus size, or None for the classic 5 files
+            response_count = FlagUtils.int_from_env(RESPONSE_COUNT_ENV, minimum=5)
+        self.response_count = response_count
 
     @staticmethod
     def find_project_root() -> Path:
@@ -95,9 +107,10 @@ This endpoint returns plain text responses."""
         print("❌ ERROR: Could not find .ccri_ctf_root marker. Are you inside the CTF folder?", file=sys.stderr)
         sys.exit(1)
 
-    def generate_http_response(self, flag: str) -> str:
+    def generate_http_response(self, flag: str = None) -> str:
         """
-        Generate a realistic HTTP response string with flag in X-Flag header.
+        Generate a realistic HTTP response string with flag in X-Flag header
+        (no X-Flag header when flag is None).
         """
         headers = [
             "HTTP/1.1 200 OK",
@@ -106,10 +119,11 @@ This endpoint returns plain text responses."""
             f"Content-Type: {random.choice(self.CONTENT_TYPES)}",
             f"Cache-Control: {random.choice(self.CACHE_CONTROLS)}",
             f"X-Powered-By: {random.choice(self.POWERED_BY)}",
-            f"X-Flag: {flag}",
             "X-Frame-Options: SAMEORIGIN",
             "X-Content-Type-Options: nosniff"
         ]
+        if flag is not None:
+            headers.insert(6, f"X-Flag: {flag}")
 
         if random.random() < 0.6:
             session_id = ''.join(random.choices("abcdefghijklmnopqrstuvwxyz0123456789", k=12))
@@ -124,10 +138,11 @@ This endpoint returns plain text responses."""
 
     def clean_old_responses(self, challenge_folder: Path):
         """
-        Remove only old response_*.txt files from challenge folder.
+        Remove only old response_*.txt files (and any corpus archive) from challenge folder.
         """
         if challenge_folder.exists():
-            for old_file in challenge_folder.glob("response_*.txt"):
+            old_files = list(challenge_folder.glob("response_*.txt")) + list(challenge_folder.glob(CORPUS_FILE))
+            for old_file in old_files:
                 try:
                     old_file.unlink()
                     print(f"🗑️ Removed old file: {old_file.name}")
@@ -173,6 +188,42 @@ This endpoint returns plain text responses."""
             print(f"❌ Failed during HTTP response embedding: {e}", file=sys.stderr)
             sys.exit(1)
 
+    def embed_http_corpus(self, challenge_folder: Path, real_flag: str, fake_flags: list):
+        """
+        Stream response_count responses into one indexed archive; 1 real and
+        several fake flags ride in X-Flag headers of randomly chosen responses.
+        """
+        try:
+            challenge_folder.mkdir(parents=True, exist_ok=True)
+            self.clean_old_responses(challenge_folder)
+            corpus_file = challenge_folder / CORPUS_FILE
+
+            all_flags = fake_flags + [real_flag]
+            slots = dict(zip(random.sample(range(self.response_count), len(all_flags)), all_flags))
+            width = len(str(self.response_count))
+
+            def responses():
+                for i in range(self.response_count):
+                    yield f"response_{i + 1:0{width}}", self.generate_http_response(slots.get(i))
+
+            print(f"🎭 Fake flags: {', '.join(fake_flags)}")
+            corpus = HttpCorpus.write(corpus_file, responses())
+
+            real_slot = next(i for i, flag in slots.items() if flag == real_flag)
+            print(f"✅ {corpus_file.name}: {len(corpus)} responses, REAL flag in {corpus.names[real_slot]}")
+
+            # Record unlock metadata
+            self.metadata = {
+                "real_flag": real_flag,
+                "challenge_file": str(corpus_file.relative_to(self.project_root)),
+                "unlock_method": "Search the X-Flag headers across the response corpus for the real flag",
+                "hint": "Look for custom HTTP headers like X-Flag in the responses"
+            }
+
+        except Exception as e:
+            print(f"❌ Failed during HTTP corpus generation: {e}", file=sys.stderr)
+            sys.exit(1)
+
     def generate_flag(self, challenge_folder: Path) -> str:
         """
         Generate HTTP response files with 1 real and 4 fake flags.
@@ -184,5 +235,8 @@ This endpoint returns plain text responses."""
         while real_flag in fake_flags:
             real_flag = FlagUtils.generate_real_flag()
 
-        self.embed_http_responses(challenge_folder, real_flag, fake_flags)
+        if self.response_count:
+            self.embed_http_corpus(challenge_folder, real_flag, fake_flags)
+        else:
+            self.embed_http_responses(challenge_folder, real_flag, fake_flags)
         return real_flag
@@ -1,9 +1,69 @@
 #!/usr/bin/env python3
 
 from pathlib import Path
+from string import Formatter
 import random
 import sys
-from flag_generators.flag_helpers import FlagUtils
+from flag_generators.flag_helpers import FlagUtils, write_files
+
+SWEEP_ENV = "CCRI_SUBDOMAINS"  # e.g. 5000 for the large sweep variant
+
+
+class PageTemplate:
+    """
+    A str.format-style template parsed once into literal chunks and field
+    slots, so rendering thousands of pages is a list fill and one join
+    instead of re-parsing the template text for every page.
+    """
+
+    def __init__(self, source: str):
+        self.chunks = []
+        self.slots = []  # (chunk index, field name)
+        for literal, field, spec, conversion in Formatter().parse(source):
+            if literal:
+                self.chunks.append(literal)
+            if field is not None:
+                if spec or conversion:
+                    raise ValueError(f"Unsupported format spec in template field {field!r}")
+                self.slots.append((len(self.chunks), field))
+                self.chunks.append("")
+
+    def render(self, values: dict) -> str:
+        chunks = self.chunks[:]
+        for index, field in self.slots:
+            chunks[index] = values[field]
+        return "".join(chunks)
+
+
+PAGE_TEMPLATE = PageTemplate("""<!DOCTYPE html>
+<html lang=\"en\">
+<head>
+  <meta charset=\"UTF-8\">
+  <title>{title}</title>
+</head>
+<body>
+  <header>
+    <h1>{header_title}</h1>
+    <p>{alt_desc}</p>
+  </header>
+
+  <main>
+    <section>
+      <h2>Recent Activity</h2>
+      {flag_block}
+    </section>
+
+    <section>
+      <h2>Status</h2>
+      <p>{alt_desc}</p>
+    </section>
+  </main>
+
+  <footer>
+    <p>{footer}</p>
+  </footer>
+</body>
+</html>""")
 
 
 class SubdomainSweepFlagGenerator:
@@ -11,6 +71,10 @@ class SubdomainSweepFlagGenerator:
     Generator for the Subdomain Sweep challenge.
     Produces 5 subdomain HTML files with 1 real flag and 4 decoys.
     Stores unlock metadata for validation workflow.
+
+    The sweep variant (subdomain_count, or CCRI_SUBDOMAINS) renders thousands
+    of *.liber8.local pages instead, with the flags on a few random pages.
+    domains.txt always lists every generated subdomain.
     """
 
     SUBDOMAINS = [
@@ -47,9 +111,40 @@ class SubdomainSweepFlagGenerator:
         "[NOTICE] Authentication handshake completed."
     ]
 
-    def __init__(self, project_root: Path = None):
+    # Name parts for the sweep variant: word-role-NN.liber8.local
+    SWEEP_WORDS = [
+        "alpha", "beta", "gamma", "delta", "epsilon", "zeta", "eta", "theta",
+        "iota", "kappa", "lambda", "sigma", "tau", "phi", "psi", "omega",
+        "atlas", "nova", "orion", "vega", "lynx", "falcon", "raven", "cobalt"
+    ]
+    SWEEP_ROLES = [
+        "api", "cdn", "mail", "vpn", "dev", "staging", "auth", "db",
+        "cache", "files", "status", "git", "ci", "metrics", "backup", "portal"
+    ]
+    SWEEP_KINDS = [
+        ("Service Portal", "Service"),
+        ("Operations Dashboard", "Operations"),
+        ("Data API", "Data API"),
+        ("API Service", "API"),
+        ("Internal Tools", "Tools Suite")
+    ]
+    SWEEP_FOOTERS = [
+        "{} © 2025 Liber8 Network",
+        "{} – Liber8 Internal Systems",
+        "© 2025 Liber8 Network – {} Team",
+        "{} © Liber8 DevOps",
+        "{} © Liber8 Engineering"
+    ]
+    MAX_SUBDOMAINS = 200_000
+    WRITE_BATCH = 512  # pages rendered per batch before writing
+
+    def __init__(self, project_root: Path = None, subdomain_count: int = None):
         self.project_root = project_root or self.find_project_root()
         self.metadata = {}  # For unlock info
+        if subdomain_count is None:
+            # Sweep size, or None for the classic five pages
+            subdomain_count = FlagUtils.int_from_env(SWEEP_ENV, minimum=5, maximum=self.MAX_SUBDOMAINS)
+        self.subdomain_count = subdomain_count
 
     @staticmethod
     def find_project_root() -> Path:
@@ -92,49 +187,65 @@ class SubdomainSweepFlagGenerator:
         Generate randomized HTML content for a subdomain.
         """
         alt_desc = random.choice(self.ALT_DESCRIPTIONS) if random.random() < 0.4 else header_desc
-        flag_block = self.embed_flag(flag)
+        flag_block = self.embed_flag(flag) if flag is not None else self.noise_block()
 
-        return f"""<!DOCTYPE html>
-<html lang=\"en\">
-<head>
-  <meta charset=\"UTF-8\">
-  <title>{title}</title>
-</head>
-<body>
-  <header>
-    <h1>{header_title}</h1>
-    <p>{alt_desc}</p>
-  </header>
+        return PAGE_TEMPLATE.render({
+            "title": title,
+            "header_title": header_title,
+            "alt_desc": alt_desc,
+            "flag_block": flag_block,
+            "footer": footer
+        })
 
-  <main>
-    <section>
-      <h2>Recent Activity</h2>
-      {flag_block}
-    </section>
+    def noise_block(self) -> str:
+        """
+        Activity block for a page without a flag (sweep variant filler).
+        """
+        lines = random.sample(self.ALT_PRE_LINES, random.randint(2, 4))
+        session = f"{random.getrandbits(32):08x}"
+        return "<pre>\n" + "\n".join(line.format(session) for line in lines) + "\n</pre>"
 
-    <section>
-      <h2>Status</h2>
-      <p>{alt_desc}</p>
-    </section>
-  </main>
+    def sweep_name(self, index: int) -> str:
+        """
+        Subdomain for a position in the (unbounded) word x role x number space.
+        """
+        per_round = len(self.SWEEP_WORDS) * len(self.SWEEP_ROLES)
+        number, rest = divmod(index, per_round)
+        word, role = divmod(rest, len(self.SWEEP_ROLES))
+        return f"{self.SWEEP_WORDS[word]}-{self.SWEEP_ROLES[role]}-{number + 1:02}.liber8.local"
 
-  <footer>
-    <p>{footer}</p>
-  </footer>
-</body>
-</html>"""
+    def sweep_page(self, subdomain: str, flag: str = None) -> str:
+        """
+        Page fields for one sweep subdomain, derived from its name.
+        """
+        word = subdomain.split("-", 1)[0].capitalize()
+        kind, short_kind = random.choice(self.SWEEP_KINDS)
+        header_desc = random.choice(self.SUBDOMAINS)[3]
+        footer = random.choice(self.SWEEP_FOOTERS).format(word)
+        return self.create_html(subdomain, f"{word} {kind}", f"{word} {short_kind}", header_desc, footer, flag)
+
+    @staticmethod
+    def write_domains(challenge_folder: Path, subdomains: list):
+        """domains.txt: one subdomain per line, as if from a DNS enumeration."""
+        with open(challenge_folder / "domains.txt", "w", encoding="utf-8") as f:
+            f.writelines(f"{subdomain}\n" for subdomain in subdomains)
 
     def clean_old_subdomain_html(self, challenge_folder: Path):
         """
         Remove only existing subdomain HTML files (*.liber8.local.html).
         """
         if challenge_folder.exists():
+            removed = 0
             for file in challenge_folder.glob("*.liber8.local.html"):
                 try:
                     file.unlink()
-                    print(f"🗑️ Removed old file: {file.name}")
+                    removed += 1
+                    if removed <= 5:
+                        print(f"🗑️ Removed old file: {file.name}")
                 except Exception as e:
                     print(f"⚠️ Could not delete {file.name}: {e}", file=sys.stderr)
+            if removed > 5:
+                print(f"🗑️ ... and {removed - 5} more old subdomain pages")
         else:
             print(f"📁 Creating challenge folder: {challenge_folder.relative_to(self.project_root)}")
             challenge_folder.mkdir(parents=True, exist_ok=True)
@@ -164,6 +275,8 @@ class SubdomainSweepFlagGenerator:
                 else:
                     print(f"➖ {file_path.name} (decoy)")
 
+            self.write_domains(challenge_folder, [subdomain for subdomain, *_ in self.SUBDOMAINS])
+
             # Record unlock metadata
             self.metadata = {
                 "real_flag": real_flag,
@@ -176,6 +289,52 @@ class SubdomainSweepFlagGenerator:
             print(f"❌ Failed during subdomain HTML embedding: {e}", file=sys.stderr)
             sys.exit(1)
 
+    def embed_subdomain_sweep(self, challenge_folder: Path, real_flag: str, fake_flags: list):
+        """
+        Render subdomain_count pages in batches from the precompiled template;
+        1 real and 4 fake flags land on randomly chosen pages.
+        """
+        try:
+            challenge_folder.mkdir(parents=True, exist_ok=True)
+            self.clean_old_subdomain_html(challenge_folder)
+
+            count = self.subdomain_count
+            subdomains = [self.sweep_name(i) for i in range(count)]
+            random.shuffle(subdomains)  # DNS enumeration order, not generation order
+            all_flags = fake_flags + [real_flag]
+            slots = dict(zip(random.sample(range(count), len(all_flags)), all_flags))
+
+            print(f"🎭 Fake flags: {', '.join(fake_flags)}")
+
+            written = 0
+            for start in range(0, count, self.WRITE_BATCH):
+                batch = [
+                    (challenge_folder / f"{subdomains[i]}.html",
+                     self.sweep_page(subdomains[i], slots.get(i)).encode("utf-8"))
+                    for i in range(start, min(start + self.WRITE_BATCH, count))
+                ]
+                write_files(batch)
+                written += len(batch)
+
+            self.write_domains(challenge_folder, subdomains)
+
+            for i, flag in slots.items():
+                label = "REAL flag" if flag == real_flag else "decoy"
+                print(f"{'✅' if flag == real_flag else '➖'} {subdomains[i]}.html ({label})")
+            print(f"🌐 Wrote {written} subdomain pages and domains.txt")
+
+            # Record unlock metadata
+            self.metadata = {
+                "real_flag": real_flag,
+                "challenge_folder": str(challenge_folder.relative_to(self.project_root)),
+                "unlock_method": f"Sweep all {count} subdomain pages listed in domains.txt for the flag",
+                "hint": "Search *.liber8.local.html for the flag string using grep or the helper's indexed sweep"
+            }
+
+        except Exception as e:
+            print(f"❌ Failed during subdomain sweep generation: {e}", file=sys.stderr)
+            sys.exit(1)
+
     def generate_flag(self, challenge_folder: Path) -> str:
         """
         Generate subdomain HTML files with 1 real and 4 fake flags.
@@ -193,5 +352,8 @@ class SubdomainSweepFlagGenerator:
         while real_flag in fake_flags:
             real_flag = FlagUtils.generate_real_flag()
 
-        self.embed_subdomain_html(challenge_folder, real_flag, fake_flags)
+        if self.subdomain_count:
+            self.embed_subdomain_sweep(challenge_folder, real_flag, fake_flags)
+        else:
+            self.embed_subdomain_html(challenge_folder, real_flag, fake_flags)
         return real_flag
@@ -4,13 +4,21 @@ from pathlib import Path
 import random
 import sys
 from flag_generators.flag_helpers import FlagUtils
+from flag_generators.ps_dump import PsDump
+
+PROCESS_COUNT_ENV = "CCRI_PS_PROCESSES"  # e.g. 100000 for a large snapshot
 
 
 class ProcessInspectionFlagGenerator:
     """
     Generator for the Process Inspection challenge.
-    Produces ps_dump.txt with fake and real flags in process listings.
+    Produces ps_dump.txt with fake and real flags in process listings,
+    plus ps_dump.columns.json (columnar copy indexed by command and user).
     Stores unlock metadata for validation workflow.
+
+    Rows are streamed straight to disk, so process_count (or
+    CCRI_PS_PROCESSES) can be raised to 100k+ without building the listing
+    in memory; flagged processes are dropped into random slots on the way.
     """
 
     USERS = ["root", "user1", "user2", "user3", "daemon", "syslog", "mysql", "postfix", "nobody", "liber8"]
@@ -37,9 +45,21 @@ class ProcessInspectionFlagGenerator:
         "/opt/liber8/bin/siphon --threads 8 --proxy 127.0.0.1:8080"
     ]
 
-    def __init__(self, project_root: Path = None):
+    FLAG_PROCESSES = [
+        "/usr/bin/harvest --target 10.6.42.18 --flag={} --interval 15 --verbose",
+        "/opt/liber8/bin/siphon --upload --flag={} --threads 4",
+        "/usr/local/bin/tunneler --flag={} --mode aggressive --ttl 64",
+        "/usr/bin/stealth --flag={} --timeout 90",
+        "/usr/sbin/backdoor --flag={} --listen --port 4444"
+    ]
+
+    def __init__(self, project_root: Path = None, process_count: int = None):
         self.project_root = project_root or self.find_project_root()
         self.metadata = {}  # For unlock info
+        if process_count is None:
+            # Background process count, or None for the classic 80-100
+            process_count = FlagUtils.int_from_env(PROCESS_COUNT_ENV)
+        self.process_count = process_count
 
     @staticmethod
     def find_project_root() -> Path:
@@ -59,12 +79,12 @@ class ProcessInspectionFlagGenerator:
     def random_start_time(self) -> str:
         return f"Jul{random.randint(1, 30):02d}"
 
-    def random_process(self, user_override=None, cmd_override=None) -> str:
+    def random_row(self, user_override=None, cmd_override=None, pid=None) -> tuple:
         """
-        Generate a single ps-like process line.
+        Generate a single process as a tuple of ps columns.
         """
         user = user_override or random.choice(self.USERS)
-        pid = random.randint(100, 9999)
+        pid = pid or random.randint(100, 9999)
         cpu = round(random.uniform(0.1, 1.5), 1)
         mem = round(random.uniform(0.1, 1.5), 1)
         vsz = random.randint(15000, 80000)
@@ -76,58 +96,59 @@ class ProcessInspectionFlagGenerator:
         cmd_template = cmd_override or random.choice(self.COMMANDS)
         cmd = cmd_template.format(random.randint(1, 3))
 
-        return f"{user:<10}{pid:<6}{cpu:<5}{mem:<5}{vsz:<8}{rss:<7}{tty:<10}{stat:<5}{start:<8}{time:<7}{cmd}"
+        return user, pid, cpu, mem, vsz, rss, tty, stat, start, time, cmd
 
-    def embed_flags(self, lines, real_flag, fake_flags):
+    def flag_rows(self, real_flag, fake_flags) -> list:
         """
-        Embed 1 real and several fake flags in process commands.
+        1 real and several fake flags embedded in liber8 process commands.
         """
-        flag_processes = [
-            "/usr/bin/harvest --target 10.6.42.18 --flag={} --interval 15 --verbose",
-            "/opt/liber8/bin/siphon --upload --flag={} --threads 4",
-            "/usr/local/bin/tunneler --flag={} --mode aggressive --ttl 64",
-            "/usr/bin/stealth --flag={} --timeout 90",
-            "/usr/sbin/backdoor --flag={} --listen --port 4444"
-        ]
-
-        # Shuffle flags and embed
         flags = [real_flag] + fake_flags
-        random.shuffle(flag_processes)
-        for proc, flag in zip(flag_processes, flags):
-            lines.append(self.random_process("liber8", proc.format(flag)))
+        processes = random.sample(self.FLAG_PROCESSES, len(self.FLAG_PROCESSES))
+        return [self.random_row("liber8", proc.format(flag)) for proc, flag in zip(processes, flags)]
+
+    def iter_process_rows(self, noise_count, flagged):
+        """
+        Yield noise_count background processes with the flagged rows dropped
+        into random positions, without holding the listing in memory.
+        PIDs are unique (5 digits) while the snapshot allows it.
+        """
+        total = noise_count + len(flagged)
+        slots = dict(zip(random.sample(range(total), len(flagged)), flagged))
+        unique_pids = total <= 9900
+        pid_pool = random.sample(range(100, 10000 if unique_pids else 100000), min(total, 9900 if unique_pids else 99900))
+        for position in range(total):
+            pid = pid_pool[position % len(pid_pool)]
+            row = slots.get(position)
+            if row is not None:
+                yield (row[0], pid) + row[2:]
+            else:
+                yield self.random_row(pid=pid)
 
     def generate_ps_dump(self, challenge_folder: Path, real_flag: str, fake_flags: list):
         """
-        Generate ps_dump.txt file with fake and real processes.
+        Generate ps_dump.txt (and its columnar copy) with fake and real processes.
         """
         challenge_folder.mkdir(parents=True, exist_ok=True)
         dump_file = challenge_folder / "ps_dump.txt"
+        columnar_file = Path(PsDump.columnar_path(dump_file))
 
-        # Overwrite only ps_dump.txt
-        if dump_file.exists():
-            try:
-                dump_file.unlink()
-                print(f"🗑️ Removed old file: {dump_file.name}")
-            except Exception as e:
-                print(f"⚠️ Could not remove old ps_dump.txt: {e}", file=sys.stderr)
+        # Overwrite only ps_dump.txt and its columnar copy
+        for old_file in (dump_file, columnar_file):
+            if old_file.exists():
+                try:
+                    old_file.unlink()
+                    print(f"🗑️ Removed old file: {old_file.name}")
+                except Exception as e:
+                    print(f"⚠️ Could not remove old {old_file.name}: {e}", file=sys.stderr)
 
         try:
-            lines = ["USER       PID %CPU %MEM    VSZ   RSS TTY      STAT START   TIME COMMAND"]
-            # Add random background noise
-            for _ in range(random.randint(80, 100)):
-                lines.append(self.random_process())
-
-            # Embed flagged processes
-            self.embed_flags(lines, real_flag, fake_flags)
-
-            # Shuffle all except header line
-            random.shuffle(lines[1:])
-
-            # Write output
-            dump_file.write_text("\n".join(lines) + "\n", encoding="utf-8")
+            noise_count = self.process_count or random.randint(80, 100)
+            rows = self.iter_process_rows(noise_count, self.flag_rows(real_flag, fake_flags))
+            dump = PsDump.write(dump_file, rows, columnar_file)
 
             print(f"🎭 Fake flags: {', '.join(fake_flags)}")
-            print(f"✅ ps_dump.txt created in {challenge_folder.relative_to(self.project_root)} (real flag: {real_flag})")
+            print(f"✅ ps_dump.txt created in {challenge_folder.relative_to(self.project_root)} "
+                  f"({dump.rows} processes, real flag: {real_flag})")
 
             # Record unlock metadata
             self.metadata = {
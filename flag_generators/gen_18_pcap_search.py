@@ -99,6 +99,9 @@ class PcapSearchFlagGenerator:
             except Exception as e:
                 print(f"⚠️ Could not delete old traffic.pcap: {e}", file=sys.stderr)
 
+        # Stale stream index cached by analyze_pcap.py (it would be rebuilt anyway)
+        (challenge_folder / ".traffic.pcap.index.json").unlink(missing_ok=True)
+
         packets = []
 
         # Random noise traffic (~150 conversations)
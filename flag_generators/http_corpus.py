@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+
+import json
+import mmap
+import re
+import struct
+from array import array
+from bisect import bisect_right
+from contextlib import contextmanager
+
+from flag_generators.flag_helpers import pack_array, unpack_array
+
+CORPUS_MAGIC = b"CCRIHTTP"
+CORPUS_VERSION = 1
+TRAILER = struct.Struct("<8sQ")  # magic, byte offset of the JSON index
+VALUE_INDEX_LIMIT = 64           # headers with more distinct values only record counts
+FLAG_PATTERN = rb"CCRI-[A-Z]{4}-\d{4}"
+HEADER_NAME = rb"[A-Za-z0-9-]+"
+
+
+class HttpCorpus:
+    """
+    Many raw HTTP responses in one archive file, with an index at the end.
+
+    Layout: the responses back to back, then a JSON index, then a fixed
+    trailer (magic + index offset) so the writer can stream responses
+    without knowing the final count. The index holds an offset table (start
+    of each response and end of its header block) and, for every header
+    name, a value -> response ids map (or only a count for high-cardinality
+    headers like Date). Searches run one compiled regex over the
+    memory-mapped data and map match offsets back to responses with bisect.
+    """
+
+    def __init__(self, path, names, offsets, header_ends, headers):
+        self.path = str(path)
+        self.names = names
+        self.offsets = offsets          # start of each response, plus end of the data
+        self.header_ends = header_ends  # end of each header block
+        self.headers = headers          # lower-case name -> {"count": n, "values": {value: ids} | None}
+
+    def __len__(self):
+        return len(self.names)
+
+    @staticmethod
+    def split_headers(text: str):
+        """(header block, [(name, value), ...]) for one response (status line excluded)."""
+        block = text.split("\n\n", 1)[0]
+        pairs = []
+        for line in block.split("\n")[1:]:
+            name, sep, value = line.partition(":")
+            if sep:
+                pairs.append((name.strip(), value.strip()))
+        return block, pairs
+
+    @classmethod
+    def write(cls, path, responses) -> "HttpCorpus":
+        """Stream (name, response text) pairs into an archive at path."""
+        names = []
+        offsets = array("Q")
+        header_ends = array("Q")
+        headers = {}
+        position = 0
+        with open(path, "wb") as f:
+            for name, text in responses:
+                if not text.endswith("\n"):
+                    text += "\n"  # Keep responses line-aligned in the archive
+                block, pairs = cls.split_headers(text)
+                data = text.encode("utf-8")
+                response_id = len(names)
+                names.append(name)
+                offsets.append(position)
+                header_ends.append(position + len(block.encode("utf-8")))
+                for header, value in pairs:
+                    entry = headers.setdefault(header.lower(), {"count": 0, "values": {}})
+                    entry["count"] += 1
+                    values = entry["values"]
+                    if values is None:
+                        continue
+                    ids = values.get(value)
+                    if ids is None:
+                        if len(values) >= VALUE_INDEX_LIMIT:
+                            entry["values"] = None  # Too many distinct values to be useful
+                            continue
+                        ids = values[value] = array("I")
+                    ids.append(response_id)
+                f.write(data)
+                position += len(data)
+            offsets.append(position)
+
+            index = {
+                "version": CORPUS_VERSION,
+                "names": names,
+                "offsets": pack_array(offsets),
+                "header_ends": pack_array(header_ends),
+                "headers": {
+                    header: {
+                        "count": entry["count"],
+                        "values": None if entry["values"] is None
+                        else {value: pack_array(ids) for value, ids in entry["values"].items()},
+                    }
+                    for header, entry in headers.items()
+                },
+            }
+            f.write(json.dumps(index, separators=(",", ":")).encode("utf-8"))
+            f.write(TRAILER.pack(CORPUS_MAGIC, position))
+        return cls(path, names, offsets, header_ends, headers)
+
+    @classmethod
+    def open(cls, path) -> "HttpCorpus":
+        """Read the index of an archive. Raises ValueError if path is not one."""
+        with open(path, "rb") as f:
+            f.seek(0, 2)
+            size = f.tell()
+            if size < TRAILER.size:
+                raise ValueError(f"{path} is not an HTTP corpus archive")
+            f.seek(size - TRAILER.size)
+            magic, index_offset = TRAILER.unpack(f.read(TRAILER.size))
+            if magic != CORPUS_MAGIC or index_offset > size - TRAILER.size:
+                raise ValueError(f"{path} is not an HTTP corpus archive")
+            f.seek(index_offset)
+            index = json.loads(f.read(size - TRAILER.size - index_offset))
+        if index.get("version") != CORPUS_VERSION:
+            raise ValueError(f"Unsupported corpus version in {path}")
+        headers = {
+            header: {
+                "count": entry["count"],
+                "values": None if entry["values"] is None
+                else {value: unpack_array(ids, "I") for value, ids in entry["values"].items()},
+            }
+            for header, entry in index["headers"].items()
+        }
+        return cls(path, index["names"], unpack_array(index["offsets"], "Q"), unpack_array(index["header_ends"], "Q"), headers)
+
+    @contextmanager
+    def mapped(self):
+        """Read-only memory map of the archive (responses + index)."""
+        with open(self.path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                yield mm
+            finally:
+                mm.close()
+
+    def response(self, response_id: int) -> str:
+        with open(self.path, "rb") as f:
+            f.seek(self.offsets[response_id])
+            data = f.read(self.offsets[response_id + 1] - self.offsets[response_id])
+        return data.decode("utf-8", errors="replace")
+
+    def response_at(self, offset: int) -> int:
+        """Response id containing byte offset."""
+        return bisect_right(self.offsets, offset) - 1
+
+    def header_values(self, header: str):
+        """{value: response ids} for a header, or None if it was too varied to index."""
+        entry = self.headers.get(header.lower())
+        return entry["values"] if entry else {}
+
+    def lookup(self, header: str, value: str) -> list:
+        """Response ids whose header has exactly this value (indexed headers only)."""
+        values = self.header_values(header) or {}
+        return list(values.get(value, ()))
+
+    @staticmethod
+    def header_pattern(value_pattern=rb".*?", header=None):
+        """
+        One compiled regex for "Header: value" lines whose value contains
+        value_pattern. header limits it to one header name (case-insensitive).
+        """
+        if isinstance(value_pattern, str):
+            value_pattern = value_pattern.encode("utf-8")
+        name = HEADER_NAME if header is None else b"(?i:" + re.escape(header.encode("ascii")) + b")"
+        return re.compile(
+            rb"^(?P<name>" + name + rb")[ \t]*:[ \t]*(?P<value>[^\r\n]*?(?:" + value_pattern + rb")[^\r\n]*)",
+            re.M,
+        )
+
+    def search_headers(self, value_pattern=FLAG_PATTERN, header=None):
+        """
+        Yield (response_id, header, value) for every header line in the corpus
+        matching value_pattern, in one regex pass over the archive.
+        Body lines that merely look like headers are skipped using header_ends.
+        """
+        pattern = self.header_pattern(value_pattern, header)
+        data_end = self.offsets[-1]
+        with self.mapped() as data:
+            for match in pattern.finditer(data, 0, data_end):
+                response_id = self.response_at(match.start())
+                if match.start() >= self.header_ends[response_id]:
+                    continue
+                yield (response_id,
+                       match.group("name").decode("ascii"),
+                       match.group("value").decode("utf-8", errors="replace"))
+
+    def search(self, pattern=FLAG_PATTERN):
+        """Yield (response_id, match) for a bytes regex anywhere in the responses (headers or bodies)."""
+        if isinstance(pattern, str):
+            pattern = pattern.encode("utf-8")
+        if isinstance(pattern, bytes):
+            pattern = re.compile(pattern)
+        with self.mapped() as data:
+            for match in pattern.finditer(data, 0, self.offsets[-1]):
+                yield self.response_at(match.start()), match.group().decode("utf-8", errors="replace")
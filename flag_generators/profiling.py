@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Optional profiling for flag generation and validation.
+
+Set CCRI_PROFILE (or pass --profile to generate_all_flags.py /
+validate_all_flags.py) to one of:
+
+    cprofile     -> <name>.prof (pstats) + <name>.cprofile.txt (top functions)
+    tracemalloc  -> <name>.tracemalloc.txt (peak memory + top allocation sites)
+    wall         -> <name>.wall.txt (wall and CPU time only)
+
+When run as a script it executes another Python file under the selected
+profiler, which is how validate_all_flags.py profiles the helper scripts:
+
+    python3 flag_generators/profiling.py --name 03_ROT13 --output-dir out/ decode_rot13.py
+"""
+
+import argparse
+import cProfile
+import io
+import os
+import pstats
+import runpy
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+
+PROFILE_ENV = "CCRI_PROFILE"
+PROFILE_MODES = ("cprofile", "tracemalloc", "wall")
+
+# How many rows to keep in the human-readable summaries
+TOP_FUNCTIONS = 40
+TOP_ALLOCATIONS = 25
+
+def get_profile_mode():
+    """Return the profiling mode from CCRI_PROFILE, or None when disabled."""
+    mode = os.environ.get(PROFILE_ENV, "").strip().lower()
+    if not mode or mode in ("0", "off", "none"):
+        return None
+    if mode not in PROFILE_MODES:
+        print(f"⚠️ Ignoring unknown {PROFILE_ENV}={mode!r} (expected one of: {', '.join(PROFILE_MODES)})",
+              file=sys.stderr)
+        return None
+    return mode
+
+@contextmanager
+def profile_section(name, output_dir, mode=None):
+    """
+    Profile the enclosed block and write the results to output_dir/<name>.*.
+    Does nothing when profiling is disabled. Results are written even if the
+    block raises or calls sys.exit(), so failing steps can be analyzed too.
+    """
+    mode = mode or get_profile_mode()
+    if mode is None:
+        yield
+        return
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    profiler = None
+    started_tracemalloc = False
+    if mode == "cprofile":
+        profiler = cProfile.Profile()
+        profiler.enable()
+    elif mode == "tracemalloc":
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(10)
+            started_tracemalloc = True
+        tracemalloc.reset_peak()
+
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        yield
+    finally:
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+        header = f"# {name}: wall={wall:.6f}s cpu={cpu:.6f}s\n"
+
+        if mode == "cprofile":
+            profiler.disable()
+            profiler.dump_stats(output_dir / f"{name}.prof")
+            report = io.StringIO()
+            pstats.Stats(profiler, stream=report).sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+            summary_file = output_dir / f"{name}.cprofile.txt"
+            summary_file.write_text(header + report.getvalue(), encoding="utf-8")
+        elif mode == "tracemalloc":
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            if started_tracemalloc:
+                tracemalloc.stop()
+            lines = [header, f"# current={current} bytes peak={peak} bytes\n"]
+            for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]:
+                lines.append(f"{stat}\n")
+            summary_file = output_dir / f"{name}.tracemalloc.txt"
+            summary_file.write_text("".join(lines), encoding="utf-8")
+        else:
+            summary_file = output_dir / f"{name}.wall.txt"
+            summary_file.write_text(header, encoding="utf-8")
+
+        print(f"📈 Profile saved: {summary_file}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a Python script under the CCRI_PROFILE profiler.")
+    parser.add_argument("--name", required=True, help="Base name for the profile files")
+    parser.add_argument("--output-dir", required=True, help="Folder to write profile files into")
+    parser.add_argument("script", help="Python script to run as __main__")
+    parser.add_argument("args", nargs=argparse.REMAINDER, help="Arguments passed to the script")
+    args = parser.parse_args()
+
+    script = os.path.abspath(args.script)
+    sys.argv = [script] + args.args
+    sys.path[0] = os.path.dirname(script)
+
+    with profile_section(args.name, args.output_dir):
+        runpy.run_path(script, run_name="__main__")
+
+if __name__ == "__main__":
+    main()
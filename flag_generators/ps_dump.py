@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+
+import json
+import os
+from array import array
+
+from flag_generators.flag_helpers import pack_array, unpack_array
+
+COLUMNS = ("user", "pid", "cpu", "mem", "vsz", "rss", "tty", "stat", "start", "time", "command")
+INT_COLUMNS = frozenset(("pid", "vsz", "rss"))
+INDEX_FIELDS = ("command", "user")
+HEADER = "USER       PID %CPU %MEM    VSZ   RSS TTY      STAT START   TIME COMMAND"
+COLUMNAR_SUFFIX = ".columns.json"  # ps_dump.txt -> ps_dump.columns.json
+FORMAT_VERSION = 1
+WRITE_BATCH = 4096  # text lines per write
+
+
+class PsDump:
+    """
+    Columnar process snapshot shared by the process-inspection generator and helper.
+
+    Integer columns (pid, vsz, rss) are stored as typed arrays; every other
+    column is dictionary-encoded (distinct values + one code per row), so a
+    100k-process dump with a few dozen distinct commands costs a few arrays
+    and keyword searches only scan the distinct values. An index maps each
+    executable and user to its row ids. ps_dump.txt stays the human-readable
+    view; the columnar file sits next to it and is rebuilt from the text
+    when missing or stale.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.values = {name: [] for name in COLUMNS if name not in INT_COLUMNS}
+        self.codes = {name: array("I") for name in COLUMNS}
+        self._codebook = {name: {} for name in self.values}
+        self.index = None
+
+    # === Rows ===
+
+    def append(self, row):
+        """
+        Add one row (a tuple in COLUMNS order). The integer columns are
+        converted before anything is stored, so a ValueError leaves the
+        columns untouched.
+        """
+        numbers = {name: int(value) for name, value in zip(COLUMNS, row) if name in INT_COLUMNS}
+        for name, value in zip(COLUMNS, row):
+            if name in INT_COLUMNS:
+                self.codes[name].append(numbers[name])
+                continue
+            value = str(value)
+            codebook = self._codebook[name]
+            code = codebook.get(value)
+            if code is None:
+                code = codebook[value] = len(self.values[name])
+                self.values[name].append(value)
+            self.codes[name].append(code)
+        self.rows += 1
+        self.index = None
+
+    def value(self, name, row_id):
+        code = self.codes[name][row_id]
+        return code if name in INT_COLUMNS else self.values[name][code]
+
+    def row(self, row_id) -> tuple:
+        return tuple(self.value(name, row_id) for name in COLUMNS)
+
+    @staticmethod
+    def format_line(row) -> str:
+        """Text-view line, in the same fixed-width layout as `ps aux`-style dumps."""
+        user, pid, cpu, mem, vsz, rss, tty, stat, start, time, cmd = row
+        return f"{user:<10}{pid:<6}{cpu:<5}{mem:<5}{vsz:<8}{rss:<7}{tty:<10}{stat:<5}{start:<8}{time:<7}{cmd}"
+
+    def line(self, row_id) -> str:
+        return self.format_line(self.row(row_id))
+
+    @staticmethod
+    def executable(command: str) -> str:
+        """First word of a command line (the program path)."""
+        parts = command.split(None, 1)
+        return parts[0] if parts else ""
+
+    # === Index and filtering ===
+
+    def build_index(self):
+        """Map every executable and user to the row ids that run it."""
+        index = {}
+        for field in INDEX_FIELDS:
+            keys = self.values[field]
+            if field == "command":
+                keys = [self.executable(command) for command in keys]
+            buckets = {}
+            for row_id, code in enumerate(self.codes[field]):
+                key = keys[code]
+                bucket = buckets.get(key)
+                if bucket is None:
+                    bucket = buckets[key] = array("I")
+                bucket.append(row_id)
+            index[field] = buckets
+        self.index = index
+        return index
+
+    def lookup(self, field, value) -> array:
+        """Row ids whose executable (field="command") or user equals value."""
+        if self.index is None:
+            self.build_index()
+        return self.index[field].get(value, array("I"))
+
+    def keys(self, field) -> list:
+        """Indexed values in first-seen order (e.g. every executable, as listed in the dump)."""
+        if self.index is None:
+            self.build_index()
+        return sorted(self.index[field], key=lambda key: self.index[field][key][0])
+
+    def filter(self, user=None, executable=None, contains=None) -> list:
+        """
+        Row ids matching all given criteria. contains is a substring of the
+        full command line; it is tested once per distinct command, not per row.
+        """
+        candidates = None
+        for field, value in (("user", user), ("command", executable)):
+            if value is not None:
+                rows = set(self.lookup(field, value))
+                candidates = rows if candidates is None else candidates & rows
+        if contains is not None:
+            wanted = {code for code, command in enumerate(self.values["command"]) if contains in command}
+            codes = self.codes["command"]
+            source = range(self.rows) if candidates is None else candidates
+            candidates = {row_id for row_id in source if codes[row_id] in wanted}
+        return sorted(candidates) if candidates is not None else list(range(self.rows))
+
+    # === Files ===
+
+    @staticmethod
+    def columnar_path(text_path) -> str:
+        root, _ = os.path.splitext(str(text_path))
+        return root + COLUMNAR_SUFFIX
+
+    @classmethod
+    def write(cls, text_path, rows, columnar_path=None):
+        """
+        Stream rows (any iterable, e.g. a generator of 100k+ tuples) into the
+        text view in batched writes while filling the columnar arrays, then
+        save the columnar file with its index. Returns the PsDump.
+        """
+        dump = cls()
+        batch = []
+        with open(text_path, "w", encoding="utf-8") as f:
+            f.write(HEADER + "\n")
+            for row in rows:
+                dump.append(row)
+                batch.append(cls.format_line(row) + "\n")
+                if len(batch) >= WRITE_BATCH:
+                    f.writelines(batch)
+                    batch = []
+            f.writelines(batch)
+        dump.save(columnar_path or cls.columnar_path(text_path))
+        return dump
+
+    def save(self, path):
+        if self.index is None:
+            self.build_index()
+        document = {
+            "version": FORMAT_VERSION,
+            "rows": self.rows,
+            "columns": {
+                name: {"values": self.values.get(name), "codes": pack_array(self.codes[name])}
+                for name in COLUMNS
+            },
+            "index": {
+                field: {key: pack_array(rows) for key, rows in buckets.items()}
+                for field, buckets in self.index.items()
+            },
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(document, f, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path):
+        """Load a columnar file written by save(). Raises ValueError if it is not one."""
+        with open(path, "r", encoding="utf-8") as f:
+            document = json.load(f)
+        if document.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported ps dump format in {path}")
+        dump = cls()
+        dump.rows = document["rows"]
+        for name in COLUMNS:
+            column = document["columns"][name]
+            dump.codes[name] = unpack_array(column["codes"])
+            if name not in INT_COLUMNS:
+                dump.values[name] = column["values"]
+        dump.index = {
+            field: {key: unpack_array(rows) for key, rows in buckets.items()}
+            for field, buckets in document["index"].items()
+        }
+        return dump
+
+    @classmethod
+    def from_text(cls, text_path):
+        """Parse the text view (header line first, then one process per line)."""
+        dump = cls()
+        with open(text_path, "r", encoding="utf-8", errors="replace") as f:
+            next(f, None)  # Header
+            for line in f:
+                parts = line.rstrip("\n").split(None, len(COLUMNS) - 1)
+                if len(parts) < len(COLUMNS) - 1:
+                    continue
+                if len(parts) == len(COLUMNS) - 1:
+                    parts.append("")
+                try:
+                    dump.append(parts)
+                except ValueError:
+                    continue  # Non-numeric pid/vsz/rss: not a process line
+        return dump
+
+    @classmethod
+    def open(cls, text_path):
+        """Columnar file when it is at least as new as the text view, else parse the text."""
+        columnar = cls.columnar_path(text_path)
+        try:
+            if os.path.getmtime(columnar) >= os.path.getmtime(text_path):
+                return cls.load(columnar)
+        except (OSError, ValueError, KeyError):
+            pass
+        return cls.from_text(text_path)
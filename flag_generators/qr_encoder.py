@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+
+import re
+import struct
+import zlib
+
+# Error correction level -> 2-bit format code
+ECC_FORMAT_BITS = {"L": 1, "M": 0, "Q": 3, "H": 2}
+
+# (version, level) -> (EC codewords per block, ((block count, data codewords per block), ...))
+EC_BLOCKS = {
+    (1, "L"): (7, ((1, 19),)), (1, "M"): (10, ((1, 16),)), (1, "Q"): (13, ((1, 13),)), (1, "H"): (17, ((1, 9),)),
+    (2, "L"): (10, ((1, 34),)), (2, "M"): (16, ((1, 28),)), (2, "Q"): (22, ((1, 22),)), (2, "H"): (28, ((1, 16),)),
+    (3, "L"): (15, ((1, 55),)), (3, "M"): (26, ((1, 44),)), (3, "Q"): (18, ((2, 17),)), (3, "H"): (22, ((2, 13),)),
+    (4, "L"): (20, ((1, 80),)), (4, "M"): (18, ((2, 32),)), (4, "Q"): (26, ((2, 24),)), (4, "H"): (16, ((4, 9),)),
+    (5, "L"): (26, ((1, 108),)), (5, "M"): (24, ((2, 43),)),
+    (5, "Q"): (18, ((2, 15), (2, 16))), (5, "H"): (22, ((2, 11), (2, 12))),
+    (6, "L"): (18, ((2, 68),)), (6, "M"): (16, ((4, 27),)), (6, "Q"): (24, ((4, 19),)), (6, "H"): (28, ((4, 15),)),
+    (7, "L"): (20, ((2, 78),)), (7, "M"): (18, ((4, 31),)),
+    (7, "Q"): (18, ((2, 14), (4, 15))), (7, "H"): (26, ((4, 13), (1, 14))),
+    (8, "L"): (24, ((2, 97),)), (8, "M"): (22, ((2, 38), (2, 39))),
+    (8, "Q"): (22, ((4, 18), (2, 19))), (8, "H"): (26, ((4, 14), (2, 15))),
+    (9, "L"): (30, ((2, 116),)), (9, "M"): (22, ((3, 36), (2, 37))),
+    (9, "Q"): (20, ((4, 16), (4, 17))), (9, "H"): (24, ((4, 12), (4, 13))),
+    (10, "L"): (18, ((2, 68), (2, 69))), (10, "M"): (26, ((4, 43), (1, 44))),
+    (10, "Q"): (24, ((6, 19), (2, 20))), (10, "H"): (28, ((6, 15), (2, 16))),
+}
+MAX_VERSION = 10
+
+# Alignment pattern centre coordinates per version
+ALIGNMENT_POSITIONS = {
+    1: (), 2: (6, 18), 3: (6, 22), 4: (6, 26), 5: (6, 30),
+    6: (6, 34), 7: (6, 22, 38), 8: (6, 24, 42), 9: (6, 26, 46), 10: (6, 28, 50),
+}
+
+MASK_FUNCTIONS = (
+    lambda i, j: (i + j) % 2 == 0,
+    lambda i, j: i % 2 == 0,
+    lambda i, j: j % 3 == 0,
+    lambda i, j: (i + j) % 3 == 0,
+    lambda i, j: (i // 2 + j // 3) % 2 == 0,
+    lambda i, j: (i * j) % 2 + (i * j) % 3 == 0,
+    lambda i, j: ((i * j) % 2 + (i * j) % 3) % 2 == 0,
+    lambda i, j: ((i + j) % 2 + (i * j) % 3) % 2 == 0,
+)
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+_BITS_TO_MODULES = bytes.maketrans(b"01", b"\x00\x01")
+_MODULES_TO_BITS = bytes.maketrans(b"\x00\x01", b"01")
+_MODULES_TO_PIXELS = bytes.maketrans(b"\x00\x01", b"10")  # dark module = black (0) pixel
+_SAME_COLOUR_RUN = re.compile(rb"\x00{5,}|\x01{5,}")
+# 1:1:3:1:1 finder-like core with 4 light modules on either side (the quiet zone counts as light)
+_FINDER_LIKE = re.compile(rb"(?<=\x00{4})\x01\x00\x01\x01\x01\x00\x01|\x01\x00\x01\x01\x01\x00\x01(?=\x00{4})")
+_QUIET = b"\x00" * 4
+
+# GF(256) tables for Reed-Solomon (primitive polynomial x^8 + x^4 + x^3 + x^2 + 1)
+_GF_EXP = [0] * 512
+_GF_LOG = [0] * 256
+_value = 1
+for _power in range(255):
+    _GF_EXP[_power] = _value
+    _GF_LOG[_value] = _power
+    _value <<= 1
+    if _value & 0x100:
+        _value ^= 0x11D
+for _power in range(255, 512):
+    _GF_EXP[_power] = _GF_EXP[_power - 255]
+del _value, _power
+
+
+class _VersionTemplate:
+    """Everything about a symbol version that does not depend on the payload."""
+
+    def __init__(self, version: int):
+        self.version = version
+        self.size = size = 17 + 4 * version
+        self.modules = bytearray(size * size)     # function patterns drawn, data area light
+        self.function = bytearray(size * size)    # 1 where the module is not data
+        self._draw_function_patterns()
+        self.data_positions = self._zigzag_positions()
+        # Each mask as one big int over the module buffer (0/1 per byte), so applying
+        # a mask is a single integer XOR instead of a per-module loop
+        self.mask_ints = [self._mask_int(fn) for fn in MASK_FUNCTIONS]
+
+    def _set(self, row, col, dark):
+        index = row * self.size + col
+        self.modules[index] = 1 if dark else 0
+        self.function[index] = 1
+
+    def _draw_function_patterns(self):
+        size = self.size
+        for i in range(size):  # Timing patterns
+            self._set(6, i, i % 2 == 0)
+            self._set(i, 6, i % 2 == 0)
+
+        for row, col in ((0, 0), (0, size - 7), (size - 7, 0)):  # Finders + separators
+            for dr in range(-1, 8):
+                for dc in range(-1, 8):
+                    r, c = row + dr, col + dc
+                    if 0 <= r < size and 0 <= c < size:
+                        dist = max(abs(dr - 3), abs(dc - 3))
+                        self._set(r, c, dist != 2 and dist != 4)
+
+        positions = ALIGNMENT_POSITIONS[self.version]
+        last = len(positions) - 1
+        for i, row in enumerate(positions):
+            for j, col in enumerate(positions):
+                if (i, j) in ((0, 0), (0, last), (last, 0)):
+                    continue  # Would overlap a finder pattern
+                for dr in range(-2, 3):
+                    for dc in range(-2, 3):
+                        self._set(row + dr, col + dc, max(abs(dr), abs(dc)) != 1)
+
+        # Reserve the format areas (filled per mask) and the always-dark module
+        for i in range(9):
+            if i != 6:  # Timing pattern crosses the format area here
+                self._set(8, i, False)
+                self._set(i, 8, False)
+        for i in range(8):
+            self._set(8, size - 1 - i, False)
+            self._set(size - 1 - i, 8, False)
+        self._set(size - 8, 8, True)
+
+        if self.version >= 7:
+            bits = self.version_bits(self.version)
+            for i in range(18):
+                dark = (bits >> i) & 1
+                a, b = size - 11 + i % 3, i // 3
+                self._set(b, a, dark)
+                self._set(a, b, dark)
+
+    def _zigzag_positions(self):
+        """Module indices in codeword bit order: two-column zigzag from the bottom right."""
+        size = self.size
+        positions = []
+        upward = True
+        col = size - 1
+        while col > 0:
+            if col == 6:
+                col -= 1  # Skip the vertical timing pattern
+            rows = range(size - 1, -1, -1) if upward else range(size)
+            for row in rows:
+                for c in (col, col - 1):
+                    index = row * size + c
+                    if not self.function[index]:
+                        positions.append(index)
+            upward = not upward
+            col -= 2
+        return positions
+
+    def _mask_int(self, fn):
+        size = self.size
+        mask = bytearray(size * size)
+        for index in self.data_positions:
+            if fn(index // size, index % size):
+                mask[index] = 1
+        return int.from_bytes(mask, "big")
+
+    @staticmethod
+    def version_bits(version: int) -> int:
+        rem = version
+        for _ in range(12):
+            rem = (rem << 1) ^ ((rem >> 11) * 0x1F25)
+        return version << 12 | rem
+
+
+class QREncoder:
+    """
+    Pure-Python QR Code encoder (byte mode, versions 1-10) with a minimal PNG writer.
+
+    One encoder is built for a fixed version and error correction level; the
+    function patterns, data-module order, mask buffers and RS divisor are
+    computed once and shared by every code it produces. That makes batches of
+    hundreds of images cheap and removes the need for qrencode entirely.
+    Masks are chosen by the standard penalty rules unless one is fixed.
+    """
+    _TEMPLATES = {}
+    _DIVISORS = {}
+
+    def __init__(self, version: int = 2, ecc: str = "M", mask: int = None, scale: int = 3, border: int = 4):
+        if not 1 <= version <= MAX_VERSION:
+            raise ValueError(f"QR version must be 1-{MAX_VERSION}, got {version}")
+        if ecc not in ECC_FORMAT_BITS:
+            raise ValueError(f"Unknown error correction level {ecc!r} (use L, M, Q or H)")
+        if mask is not None and not 0 <= mask <= 7:
+            raise ValueError(f"QR mask must be 0-7, got {mask}")
+        self.version = version
+        self.ecc = ecc
+        self.mask = mask
+        self.scale = scale
+        self.border = border
+
+        self.template = self._template(version)
+        self.size = self.template.size
+        self.ec_per_block, self.block_layout = EC_BLOCKS[(version, ecc)]
+        self.data_codewords = sum(count * length for count, length in self.block_layout)
+        self.count_bits = 8 if version <= 9 else 16
+        self.capacity = (self.data_codewords * 8 - 4 - self.count_bits) // 8
+        self.divisor = self._divisor(self.ec_per_block)
+        self.format_bits = [self._format_bits(ecc, m) for m in range(8)]
+
+        # PNG rows that never change: quiet zone rows and the left/right margin pixels
+        pixel_width = (self.size + 2 * border) * scale
+        self._row_bytes = (pixel_width + 7) // 8
+        self._margin = b"1" * (border * scale)
+        self._pad = b"0" * (self._row_bytes * 8 - pixel_width)
+        self._blank_row = b"\x00" + int(b"1" * pixel_width + self._pad, 2).to_bytes(self._row_bytes, "big")
+
+    @classmethod
+    def fitting_version(cls, length: int, ecc: str = "M") -> int:
+        """Smallest version that holds length bytes at this ECC level."""
+        for version in range(1, MAX_VERSION + 1):
+            _, layout = EC_BLOCKS[(version, ecc)]
+            count_bits = 8 if version <= 9 else 16
+            if length <= (sum(c * n for c, n in layout) * 8 - 4 - count_bits) // 8:
+                return version
+        raise ValueError(f"{length} bytes does not fit in a version {MAX_VERSION}-{ecc} QR code")
+
+    @classmethod
+    def _template(cls, version):
+        template = cls._TEMPLATES.get(version)
+        if template is None:
+            template = cls._TEMPLATES[version] = _VersionTemplate(version)
+        return template
+
+    @classmethod
+    def _divisor(cls, degree):
+        """Reed-Solomon generator polynomial coefficients (highest power omitted)."""
+        divisor = cls._DIVISORS.get(degree)
+        if divisor is None:
+            divisor = [0] * (degree - 1) + [1]
+            root = 1
+            for _ in range(degree):
+                for j in range(degree):
+                    divisor[j] = cls._gf_mul(divisor[j], root)
+                    if j + 1 < degree:
+                        divisor[j] ^= divisor[j + 1]
+                root = cls._gf_mul(root, 2)
+            cls._DIVISORS[degree] = divisor
+        return divisor
+
+    @staticmethod
+    def _gf_mul(a, b):
+        if a == 0 or b == 0:
+            return 0
+        return _GF_EXP[_GF_LOG[a] + _GF_LOG[b]]
+
+    @staticmethod
+    def _format_bits(ecc, mask):
+        data = ECC_FORMAT_BITS[ecc] << 3 | mask
+        rem = data
+        for _ in range(10):
+            rem = (rem << 1) ^ ((rem >> 9) * 0x537)
+        return (data << 10 | rem) ^ 0x5412
+
+    def _error_correction(self, block):
+        """RS remainder of block divided by the generator polynomial, via log tables."""
+        divisor_logs = [_GF_LOG[c] if c else None for c in self.divisor]
+        result = [0] * self.ec_per_block
+        for byte in block:
+            factor = byte ^ result.pop(0)
+            result.append(0)
+            if factor:
+                log_factor = _GF_LOG[factor]
+                for i, log_coef in enumerate(divisor_logs):
+                    if log_coef is not None:
+                        result[i] ^= _GF_EXP[log_coef + log_factor]
+        return result
+
+    def codewords(self, payload: bytes) -> bytes:
+        """Data + error correction codewords in final interleaved order."""
+        if len(payload) > self.capacity:
+            raise ValueError(f"{len(payload)} bytes exceeds version {self.version}-{self.ecc} capacity of {self.capacity}")
+
+        capacity_bits = self.data_codewords * 8
+        value = (0b0100 << self.count_bits | len(payload)) << 8 * len(payload) | int.from_bytes(payload, "big")
+        used = 4 + self.count_bits + 8 * len(payload)
+        terminator = min(4, capacity_bits - used)
+        used += terminator
+        value <<= terminator + (-used % 8)
+        data = value.to_bytes((used + 7) // 8, "big")
+        data += bytes((0xEC, 0x11)) * ((self.data_codewords - len(data)) // 2 + 1)
+        data = data[:self.data_codewords]
+
+        blocks = []
+        pos = 0
+        for count, length in self.block_layout:
+            for _ in range(count):
+                blocks.append(data[pos:pos + length])
+                pos += length
+        ec_blocks = [self._error_correction(block) for block in blocks]
+
+        out = bytearray()
+        for i in range(max(len(block) for block in blocks)):
+            out.extend(block[i] for block in blocks if i < len(block))
+        for i in range(self.ec_per_block):
+            out.extend(ec[i] for ec in ec_blocks)
+        return bytes(out)
+
+    def _draw_format(self, modules, mask):
+        size = self.size
+        bits = self.format_bits[mask]
+        bit = [(bits >> i) & 1 for i in range(15)]
+        for i in range(6):
+            modules[i * size + 8] = bit[i]
+        modules[7 * size + 8] = bit[6]
+        modules[8 * size + 8] = bit[7]
+        modules[8 * size + 7] = bit[8]
+        for i in range(9, 15):
+            modules[8 * size + 14 - i] = bit[i]
+        for i in range(8):
+            modules[8 * size + size - 1 - i] = bit[i]
+        for i in range(8, 15):
+            modules[(size - 15 + i) * size + 8] = bit[i]
+
+    def penalty(self, modules) -> int:
+        """Standard mask penalty score (rules N1-N4) for a finished module buffer."""
+        size = self.size
+        rows = [bytes(modules[r * size:(r + 1) * size]) for r in range(size)]
+        cols = [bytes(modules[c::size]) for c in range(size)]
+        score = 0
+        for line in rows + cols:
+            for match in _SAME_COLOUR_RUN.finditer(line):
+                score += len(match.group()) - 2
+            score += 40 * len(_FINDER_LIKE.findall(_QUIET + line + _QUIET))
+
+        full = (1 << (size - 1)) - 1
+        ints = [int(row.translate(_MODULES_TO_BITS), 2) for row in rows]
+        for upper, lower in zip(ints, ints[1:]):
+            # A bit survives where the 2x2 block starting at that column is one colour
+            vertical = ~(upper ^ lower)
+            same = vertical & (vertical >> 1) & ~(upper ^ (upper >> 1)) & full
+            score += 3 * bin(same).count("1")
+
+        dark = sum(modules)
+        total = size * size
+        score += abs(dark * 20 - total * 10) // total * 10  # 10 per full 5% away from 50% dark
+        return score
+
+    def matrix(self, text) -> bytearray:
+        """Encode text (str or bytes) into a size*size buffer: 1 = dark module."""
+        payload = text.encode("utf-8") if isinstance(text, str) else bytes(text)
+        template = self.template
+        codewords = self.codewords(payload)
+
+        bits = format(int.from_bytes(codewords, "big"), f"0{len(codewords) * 8}b").encode().translate(_BITS_TO_MODULES)
+        modules = bytearray(template.modules)
+        for index, bit in zip(template.data_positions, bits):
+            modules[index] = bit
+
+        base = int.from_bytes(modules, "big")
+        length = len(modules)
+        masks = range(8) if self.mask is None else (self.mask,)
+        best, best_score = None, None
+        for mask in masks:
+            candidate = bytearray((base ^ template.mask_ints[mask]).to_bytes(length, "big"))
+            self._draw_format(candidate, mask)
+            if self.mask is not None:
+                return candidate
+            score = self.penalty(candidate)
+            if best_score is None or score < best_score:
+                best, best_score = candidate, score
+        return best
+
+    def png_bytes(self, text) -> bytes:
+        """1-bit grayscale PNG of the code, with quiet zone, scaled by self.scale."""
+        modules = self.matrix(text)
+        size, scale = self.size, self.scale
+        raw = bytearray()
+        for _ in range(self.border * scale):
+            raw += self._blank_row
+        for r in range(size):
+            pixels = bytes(modules[r * size:(r + 1) * size]).translate(_MODULES_TO_PIXELS)
+            if scale > 1:
+                pixels = b"".join(bytes((p,)) * scale for p in pixels)
+            line = b"\x00" + int(self._margin + pixels + self._margin + self._pad, 2).to_bytes(self._row_bytes, "big")
+            raw += line * scale
+        for _ in range(self.border * scale):
+            raw += self._blank_row
+
+        pixel_size = (size + 2 * self.border) * scale
+        header = struct.pack("!IIBBBBB", pixel_size, pixel_size, 1, 0, 0, 0, 0)
+        return PNG_SIGNATURE + self._chunk(b"IHDR", header) + self._chunk(b"IDAT", zlib.compress(bytes(raw), 9)) + self._chunk(b"IEND", b"")
+
+    @staticmethod
+    def _chunk(kind, data):
+        return struct.pack("!I", len(data)) + kind + data + struct.pack("!I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+    def write_png(self, path, text) -> None:
+        with open(path, "wb") as f:
+            f.write(self.png_bytes(text))
+
+    def write_many(self, items) -> int:
+        """Write a batch of (path, text) pairs. Returns the number of images written."""
+        count = 0
+        for path, text in items:
+            self.write_png(path, text)
+            count += 1
+        return count
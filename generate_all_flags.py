@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 
 import argparse
+import os
 import sys
 import shutil
 import json
@@ -30,6 +31,7 @@ from flag_generators.gen_15_process_inspection import ProcessInspectionFlagGener
 from flag_generators.gen_16_hex_hunting import HexHuntingFlagGenerator
 from flag_generators.gen_17_nmap_scanning import NmapScanFlagGenerator
 from flag_generators.gen_18_pcap_search import PcapSearchFlagGenerator
+from flag_generators.profiling import PROFILE_ENV, PROFILE_MODES, get_profile_mode, profile_section
 
 # === Mapping challenge IDs to generator classes ===
 GENERATOR_CLASSES = {
@@ -60,6 +62,7 @@ class FlagGenerationManager:
         self.web_admin_dir = self.project_root / "web_version_admin"
         self.challenges_dir = self.project_root / "challenges"
         self.dryrun_dir = self.project_root / "dryrun_output"
+        self.profile_dir = self.dryrun_dir / "profiles"
         self.challenge_list = ChallengeList()
         self.dry_run = dry_run
 
@@ -104,6 +107,10 @@ class FlagGenerationManager:
         else:
             self.prepare_backup()
 
+        profile_mode = get_profile_mode()
+        if profile_mode:
+            print(f"📈 Profiling enabled ({profile_mode}): results in '{self.profile_dir.relative_to(self.project_root)}/'\n")
+
         success_count = 0
         fail_count = 0
 
@@ -126,7 +133,8 @@ class FlagGenerationManager:
                     generator = generator_cls()
 
                     # Run flag generation
-                    real_flag = generator.generate_flag(target_folder)
+                    with profile_section(challenge.getId(), self.profile_dir, profile_mode):
+                        real_flag = generator.generate_flag(target_folder)
                     fake_flags = getattr(generator, "last_fake_flags", [])
 
                     # Gather unlock hints from the generator
@@ -169,7 +177,11 @@ if __name__ == "__main__":
         # Prompt for dry-run unless CLI flag specified
         parser = argparse.ArgumentParser()
         parser.add_argument("--dry-run", action="store_true", help="Generate flags without modifying challenges.json")
+        parser.add_argument("--profile", choices=PROFILE_MODES,
+                            help=f"Profile each generator (same as {PROFILE_ENV}=<mode>)")
         args = parser.parse_args()
+        if args.profile:
+            os.environ[PROFILE_ENV] = args.profile
 
         # If no CLI flag, prompt user interactively
         if not args.dry_run:
@@ -1,4 +1,7 @@
 #!/usr/bin/env python3
+import argparse
+import fnmatch
+import hashlib
 import subprocess
 import shutil
 import sys
@@ -6,10 +9,30 @@ import os
 from pathlib import Path
 import json
 
+from flag_generators.profiling import PROFILE_ENV, PROFILE_MODES, get_profile_mode
+
 # === CCRI STEMDay Master Validator ===
 VALIDATION_ROOT = Path.cwd() / "validation_results"
+PROFILE_ROOT = VALIDATION_ROOT / "profiles"
+PROFILE_RUNNER = Path.cwd() / "flag_generators" / "profiling.py"
 CHALLENGES_ROOT = Path.cwd() / "challenges"
 CHALLENGES_JSON = Path.cwd() / "web_version_admin" / "challenges.json"
+UNLOCKS_JSON = Path.cwd() / "web_version_admin" / "validation_unlocks.json"
+SHARED_CODE_ROOT = Path.cwd() / "flag_generators"  # Shared modules helpers import (ciphers, ps_dump, ...)
+
+# Cache of passing results, keyed by challenge ID -> content hash
+CACHE_FILE = Path.cwd() / ".validation_cache.json"
+
+# Caches helpers write next to themselves (same entries as in .gitignore):
+# regenerated on demand, so they must not invalidate a cached pass
+HASH_IGNORE = (
+    "__pycache__",
+    "*.py[cod]",
+    ".*.pcap.index.json",
+    ".*.pcap.index.json.tmp",
+    ".qr_decode_cache.json",
+    ".subdomain_index.json",
+)
 
 # Timeout in seconds for each helper script
 HELPER_TIMEOUT = 30
@@ -22,15 +45,20 @@ def log_verbose(message):
     if VERBOSE:
         print(f"📝 [VERBOSE] {message}")
 
-def clean_validation_folder():
-    """Remove old validation results and create a fresh folder."""
-    if VALIDATION_ROOT.exists():
+def clean_validation_folder(force=False):
+    """Remove old validation results and create a fresh folder.
+
+    Without --force, sandboxes of cached challenges are kept so their logs
+    stay available; each re-validated challenge cleans its own sandbox.
+    """
+    if VALIDATION_ROOT.exists() and force:
         print("🧹 Cleaning old validation_results...")
         log_verbose(f"Removing: {VALIDATION_ROOT}")
         shutil.rmtree(VALIDATION_ROOT)
-    VALIDATION_ROOT.mkdir()
-    print("📁 Created fresh validation_results/ folder.")
-    log_verbose(f"Created: {VALIDATION_ROOT}")
+    if not VALIDATION_ROOT.exists():
+        VALIDATION_ROOT.mkdir()
+        print("📁 Created fresh validation_results/ folder.")
+        log_verbose(f"Created: {VALIDATION_ROOT}")
 
 def load_challenges_json():
     """Load challenges.json for real flags and script paths."""
@@ -43,6 +71,77 @@ def load_challenges_json():
         log_verbose(f"Loaded {len(data)} challenges.")
         return data
 
+def load_unlocks_json():
+    """Load validation_unlocks.json (empty if missing) for cache hashing."""
+    if not UNLOCKS_JSON.exists():
+        log_verbose(f"No unlock data found at: {UNLOCKS_JSON}")
+        return {}
+    with open(UNLOCKS_JSON, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def load_cache():
+    """Load the validation cache, ignoring it if unreadable."""
+    if not CACHE_FILE.exists():
+        return {}
+    try:
+        with open(CACHE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"⚠️ Ignoring unreadable validation cache: {e}")
+        return {}
+
+def save_cache(cache):
+    """Write the validation cache back to disk."""
+    with open(CACHE_FILE, "w", encoding="utf-8") as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+    log_verbose(f"Saved validation cache: {CACHE_FILE}")
+
+def hash_ignored(path, folder):
+    """True for generated caches (HASH_IGNORE), matched on any part of the path."""
+    return any(
+        fnmatch.fnmatch(part, pattern)
+        for part in path.relative_to(folder).parts
+        for pattern in HASH_IGNORE
+    )
+
+def hash_files(digest, folder, paths):
+    """Feed each file's path (relative to folder) and contents into digest."""
+    for path in sorted(paths):
+        digest.update(str(path.relative_to(folder)).encode("utf-8"))
+        digest.update(b"\0")
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        digest.update(b"\0")
+
+def shared_code_hash():
+    """
+    Hash every Python source under flag_generators/. Helpers import shared
+    code from there (ciphers.py, binary_scan.py, ps_dump.py, http_corpus.py,
+    gen_03 via decode_rot13, ...), so any edit must invalidate cached passes.
+    """
+    digest = hashlib.sha256()
+    if SHARED_CODE_ROOT.exists():
+        hash_files(digest, SHARED_CODE_ROOT,
+                   (p for p in SHARED_CODE_ROOT.rglob("*.py") if not hash_ignored(p, SHARED_CODE_ROOT)))
+    return digest.hexdigest()
+
+def challenge_hash(challenge_id, entry, unlocks, shared_hash):
+    """
+    Hash everything that can change a challenge's validation outcome:
+    the challenge folder contents (helper script included), its
+    challenges.json entry, its validation_unlocks.json entry and the shared
+    flag_generators/ sources (shared_hash, from shared_code_hash()).
+    """
+    digest = hashlib.sha256()
+    digest.update(shared_hash.encode("ascii"))
+    digest.update(json.dumps(entry, sort_keys=True).encode("utf-8"))
+    digest.update(json.dumps(unlocks.get(challenge_id), sort_keys=True).encode("utf-8"))
+
+    folder = CHALLENGES_ROOT / entry["folder"]
+    hash_files(digest, folder, (p for p in folder.rglob("*") if p.is_file() and not hash_ignored(p, folder)))
+    return digest.hexdigest()
+
 def copy_root_marker():
     """Copy .ccri_ctf_root marker into the sandbox root if it exists."""
     marker = Path(".ccri_ctf_root")
@@ -63,6 +162,9 @@ def validate_challenge(challenge_id, entry, timeouts):
     print(f"\n🔍 Validating {challenge_id}: {entry['name']}...")
     original_folder = CHALLENGES_ROOT / entry["folder"]
     validation_folder = VALIDATION_ROOT / entry["folder"]
+    if validation_folder.exists():
+        log_verbose(f"Removing stale sandbox: {validation_folder}")
+        shutil.rmtree(validation_folder)
     validation_folder.mkdir(parents=True, exist_ok=True)
     log_verbose(f"Original folder: {original_folder}")
     log_verbose(f"Validation folder: {validation_folder}")
@@ -72,7 +174,7 @@ def validate_challenge(challenge_id, entry, timeouts):
         dest = validation_folder / item.name
         if item.is_dir():
             log_verbose(f"Copying folder: {item} -> {dest}")
-            shutil.copytree(item, dest)
+            shutil.copytree(item, dest, symlinks=True)  # Keep symlink traps as links (loops would recurse forever)
         else:
             log_verbose(f"Copying file: {item} -> {dest}")
             shutil.copy2(item, dest)
@@ -91,13 +193,23 @@ def validate_challenge(challenge_id, entry, timeouts):
     env = os.environ.copy()
     env["CCRI_VALIDATE"] = "1"
     log_verbose(f"Environment variable CCRI_VALIDATE=1 set for subprocess.")
-    log_verbose(f"Running subprocess: python3 {script_path} (cwd={validation_folder})")
+
+    command = ["python3", str(script_path)]
+    if get_profile_mode():
+        # Run the helper's validation path under the profiler
+        command = [
+            "python3", str(PROFILE_RUNNER),
+            "--name", challenge_id,
+            "--output-dir", str(PROFILE_ROOT),
+            str(script_path),
+        ]
+    log_verbose(f"Running subprocess: {' '.join(command)} (cwd={validation_folder})")
 
     try:
         # Run subprocess and stream output live
         with open(log_file, "w", encoding="utf-8") as log:
             process = subprocess.Popen(
-                ["python3", str(script_path)],
+                command,
                 cwd=validation_folder,  # Run from sandbox folder
                 env=env,
                 stdout=subprocess.PIPE,
@@ -130,23 +242,52 @@ def validate_challenge(challenge_id, entry, timeouts):
         return False
 
 def main():
+    parser = argparse.ArgumentParser(description="Validate every challenge's helper script.")
+    parser.add_argument("--force", action="store_true",
+                        help="Re-validate all challenges, ignoring cached results")
+    parser.add_argument("--profile", choices=PROFILE_MODES,
+                        help=f"Profile each helper's validation run (same as {PROFILE_ENV}=<mode>)")
+    args = parser.parse_args()
+    if args.profile:
+        os.environ[PROFILE_ENV] = args.profile
+    profile_mode = get_profile_mode()
+
     print("\n🚦 CCRI STEMDay Master Validator\n" + "="*40)
-    clean_validation_folder()
+    clean_validation_folder(force=args.force)
     copy_root_marker()
     challenges = load_challenges_json()
+    unlocks = load_unlocks_json()
+    if profile_mode:
+        print(f"📈 Profiling enabled ({profile_mode}): results in {PROFILE_ROOT}")
+    # Profiling needs the helpers to actually run, so cached passes are not reused
+    cache = {} if args.force or profile_mode else load_cache()
     success_count = 0
     fail_count = 0
+    cached_count = 0
     timeouts = []
 
+    shared_hash = shared_code_hash()
     for challenge_id, entry in challenges.items():
+        content_hash = challenge_hash(challenge_id, entry, unlocks, shared_hash)
+        if cache.get(challenge_id) == content_hash:
+            print(f"\n⏭️  {challenge_id}: Unchanged since last successful validation (cached).")
+            success_count += 1
+            cached_count += 1
+            continue
+
         log_verbose(f"Starting validation for {challenge_id}")
         if validate_challenge(challenge_id, entry, timeouts):
+            cache[challenge_id] = content_hash
             success_count += 1
         else:
+            # Only passes are cached; failures are always retried
+            cache.pop(challenge_id, None)
             fail_count += 1
 
+    save_cache(cache)
+
     print("\n📊 Validation Summary:")
-    print(f"✅ {success_count} passed")
+    print(f"✅ {success_count} passed" + (f" ({cached_count} cached)" if cached_count else ""))
     print(f"❌ {fail_count} failed")
     if timeouts:
         print(f"⏳ {len(timeouts)} timed out: {', '.join(timeouts)}")
@@ -0,0 +1,118 @@
+import threading
+from bisect import bisect_left
+
+# Latency buckets (seconds) for the request duration histogram
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+class Metrics:
+    """
+    Lightweight in-process counters for the hub, rendered in Prometheus text format.
+
+    Each record_* call is a handful of dict operations under one uncontended
+    lock (a few hundred nanoseconds), so it is safe to call on every request.
+    All formatting work is deferred to render(), which only runs on scrape.
+
+    Attributes:
+        requests (dict): (route, method, status) -> request count.
+        latency (dict): route -> [bucket counts..., +Inf count, sum of seconds].
+        in_flight (int): Requests currently being handled.
+        submissions (dict): (challenge_id, result) -> flag submission count.
+        fake_service_hits (dict): port -> hits on the simulated Nmap services.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.lock = threading.Lock()
+        self.requests = {}
+        self.latency = {}
+        self.in_flight = 0
+        self.submissions = {}
+        self.fake_service_hits = {}
+
+    def request_started(self):
+        """Increment the in-flight gauge."""
+        with self.lock:
+            self.in_flight += 1
+
+    def request_finished(self, route, method, status, seconds):
+        """Count a finished request and add its duration to the route histogram."""
+        key = (route, method, status)
+        # Prometheus buckets are inclusive upper bounds (le), hence bisect_left
+        index = bisect_left(self.buckets, seconds)
+        with self.lock:
+            self.in_flight -= 1
+            self.requests[key] = self.requests.get(key, 0) + 1
+            row = self.latency.get(route)
+            if row is None:
+                row = self.latency[route] = [0] * (len(self.buckets) + 1) + [0.0]
+            row[index] += 1
+            row[-1] += seconds
+
+    def record_submission(self, challenge_id, correct):
+        """Count a flag submission for a known challenge."""
+        key = (challenge_id, "correct" if correct else "incorrect")
+        with self.lock:
+            self.submissions[key] = self.submissions.get(key, 0) + 1
+
+    def record_fake_service_hit(self, port):
+        """Count a request to one of the simulated services."""
+        with self.lock:
+            self.fake_service_hits[port] = self.fake_service_hits.get(port, 0) + 1
+
+    @staticmethod
+    def _labels(**labels):
+        """Format a Prometheus label set, escaping backslashes, quotes and newlines."""
+        def escape(value):
+            return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        return "{" + ",".join(f'{name}="{escape(value)}"' for name, value in labels.items()) + "}"
+
+    def render(self, service_names=None):
+        """Return all metrics in Prometheus text exposition format (version 0.0.4)."""
+        service_names = service_names or {}
+        with self.lock:
+            requests = dict(self.requests)
+            latency = {route: list(row) for route, row in self.latency.items()}
+            in_flight = self.in_flight
+            submissions = dict(self.submissions)
+            hits = dict(self.fake_service_hits)
+
+        lines = [
+            "# HELP ccri_http_requests_total Hub HTTP requests by route, method and status.",
+            "# TYPE ccri_http_requests_total counter",
+        ]
+        for (route, method, status), count in sorted(requests.items()):
+            lines.append(f"ccri_http_requests_total{self._labels(route=route, method=method, status=status)} {count}")
+
+        lines += [
+            "# HELP ccri_http_request_duration_seconds Hub request latency by route.",
+            "# TYPE ccri_http_request_duration_seconds histogram",
+        ]
+        for route, row in sorted(latency.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), row[:-1]):
+                cumulative += count
+                lines.append(
+                    f"ccri_http_request_duration_seconds_bucket{self._labels(route=route, le=bound)} {cumulative}"
+                )
+            lines.append(f"ccri_http_request_duration_seconds_sum{self._labels(route=route)} {row[-1]:.9f}")
+            lines.append(f"ccri_http_request_duration_seconds_count{self._labels(route=route)} {cumulative}")
+
+        lines += [
+            "# HELP ccri_http_requests_in_flight Hub requests currently being served.",
+            "# TYPE ccri_http_requests_in_flight gauge",
+            f"ccri_http_requests_in_flight {in_flight}",
+            "# HELP ccri_flag_submissions_total Flag submissions by challenge and result.",
+            "# TYPE ccri_flag_submissions_total counter",
+        ]
+        for (challenge_id, result), count in sorted(submissions.items()):
+            lines.append(f"ccri_flag_submissions_total{self._labels(challenge=challenge_id, result=result)} {count}")
+
+        lines += [
+            "# HELP ccri_fake_service_hits_total Requests to the simulated Nmap services by port.",
+            "# TYPE ccri_fake_service_hits_total counter",
+        ]
+        for port, count in sorted(hits.items()):
+            labels = self._labels(port=port, service=service_names.get(port, "http"))
+            lines.append(f"ccri_fake_service_hits_total{labels} {count}")
+
+        return "\n".join(lines) + "\n"
@@ -58,6 +58,7 @@ def prepare_web_version(base_dir):
     server_source = os.path.join(admin_dir, "server.py")
     challenge_py = os.path.join(admin_dir, "Challenge.py")
     challenge_list_py = os.path.join(admin_dir, "ChallengeList.py")
+    metrics_py = os.path.join(admin_dir, "Metrics.py")
 
     # === Validate admin folder contents ===
     print(f"📂 Using BASE_DIR: {base_dir}")
@@ -67,6 +68,8 @@ def prepare_web_version(base_dir):
         abort(f"Missing {server_source}")
     if not os.path.isfile(challenge_py) or not os.path.isfile(challenge_list_py):
         abort("Missing Challenge.py or ChallengeList.py in admin folder")
+    if not os.path.isfile(metrics_py):
+        abort("Missing Metrics.py in admin folder")
     if not os.path.isdir(templates_folder):
         abort(f"Missing templates folder: {templates_folder}")
     if not os.path.isdir(static_folder):
@@ -114,6 +117,7 @@ def prepare_web_version(base_dir):
     py_compile.compile(server_source, cfile=os.path.join(student_dir, "server.pyc"))
     py_compile.compile(challenge_py, cfile=os.path.join(student_dir, "Challenge.pyc"))
     py_compile.compile(challenge_list_py, cfile=os.path.join(student_dir, "ChallengeList.pyc"))
+    py_compile.compile(metrics_py, cfile=os.path.join(student_dir, "Metrics.pyc"))
     print("✅ Compiled backend .py files to .pyc in student folder")
 
     # === Write mode marker ===
@@ -1,9 +1,9 @@
 try:
     # Flask 2.x: Markup is part of flask
-    from flask import Flask, render_template, request, jsonify, Markup, send_from_directory
+    from flask import Flask, render_template, request, jsonify, Markup, send_from_directory, g
 except ImportError:
     # Flask 3.x: Markup moved to markupsafe
-    from flask import Flask, render_template, request, jsonify, send_from_directory
+    from flask import Flask, render_template, request, jsonify, send_from_directory, g
     from markupsafe import Markup
 
 import subprocess
@@ -12,6 +12,7 @@ import os
 import base64
 import threading
 import logging
+import time
 from http.server import BaseHTTPRequestHandler, HTTPServer
 import markdown
 import sys
@@ -26,6 +27,7 @@ if BASE_DIR not in sys.path:
 
 # === Import backend logic ===
 from ChallengeList import ChallengeList
+from Metrics import Metrics
 
 # === Detect mode and select challenges.json path ===
 server_dir = os.path.dirname(os.path.abspath(__file__))
@@ -68,6 +70,28 @@ except json.JSONDecodeError:
     print(f"❌ ERROR: '{challenges_path}' contains invalid JSON!")
     exit(1)
 
+# === Request Instrumentation ===
+metrics = Metrics()
+
+@app.before_request
+def metrics_before_request():
+    g.metrics_start = time.perf_counter()
+    metrics.request_started()
+
+@app.after_request
+def metrics_after_request(response):
+    g.metrics_status = response.status_code
+    return response
+
+@app.teardown_request
+def metrics_teardown_request(exc):
+    start = g.pop("metrics_start", None)
+    if start is None:
+        return
+    route = request.url_rule.rule if request.url_rule else "<unmatched>"
+    status = g.pop("metrics_status", 500)
+    metrics.request_finished(route, request.method, status, time.perf_counter() - start)
+
 # === Helper: XOR Decode ===
 def xor_decode(encoded_base64, key):
     decoded_bytes = base64.b64decode(encoded_base64)
@@ -144,12 +168,14 @@ def submit_flag(challenge_id):
     if mode == "admin":
         if submitted_flag == correct_flag:
             print(f"✅ MATCH (Admin): Submitted flag matches correct flag.")
+            metrics.record_submission(challenge_id, True)
             selectedChallenge.setComplete()
             if selectedChallenge.getId() not in challenges.completed_challenges:
                 challenges.completed_challenges.append(selectedChallenge.getId())
             return jsonify({"status": "correct"})
         else:
             print(f"❌ MISMATCH (Admin): Submitted flag does not match correct flag.")
+            metrics.record_submission(challenge_id, False)
             return jsonify({"status": "incorrect"}), 400
 
     else:
@@ -162,12 +188,14 @@ def submit_flag(challenge_id):
 
         if submitted_flag == decoded_flag:
             print(f"✅ MATCH (Student): Submitted flag matches decoded flag.")
+            metrics.record_submission(challenge_id, True)
             selectedChallenge.setComplete()
             if selectedChallenge.getId() not in challenges.completed_challenges:
                 challenges.completed_challenges.append(selectedChallenge.getId())
             return jsonify({"status": "correct"})
         else:
             print(f"❌ MISMATCH (Student): Submitted flag does not match decoded flag.")
+            metrics.record_submission(challenge_id, False)
             return jsonify({"status": "incorrect"}), 400
 
 @app.route('/open_folder/<challenge_id>', methods=['POST'])
@@ -234,6 +262,12 @@ def run_script(challenge_id):
         print(f"❌ Failed to launch helper script: {e}")
         return jsonify({"status": "error", "message": str(e)}), 500
 
+@app.route('/metrics')
+def metrics_view():
+    if mode != "admin":
+        return "Not found", 404
+    return metrics.render(SERVICE_NAMES), 200, {"Content-Type": "text/plain; version=0.0.4; charset=utf-8"}
+
 # === Simulated Open Ports (Realistic Nmap Network) ===
 FAKE_FLAGS = {
     8005: "CCRI-HVDF-4036",       # ✅ REAL FLAG
@@ -307,6 +341,7 @@ ALL_PORTS = {**JUNK_RESPONSES, **FAKE_FLAGS}
 
 class PortHandler(BaseHTTPRequestHandler):
     def do_GET(self):
+        metrics.record_fake_service_hit(self.server.server_port)
         response = ALL_PORTS.get(self.server.server_port, "Connection refused")
         service_name = SERVICE_NAMES.get(self.server.server_port, "http")
         banner = f"👋 Welcome to {service_name} Service\n\n"